@@ -1,21 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Union
 from datetime import date
 
 from app.core.database import get_db
-from app.schemas.asset import AssetCreate, AssetUpdate, AssetResponse, AssetListResponse, AssetFilters
-from app.services.asset_service import AssetService
+from app.core.etag import etag_for
+from app.core.serialization import FastJSONResponse
+from app.schemas.asset import AssetCreate, AssetUpdate, AssetResponse, AssetListResponse, AssetCursorResponse, AssetFilters, AssetBatchRequest, AssetBatchResponse
+from app.services.asset_service import AssetService, ASSET_FIELDS
 
 router = APIRouter(prefix="/assets", tags=["Assets"])
 
+# Tables asset reads depend on (filters, stock and detail lookups)
+ASSET_READ_TABLES = (
+    "asset", "asset_stock", "asset_assignment", "scrap",
+    "lab", "vendor", "category", "teacher",
+)
 
-@router.get("", response_model=AssetListResponse)
+
+@router.get(
+    "",
+    response_model=Union[AssetListResponse, AssetCursorResponse],
+    dependencies=[Depends(etag_for(*ASSET_READ_TABLES))]
+)
 def get_assets(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
     sort_by: str = Query("purchase_date", regex="^[a-z_]+$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    pagination: str = Query("page", regex="^(page|cursor)$"),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    with_total: bool = Query(False, description="Include the total count in cursor mode"),
+    count: str = Query("exact", regex="^(exact|estimate|none)$", description="How to compute total in page mode"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (asset_id is always included)"),
     financial_year: Optional[str] = Query(None, regex=r"^\d{4}-\d{4}$"),
     lab_id: Optional[str] = None,
     vendor_id: Optional[str] = None,
@@ -34,7 +51,13 @@ def get_assets(
     scrap_cost_max: Optional[float] = Query(None, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Get assets with multiple simultaneous filters"""
+    """
+    Get assets with multiple simultaneous filters.
+    
+    pagination=page (default) uses page/size with an exact total.
+    pagination=cursor (or passing `after`) uses keyset pagination.
+    fields=asset_id,description,available_quantity returns only those fields.
+    """
     filters = AssetFilters(
         financial_year=financial_year,
         lab_id=lab_id,
@@ -55,13 +78,53 @@ def get_assets(
     )
     
     service = AssetService()
-    return service.get_filtered_assets(db, filters, page, size, sort_by, sort_order)
+    try:
+        # Listing rows are always projected straight from SQL columns
+        field_names = service.parse_fields(fields) or list(ASSET_FIELDS)
+        if pagination == "cursor" or after:
+            result = service.get_assets_by_cursor(
+                db, filters, after, size, sort_by, sort_order, with_total, field_names
+            )
+        else:
+            result = service.get_filtered_assets(
+                db, filters, page, size, sort_by, sort_order, count, field_names
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Rows come from our own query; skip response model validation
+    return FastJSONResponse(content=result)
 
 
-@router.get("/{asset_id}", response_model=AssetResponse)
-def get_asset(asset_id: str, db: Session = Depends(get_db)):
+@router.post("/batch", response_model=AssetBatchResponse)
+def get_assets_batch(request: AssetBatchRequest, db: Session = Depends(get_db)):
+    """Get up to 5000 assets by ID in one call; unknown IDs are returned in `missing`"""
+    service = AssetService()
+    return service.get_assets_batch(db, request.asset_ids)
+
+
+@router.get(
+    "/{asset_id}",
+    response_model=AssetResponse,
+    dependencies=[Depends(etag_for(*ASSET_READ_TABLES))]
+)
+def get_asset(
+    asset_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (asset_id is always included)"),
+    db: Session = Depends(get_db)
+):
     """Get asset by ID with computed fields"""
     service = AssetService()
+    if fields is not None:
+        try:
+            field_names = service.parse_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        asset = service.get_asset_fields(db, asset_id, field_names)
+        if not asset:
+            raise HTTPException(status_code=404, detail="Asset not found")
+        return FastJSONResponse(content=asset)
+    
     asset = service.get_asset_with_details(db, asset_id)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from app.core.database import get_db
+from app.core.serialization import FastJSONResponse
 from app.schemas.assignment import AssignmentCreate, AssignmentResponse, AssignmentReturn
 from app.services.assignment_service import AssignmentService
 
@@ -38,24 +39,10 @@ def get_assignments(
 ):
     """Get assignments with optional filters"""
     service = AssignmentService()
-    assignments = service.get_assignments(db, asset_id, teacher_id, active_only)
+    rows = service.get_assignment_rows(db, asset_id, teacher_id, active_only)
     
-    result = []
-    for a in assignments:
-        # Calculate assigned cost if asset exists
-        assigned_cost = None
-        if a.asset:
-            per_unit_cost = float(a.asset.original_total_cost) / a.asset.total_quantity
-            assigned_cost = per_unit_cost * a.assigned_quantity
-        
-        result.append(AssignmentResponse(
-            **a.__dict__,
-            assigned_cost=assigned_cost,
-            teacher_name=a.teacher.name if a.teacher else None,
-            asset_description=a.asset.description if a.asset else None
-        ))
-    
-    return result
+    # Rows come from our own query; skip response model validation
+    return FastJSONResponse(content=rows)
 
 
 @router.put("/{assignment_id}/return", response_model=AssignmentResponse)
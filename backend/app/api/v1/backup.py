@@ -1,22 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 import json
+import zipfile
 from io import BytesIO
 
 from app.core.database import get_db
-from app.models import Lab, Vendor, Category, Teacher, Asset, AssetAssignment, Scrap, ScrapPhase
+from app.models import Lab, Vendor, Category, Teacher, Asset, AssetAssignment, Scrap, ScrapPhase, AssetStock
+from app.services.report_columnar import export_table
+from app.services.stock_service import StockService
 
 router = APIRouter(prefix="/backup", tags=["Backup & Restore"])
 
+# Backup sections in JSON key order
+BACKUP_TABLES = [
+    ("labs", Lab), ("vendors", Vendor), ("categories", Category), ("teachers", Teacher),
+    ("scrap_phases", ScrapPhase), ("assets", Asset), ("assignments", AssetAssignment), ("scraps", Scrap)
+]
+
+
+def _export_columnar_backup(db: Session, format: str) -> StreamingResponse:
+    """ZIP with one typed Parquet / Arrow IPC file per backed-up table"""
+    extension = "parquet" if format == "parquet" else "arrow"
+    buffer = BytesIO()
+    # Parquet and Arrow files are already compressed, so entries are stored as-is
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, model in BACKUP_TABLES:
+            archive.writestr(f"{name}.{extension}", export_table(db, model.__table__, format))
+    
+    filename = f"deadstock_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{extension}.zip"
+    buffer.seek(0)
+    return StreamingResponse(
+        buffer,
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 
 @router.get("/export")
-def export_backup(db: Session = Depends(get_db)):
+def export_backup(
+    format: str = Query('json', regex='^(json|parquet|arrow)$'),
+    db: Session = Depends(get_db)
+):
     """
     Export complete system backup as JSON file.
     Includes all tables: Labs, Vendors, Categories, Teachers, Assets, Assignments, Scrap
+    format=parquet or arrow returns a ZIP of typed per-table files for analytics;
+    restore accepts the JSON backup only.
     """
+    if format != 'json':
+        try:
+            return _export_columnar_backup(db, format)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Backup failed: {str(e)}")
+    
     try:
         # Collect all data
         backup_data = {
@@ -130,6 +168,7 @@ async def restore_backup(file: UploadFile = File(...), db: Session = Depends(get
         
         # Clear existing data (in reverse order of dependencies)
         # Models have cascade deletes configured, so this order works with MySQL/PostgreSQL
+        db.query(AssetStock).delete()
         db.query(Scrap).delete()
         db.query(AssetAssignment).delete()
         db.query(Asset).delete()
@@ -263,7 +302,9 @@ async def restore_backup(file: UploadFile = File(...), db: Session = Depends(get
             )
             db.add(scrap)
         
-        db.commit()
+        # Rebuild the stock summary from the restored history (commits)
+        db.flush()
+        StockService().rebuild(db)
         
         return {
             "message": "Backup restored successfully",
@@ -62,7 +62,7 @@ def get_filter_options() -> Dict[str, Any]:
             },
             "search": {
                 "type": "string",
-                "description": "Search in description and remarks"
+                "description": "Full-text search in description, remarks and vendor name. Every word must match; words match as prefixes"
             },
             "purchase_date_from": {
                 "type": "date",
@@ -98,13 +98,38 @@ def get_filter_options() -> Dict[str, Any]:
             "sort_by": {
                 "type": "string",
                 "default": "purchase_date",
-                "description": "Field to sort by"
+                "description": "Field to sort by. Use 'relevance' with search to rank matches (page mode only)"
             },
             "sort_order": {
                 "type": "string",
                 "options": ["asc", "desc"],
                 "default": "desc",
                 "description": "Sort order"
+            },
+            "pagination": {
+                "type": "string",
+                "options": ["page", "cursor"],
+                "default": "page",
+                "description": "page: offset pages with exact total. cursor: keyset pages that cost the same at any depth"
+            },
+            "after": {
+                "type": "string",
+                "description": "Cursor mode only. Opaque next_cursor value from the previous page"
+            },
+            "count": {
+                "type": "string",
+                "options": ["exact", "estimate", "none"],
+                "default": "exact",
+                "description": "Page mode only. estimate may reuse an older cached total (total_is_estimate=true); none skips the count"
+            },
+            "with_total": {
+                "type": "boolean",
+                "default": False,
+                "description": "Cursor mode only. Also compute the total count"
+            },
+            "fields": {
+                "type": "string",
+                "description": "Comma-separated asset fields to return, e.g. description,lab_id,available_quantity. asset_id is always included"
             }
         },
         "note": "All filters can be combined using AND logic. Use GET /api/v1/assets with query parameters.",
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
+from app.core.etag import etag_for
 from app.models import Lab, Vendor, Category, Teacher, ScrapPhase
 from app.schemas.lab import LabCreate, LabUpdate, LabResponse
 from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse
@@ -14,7 +15,7 @@ router = APIRouter(prefix="/masters", tags=["Masters"])
 
 
 # Labs
-@router.get("/labs", response_model=List[LabResponse])
+@router.get("/labs", response_model=List[LabResponse], dependencies=[Depends(etag_for("lab"))])
 def get_labs(db: Session = Depends(get_db)):
     """Get all labs"""
     return db.query(Lab).all()
@@ -67,7 +68,7 @@ def delete_lab(lab_id: str, db: Session = Depends(get_db)):
 
 
 # Vendors
-@router.get("/vendors", response_model=List[VendorResponse])
+@router.get("/vendors", response_model=List[VendorResponse], dependencies=[Depends(etag_for("vendor"))])
 def get_vendors(db: Session = Depends(get_db)):
     """Get all vendors"""
     return db.query(Vendor).all()
@@ -120,7 +121,7 @@ def delete_vendor(vendor_id: str, db: Session = Depends(get_db)):
 
 
 # Categories
-@router.get("/categories", response_model=List[CategoryResponse])
+@router.get("/categories", response_model=List[CategoryResponse], dependencies=[Depends(etag_for("category"))])
 def get_categories(db: Session = Depends(get_db)):
     """Get all categories"""
     return db.query(Category).all()
@@ -173,7 +174,7 @@ def delete_category(category_id: str, db: Session = Depends(get_db)):
 
 
 # Teachers
-@router.get("/teachers", response_model=List[TeacherResponse])
+@router.get("/teachers", response_model=List[TeacherResponse], dependencies=[Depends(etag_for("teacher"))])
 def get_teachers(db: Session = Depends(get_db)):
     """Get all teachers"""
     return db.query(Teacher).all()
@@ -229,7 +230,7 @@ def delete_teacher(teacher_id: str, db: Session = Depends(get_db)):
 
 
 # Scrap Phases
-@router.get("/scrap-phases", response_model=List[ScrapPhaseResponse])
+@router.get("/scrap-phases", response_model=List[ScrapPhaseResponse], dependencies=[Depends(etag_for("scrap_phase"))])
 def get_scrap_phases(db: Session = Depends(get_db)):
     """Get all scrap phases"""
     return db.query(ScrapPhase).filter(ScrapPhase.is_active == True).all()
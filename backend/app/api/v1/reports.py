@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import date
+from typing import List, Optional
+from datetime import date, datetime
 from io import BytesIO
 
 from app.core.database import get_db
+from app.core.etag import etag_for
+from app.core.inventory_counters import inventory_verifier, read_counters, verify as verify_counters
 from app.schemas.asset import AssetFilters
+from app.schemas.report import ReportJobCreate, ReportJobResponse
+from app.services.dashboard_service import dashboard_service, DASHBOARD_TABLES, AGE_SECONDS_HEADER, COMPUTED_AT_HEADER
+from app.services.pivot_service import PivotService, PIVOT_DIMENSIONS, PIVOT_MEASURES, PIVOT_TABLES
 from app.services.report_service import ReportService
+from app.services.rollup_service import RollupService, ROLLUP_DIMENSIONS, ROLLUP_TABLES
+from app.services.report_jobs import report_job_manager
+from app.services.report_cache import report_cache
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
 @router.get("/assets")
 def export_asset_report(
-    format: str = Query('pdf', regex='^(pdf|csv|xlsx)$'),
+    format: str = Query('pdf', regex='^(pdf|csv|xlsx|parquet|arrow)$'),
     financial_year: Optional[str] = Query(None, regex=r"^\d{4}-\d{4}$"),
     lab_id: Optional[str] = None,
     vendor_id: Optional[str] = None,
@@ -32,7 +40,7 @@ def export_asset_report(
     scrap_cost_max: Optional[float] = Query(None, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Export asset report in PDF, CSV, or Excel format"""
+    """Export asset report in PDF, CSV, Excel, Parquet or Arrow IPC format"""
     filters = AssetFilters(
         financial_year=financial_year,
         lab_id=lab_id,
@@ -52,6 +60,15 @@ def export_asset_report(
     )
     
     service = ReportService()
+    if format == 'csv':
+        # Rows are read, encoded and sent in chunks as the cursor advances
+        chunks, filename, content_type = service.stream_asset_csv(db, filters)
+        return StreamingResponse(
+            chunks,
+            media_type=content_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    
     try:
         file_bytes, filename, content_type = service.generate_asset_report(db, filters, format)
         return StreamingResponse(
@@ -65,7 +82,7 @@ def export_asset_report(
 
 @router.get("/assignments")
 def export_assignment_report(
-    format: str = Query('pdf', regex='^(pdf|csv|xlsx)$'),
+    format: str = Query('pdf', regex='^(pdf|csv|xlsx|parquet|arrow)$'),
     asset_id: Optional[str] = None,
     teacher_id: Optional[str] = None,
     lab_id: Optional[str] = None,
@@ -75,8 +92,25 @@ def export_assignment_report(
     assignment_date_to: Optional[date] = None,
     db: Session = Depends(get_db)
 ):
-    """Export assignment report in PDF, CSV, or Excel format with filters"""
+    """Export assignment report in PDF, CSV, Excel, Parquet or Arrow IPC format with filters"""
     service = ReportService()
+    if format == 'csv':
+        chunks, filename, content_type = service.stream_assignment_csv(
+            db,
+            asset_id=asset_id,
+            teacher_id=teacher_id,
+            lab_id=lab_id,
+            category_id=category_id,
+            active_only=active_only,
+            assignment_date_from=assignment_date_from,
+            assignment_date_to=assignment_date_to
+        )
+        return StreamingResponse(
+            chunks,
+            media_type=content_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    
     try:
         file_bytes, filename, content_type = service.generate_assignment_report(
             db,
@@ -98,53 +132,154 @@ def export_assignment_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/dashboard")
-def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics"""
-    from sqlalchemy import func
-    from app.models import Asset, AssetAssignment, Scrap
-    
-    # Total assets
-    total_assets = db.query(func.count(Asset.asset_id)).scalar()
-    
-    # Total quantity purchased
-    total_quantity = db.query(func.coalesce(func.sum(Asset.total_quantity), 0)).scalar() or 0
-    
-    # Total original cost
-    total_original_cost = db.query(func.coalesce(func.sum(Asset.original_total_cost), 0)).scalar() or 0
-    
-    # Total current cost
-    total_current_cost = db.query(func.coalesce(func.sum(Asset.current_total_cost), 0)).scalar() or 0
+def _job_response(job: dict) -> ReportJobResponse:
+    download_url = None
+    if job["status"] == "done":
+        download_url = f"/api/v1/reports/jobs/{job['job_id']}/download"
+    return ReportJobResponse(**job, download_url=download_url)
+
+
+@router.get("/pivot", dependencies=[Depends(etag_for(*PIVOT_TABLES))])
+def get_pivot_report(
+    rows: List[str] = Query(['financial_year']),
+    column: Optional[str] = None,
+    values: Optional[List[str]] = Query(None),
+    format: str = Query('json', regex='^(json|csv|xlsx)$'),
+    financial_year: Optional[str] = Query(None, regex=r"^\d{4}-\d{4}$"),
+    lab_id: Optional[str] = None,
+    vendor_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    is_special_hardware: Optional[bool] = None,
+    issued_status: Optional[str] = Query(None, regex="^(issued_only|not_issued|partially_issued)$"),
+    scrap_status: Optional[str] = Query(None, regex="^(scrapped_only|exclude_scrapped)$"),
+    teacher_id: Optional[str] = None,
+    search: Optional[str] = None,
+    purchase_date_from: Optional[date] = None,
+    purchase_date_to: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Asset totals grouped by rows (financial_year, category, lab, vendor), optionally
+    cross-tabulated by one column dimension, as JSON, CSV or Excel
+    """
+    if not set(rows) <= set(PIVOT_DIMENSIONS) or len(set(rows)) != len(rows):
+        raise HTTPException(status_code=400, detail=f"rows must be distinct values from {', '.join(PIVOT_DIMENSIONS)}")
+    if column is not None and (column not in PIVOT_DIMENSIONS or column in rows):
+        raise HTTPException(status_code=400, detail="column must be a dimension not already in rows")
+    if values is not None and not set(values) <= set(PIVOT_MEASURES):
+        raise HTTPException(status_code=400, detail=f"values must be from {', '.join(PIVOT_MEASURES)}")
     
-    # Total assigned quantity
-    total_assigned = db.query(
-        func.coalesce(func.sum(AssetAssignment.assigned_quantity), 0)
-    ).filter(AssetAssignment.return_date.is_(None)).scalar() or 0
+    filters = AssetFilters(
+        financial_year=financial_year,
+        lab_id=lab_id,
+        vendor_id=vendor_id,
+        category_id=category_id,
+        is_special_hardware=is_special_hardware,
+        issued_status=issued_status,
+        scrap_status=scrap_status,
+        teacher_id=teacher_id,
+        search=search,
+        purchase_date_from=purchase_date_from,
+        purchase_date_to=purchase_date_to
+    )
     
-    # Total scrapped quantity
-    total_scrapped = db.query(func.coalesce(func.sum(Scrap.scrapped_quantity), 0)).scalar() or 0
+    service = PivotService()
+    table = service.pivot(db, filters, rows, column, values)
+    if format == 'json':
+        return service.to_json(table, rows, column)
     
-    # Total available
-    total_available = total_quantity - total_assigned - total_scrapped
+    file_bytes, content_type = service.to_file(table, format)
+    filename = f"asset_pivot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    return StreamingResponse(
+        BytesIO(file_bytes),
+        media_type=content_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@router.get("/rollup", dependencies=[Depends(etag_for(*ROLLUP_TABLES))])
+def get_rollup_summary(
+    group_by: List[str] = Query(['financial_year']),
+    financial_year: Optional[str] = Query(None, regex=r"^\d{4}-\d{4}$"),
+    category_id: Optional[str] = None,
+    lab_id: Optional[str] = None,
+    vendor_id: Optional[str] = None,
+    is_special_hardware: Optional[bool] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Asset totals from the pre-aggregated rollups, grouped by any of financial_year,
+    category, lab, vendor and is_special_hardware. Drill down by passing a group's
+    value (or id) back as a filter; category_id, lab_id and vendor_id accept "none".
+    """
+    if not set(group_by) <= set(ROLLUP_DIMENSIONS) or len(set(group_by)) != len(group_by):
+        raise HTTPException(status_code=400, detail=f"group_by must be distinct values from {', '.join(ROLLUP_DIMENSIONS)}")
     
-    # Assets with multiple teachers
-    from sqlalchemy import distinct
-    assets_with_multiple_teachers = db.query(
-        func.count(distinct(AssetAssignment.asset_id))
-    ).filter(
-        AssetAssignment.return_date.is_(None)
-    ).group_by(AssetAssignment.asset_id).having(
-        func.count(distinct(AssetAssignment.teacher_id)) > 1
-    ).count()
+    filters = {
+        name: value for name, value in {
+            "financial_year": financial_year,
+            "category_id": category_id,
+            "lab_id": lab_id,
+            "vendor_id": vendor_id,
+            "is_special_hardware": is_special_hardware,
+        }.items() if value is not None
+    }
+    return RollupService().summarize(db, group_by, filters)
+
+
+@router.post("/jobs", response_model=ReportJobResponse, status_code=202)
+def create_report_job(request: ReportJobCreate):
+    """Queue an asset or assignment report to be rendered in the background"""
+    return _job_response(report_job_manager.submit(request))
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobResponse)
+def get_report_job(job_id: str):
+    """Get a report job's status and progress"""
+    job = report_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/download")
+def download_report_job(job_id: str):
+    """Download a finished report job's file"""
+    job = report_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Report job is {job['status']}")
     
+    path = report_job_manager.output_path(job_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Report file not found")
+    return FileResponse(path, media_type=job["content_type"], filename=job["filename"])
+
+
+@router.get("/cache")
+def get_report_cache_stats():
+    """Report cache hit rate, size and evictions for this process"""
+    return report_cache.stats()
+
+
+@router.get("/counters")
+def get_inventory_counters(verify: bool = Query(False), db: Session = Depends(get_db)):
+    """Stored inventory counters and the latest drift check (verify=true checks now, without repairing)"""
     return {
-        "total_assets": total_assets,
-        "total_quantity_purchased": int(total_quantity),
-        "total_original_cost": float(total_original_cost),
-        "total_current_cost": float(total_current_cost),
-        "total_assigned_quantity": int(total_assigned),
-        "total_scrapped_quantity": int(total_scrapped),
-        "total_available_quantity": int(total_available),
-        "assets_with_multiple_teachers": assets_with_multiple_teachers
+        "counters": read_counters(db),
+        "verification": verify_counters(db) if verify else inventory_verifier.last_report
     }
 
+
+@router.get("/dashboard", dependencies=[Depends(etag_for(*DASHBOARD_TABLES))])
+def get_dashboard_stats(request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Get dashboard statistics (cached until the underlying tables change).
+    Freshness goes in headers, not the ETagged body.
+    """
+    stats, computed_at, age_seconds = dashboard_service.get_stats(db, request.state.data_versions)
+    response.headers[COMPUTED_AT_HEADER] = computed_at.isoformat(timespec="seconds")
+    response.headers[AGE_SECONDS_HEADER] = str(age_seconds)
+    return stats
+
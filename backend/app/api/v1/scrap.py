@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date
@@ -6,6 +7,8 @@ from typing import List
 
 
 from app.core.database import get_db
+from app.core.etag import etag_for
+from app.core.serialization import FastJSONResponse, NDJSON_MEDIA_TYPE, iter_json_object, iter_ndjson
 from app.schemas.scrap import ScrapCreate, ScrapResponse, ScrapPhaseSummary
 from app.services.scrap_service import ScrapService
 
@@ -32,7 +35,7 @@ def create_scrap(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=dict, dependencies=[Depends(etag_for("scrap", "asset", "scrap_phase"))])
 def get_scrap_records(
     asset_id: Optional[str] = None,
     phase_id: Optional[str] = Query(None, description="Filter by scrap phase ID"),
@@ -45,21 +48,40 @@ def get_scrap_records(
 ):
     """Get scrap records with filters"""
     service = ScrapService()
-    return service.get_scrap_records(
+    result = service.get_scrap_records(
         db, asset_id, phase_id, financial_year, date_from, date_to, page, size
     )
+    return FastJSONResponse(content=result)
 
 
-@router.get("/summary-by-phase", response_model=List[ScrapPhaseSummary])
+@router.get(
+    "/summary-by-phase",
+    response_model=List[ScrapPhaseSummary],
+    dependencies=[Depends(etag_for("scrap", "scrap_phase"))]
+)
 def get_phase_summary(db: Session = Depends(get_db)):
     """Get scrap summary by phase"""
     service = ScrapService()
     return service.get_phase_summary(db)
 
 
-@router.get("/assets/{asset_id}/history", response_model=dict)
-def get_asset_scrap_history(asset_id: str, db: Session = Depends(get_db)):
-    """Get scrap history for an asset"""
+@router.get(
+    "/assets/{asset_id}/history",
+    response_model=dict,
+    dependencies=[Depends(etag_for("scrap", "asset", "scrap_phase"))]
+)
+def get_asset_scrap_history(
+    asset_id: str,
+    format: str = Query("json", regex="^(json|ndjson)$"),
+    page: Optional[int] = Query(None, ge=1, description="Return one page instead of the full ledger (JSON only)"),
+    size: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Complete scrap ledger for an asset, oldest first, with running quantity and
+    value. Streams the whole ledger as JSON or NDJSON (one entry per line), or
+    returns one page with page=.
+    """
     service = ScrapService()
     from app.services.asset_service import AssetService
     asset_service = AssetService()
@@ -68,16 +90,27 @@ def get_asset_scrap_history(asset_id: str, db: Session = Depends(get_db)):
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     
-    scrap_history = service.get_scrap_records(db, asset_id=asset_id, page=1, size=1000)
+    if format == "ndjson":
+        if page is not None:
+            raise HTTPException(status_code=400, detail="page is only supported for JSON")
+        return StreamingResponse(iter_ndjson(service.iter_scrap_history(db, asset_id)), media_type=NDJSON_MEDIA_TYPE)
     
-    return {
-        "asset": {
-            "asset_id": asset.asset_id,
-            "description": asset.description,
-            "total_quantity": asset.total_quantity,
-            "original_total_cost": float(asset.original_total_cost),
-            "current_total_cost": float(asset.current_total_cost)
-        },
-        "scrap_history": scrap_history["items"]
+    summary = {
+        "asset_id": asset.asset_id,
+        "description": asset.description,
+        "total_quantity": asset.total_quantity,
+        "original_total_cost": float(asset.original_total_cost),
+        "current_total_cost": float(asset.current_total_cost)
     }
-
+    if page is not None:
+        history = service.get_scrap_history_page(db, asset_id, page, size)
+        return FastJSONResponse(content={
+            "asset": summary,
+            "scrap_history": history.pop("items"),
+            **history
+        })
+    
+    return StreamingResponse(
+        iter_json_object({"asset": summary}, "scrap_history", service.iter_scrap_history(db, asset_id)),
+        media_type="application/json"
+    )
@@ -0,0 +1,271 @@
+"""
+Incrementally maintained asset rollups.
+
+asset_rollup holds asset totals per (financial_year, category_id, lab_id,
+vendor_id, is_special_hardware). An after_flush hook adds each flushed Asset
+and AssetStock object's change to its group in the writing transaction, so
+the asset, assignment and scrap services keep it current without extra calls
+(assignments and scraps reach it through their asset_stock rows). When an
+asset moves between groups, or an old value was never loaded, the affected
+groups are re-aggregated from the tables instead; bulk statements on asset or
+asset_stock rebuild every group before commit (see app.core.flush_deltas).
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select, update, and_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.core.data_version import bump
+from app.core.database import SessionLocal
+from app.core.flush_deltas import (
+    UNKNOWN, count, flushed_objects, measure_delta, money, present, rebuild_after_bulk_statements,
+    value_after, value_before,
+)
+from app.models import Asset, AssetStock, AssetRollup
+
+DIMENSIONS = ("financial_year", "category_id", "lab_id", "vendor_id", "is_special_hardware")
+MEASURES = ("asset_count", "total_quantity", "assigned_quantity", "scrapped_quantity", "original_cost", "current_cost")
+COST_MEASURES = ("original_cost", "current_cost")
+
+# Bulk statements on these tables bypass the flush hook
+REBUILD_TABLES = {Asset.__tablename__, AssetStock.__tablename__}
+
+# Groups rewritten per statement by a repair
+REPAIR_BATCH_GROUPS = 1000
+
+Dims = Tuple[str, Optional[str], Optional[str], Optional[str], bool]
+
+ASSET_MEASURES = (
+    ("asset_id", "asset_count", present),
+    ("total_quantity", "total_quantity", count),
+    ("original_total_cost", "original_cost", money),
+    ("current_total_cost", "current_cost", money),
+)
+STOCK_MEASURES = (
+    ("assigned_quantity", "assigned_quantity", count),
+    ("scrapped_quantity", "scrapped_quantity", count),
+)
+
+
+def _dims(values: Iterable) -> Dims:
+    financial_year, category_id, lab_id, vendor_id, is_special = values
+    return financial_year, category_id, lab_id, vendor_id, bool(is_special)
+
+
+def rollup_key(dims: Dims) -> str:
+    financial_year, category_id, lab_id, vendor_id, is_special = dims
+    return "|".join([financial_year, category_id or "", lab_id or "", vendor_id or "", "1" if is_special else "0"])
+
+
+def _rollup_key_expression():
+    """rollup_key computed in SQL from the asset columns (must match rollup_key())"""
+    return (
+        Asset.financial_year + "|" + func.coalesce(Asset.category_id, "") + "|"
+        + func.coalesce(Asset.lab_id, "") + "|" + func.coalesce(Asset.vendor_id, "") + "|"
+        + case((Asset.is_special_hardware, "1"), else_="0")
+    )
+
+
+def _grouped_select(where=None):
+    """Totals per group aggregated from the asset and asset_stock tables"""
+    dimension_columns = [getattr(Asset, name) for name in DIMENSIONS]
+    query = select(
+        _rollup_key_expression().label("rollup_key"),
+        *dimension_columns,
+        func.count(Asset.asset_id).label("asset_count"),
+        func.coalesce(func.sum(Asset.total_quantity), 0).label("total_quantity"),
+        func.coalesce(func.sum(AssetStock.assigned_quantity), 0).label("assigned_quantity"),
+        func.coalesce(func.sum(AssetStock.scrapped_quantity), 0).label("scrapped_quantity"),
+        func.coalesce(func.sum(Asset.original_total_cost), 0).label("original_cost"),
+        func.coalesce(func.sum(Asset.current_total_cost), 0).label("current_cost"),
+    ).outerjoin(AssetStock, AssetStock.asset_id == Asset.asset_id)
+    if where is not None:
+        query = query.where(where)
+    return query.group_by(*dimension_columns)
+
+
+def _insert_grouped(conn: Connection, where=None) -> None:
+    conn.execute(insert(AssetRollup).from_select(("rollup_key",) + DIMENSIONS + MEASURES, _grouped_select(where)))
+
+
+def rebuild(conn: Connection) -> None:
+    """Re-aggregate every group from the tables"""
+    conn.execute(delete(AssetRollup))
+    _insert_grouped(conn)
+
+
+def refresh_groups(conn: Connection, groups: Iterable[Dims]) -> None:
+    """Re-aggregate the given groups from the tables"""
+    for dims in groups:
+        conn.execute(delete(AssetRollup).where(AssetRollup.rollup_key == rollup_key(dims)))
+        _insert_grouped(conn, and_(*(
+            getattr(Asset, name).is_not_distinct_from(value) for name, value in zip(DIMENSIONS, dims)
+        )))
+
+
+def _upsert_delta(conn: Connection, key: str, dims: Dims, delta: Dict[str, object]) -> None:
+    """
+    Add a delta to a group, creating it if missing, in one statement so two
+    writers creating the same group can't both insert it
+    """
+    values = {"rollup_key": key, **dict(zip(DIMENSIONS, dims)), **{name: delta.get(name, 0) for name in MEASURES}}
+    increments = {name: getattr(AssetRollup, name) + change for name, change in delta.items()}
+    dialect = conn.dialect.name
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        conn.execute(mysql_insert(AssetRollup).values(**values).on_duplicate_key_update(**increments))
+    elif dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert_insert
+        conn.execute(
+            upsert_insert(AssetRollup).values(**values)
+            .on_conflict_do_update(index_elements=[AssetRollup.rollup_key], set_=increments)
+        )
+    else:
+        result = conn.execute(update(AssetRollup).where(AssetRollup.rollup_key == key).values(**increments))
+        if result.rowcount == 0:
+            conn.execute(insert(AssetRollup).values(**values))
+
+
+def apply_deltas(conn: Connection, deltas: Dict[Dims, Dict[str, object]]) -> None:
+    """Add measure changes to their groups, creating groups as needed and dropping emptied ones"""
+    keys = []
+    for dims, delta in deltas.items():
+        key = rollup_key(dims)
+        keys.append(key)
+        _upsert_delta(conn, key, dims, delta)
+    if keys:
+        conn.execute(delete(AssetRollup).where(AssetRollup.rollup_key.in_(keys), AssetRollup.asset_count <= 0))
+
+
+def _asset_dims(session: Session, conn: Connection, asset_id: str, flushed: Dict[str, Dims]) -> Optional[Dims]:
+    """Group of an asset: from this flush, the identity map, or the asset row"""
+    if asset_id in flushed:
+        return flushed[asset_id]
+    asset = session.identity_map.get(identity_key(Asset, asset_id))
+    if asset is not None:
+        loaded = inspect(asset).dict
+        if all(name in loaded for name in DIMENSIONS):
+            return _dims(loaded[name] for name in DIMENSIONS)
+    row = conn.execute(
+        select(*(getattr(Asset, name) for name in DIMENSIONS)).where(Asset.asset_id == asset_id)
+    ).one_or_none()
+    return _dims(row) if row is not None else None
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _apply_flush_deltas(session: Session, flush_context) -> None:
+    flushed = flushed_objects(session)
+    assets = [entry for entry in flushed if isinstance(entry[0], Asset)]
+    stocks = [entry for entry in flushed if isinstance(entry[0], AssetStock)]
+    if not assets and not stocks:
+        return
+
+    conn = session.connection()
+    deltas: Dict[Dims, Dict[str, object]] = {}
+    refresh: Set[Dims] = set()
+    flushed_dims: Dict[str, Dims] = {}
+
+    def add(dims: Dims, delta: Optional[Dict[str, object]]) -> None:
+        if delta is None:
+            refresh.add(dims)
+            return
+        totals = deltas.setdefault(dims, {})
+        for name, change in delta.items():
+            totals[name] = totals.get(name, 0) + change
+
+    for asset, is_new, is_deleted in assets:
+        state = inspect(asset)
+        if is_new:
+            dims = _dims(state.dict.get(name) for name in DIMENSIONS)
+        else:
+            histories = [state.attrs[name].history for name in DIMENSIONS]
+            after = [value_after(history) for history in histories]
+            if not is_deleted and UNKNOWN in after:
+                after = _asset_dims(session, conn, asset.asset_id, {})
+            # Unchanged attributes were the same before the flush
+            before = [
+                value_before(history) if history.added or history.deleted or history.unchanged else value
+                for history, value in zip(histories, after)
+            ]
+            if UNKNOWN in before:
+                # Can't tell which group the asset left
+                rebuild(conn)
+                return
+            dims = _dims(before)
+            if not is_deleted and _dims(after) != dims:
+                refresh.update((dims, _dims(after)))
+                flushed_dims[asset.asset_id] = _dims(after)
+                continue
+        flushed_dims[asset.asset_id] = dims
+        add(dims, measure_delta(asset, ASSET_MEASURES, is_new, is_deleted))
+
+    for stock, is_new, is_deleted in stocks:
+        dims = _asset_dims(session, conn, stock.asset_id, flushed_dims)
+        if dims is None:
+            rebuild(conn)
+            return
+        add(dims, measure_delta(stock, STOCK_MEASURES, is_new, is_deleted))
+
+    apply_deltas(conn, {dims: delta for dims, delta in deltas.items() if dims not in refresh and delta})
+    refresh_groups(conn, refresh)
+
+
+rebuild_after_bulk_statements("asset_rollups_stale", REBUILD_TABLES, rebuild)
+
+
+def _normalize(row) -> Tuple:
+    return tuple(
+        money(row[name]).quantize(Decimal("0.01")) if name in COST_MEASURES else count(row[name])
+        for name in MEASURES
+    )
+
+
+def _lock_rollups(conn: Connection) -> None:
+    """
+    Lock every rollup row (and, on InnoDB, the gaps between them, so no group
+    can be inserted). Taken before a transaction's first read, its snapshot
+    then includes every committed delta, and later writers wait until it ends.
+    """
+    conn.execute(select(AssetRollup.rollup_key).with_for_update())
+
+
+def verify(db: Session, repair: bool = False) -> dict:
+    """
+    Compare stored groups with groups re-aggregated from the tables.
+    With repair, db must not have read anything in its current transaction:
+    the rollups are locked first, so the comparison and the rewrite of
+    drifted groups can't race a writer's delta. The transaction is then
+    ended (committed if anything was repaired) to release the locks.
+    """
+    conn = db.connection()
+    if repair:
+        _lock_rollups(conn)
+    actual_rows = {row.rollup_key: dict(row._mapping) for row in conn.execute(_grouped_select())}
+    actual = {key: _normalize(row) for key, row in actual_rows.items()}
+    stored = {
+        row.rollup_key: _normalize(row._mapping)
+        for row in conn.execute(select(AssetRollup.rollup_key, *(getattr(AssetRollup, name) for name in MEASURES)))
+    }
+    drifted: List[str] = sorted(
+        key for key in actual.keys() | stored.keys() if actual.get(key) != stored.get(key)
+    )
+    if repair and drifted:
+        # Write the groups read above; re-aggregating here would read past the snapshot
+        for start in range(0, len(drifted), REPAIR_BATCH_GROUPS):
+            keys = drifted[start:start + REPAIR_BATCH_GROUPS]
+            conn.execute(delete(AssetRollup).where(AssetRollup.rollup_key.in_(keys)))
+            replacements = [actual_rows[key] for key in keys if key in actual_rows]
+            if replacements:
+                conn.execute(insert(AssetRollup), replacements)
+        # /reports/rollup and /reports/pivot validate on asset_rollup's version
+        bump(conn, [AssetRollup.__tablename__])
+        db.commit()
+    elif repair:
+        db.rollback()
+    return {"groups": len(actual), "drifted_groups": drifted, "repaired": bool(repair and drifted)}
@@ -11,6 +11,19 @@ class Settings(BaseSettings):
     SUPABASE_URL: str | None = None
     SUPABASE_SERVICE_ROLE_KEY: str | None = None
     SUPABASE_INVITE_REDIRECT_URL: str = "http://localhost:3000/signup"
+    # Background report jobs
+    REPORT_WORKERS: int = 2
+    REPORT_JOB_DIR: str = "report_jobs"
+    REPORT_JOB_TTL_SECONDS: int = 3600
+    # Processes rendering sections of large PDF registers (0 renders them in-process)
+    REPORT_PDF_WORKERS: int = 2
+    # Rendered report cache
+    REPORT_CACHE_DIR: str = "report_cache"
+    REPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    # Backstop age for cached dashboard totals (writes invalidate them sooner)
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+    # How often the inventory counters and asset rollups are checked against the tables (0 disables)
+    INVENTORY_VERIFY_INTERVAL_SECONDS: int = 3600
     
     class Config:
         env_file = ".env"
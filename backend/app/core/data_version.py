@@ -0,0 +1,84 @@
+"""
+Per-table data-version counters.
+
+Session hooks bump data_version rows in the same transaction as the write:
+after_flush covers ORM unit-of-work changes and do_orm_execute covers bulk
+insert/update/delete statements (e.g. query.delete() in backup restore).
+Readers fetch the versions of the tables they depend on with one query and
+use them as cache keys.
+"""
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, SessionLocal
+from app.models.data_version import DataVersion
+
+UNTRACKED_TABLES = {DataVersion.__tablename__}
+
+
+def _table_names(objects) -> set:
+    names = set()
+    for obj in objects:
+        table = getattr(obj, "__table__", None)
+        if table is not None and table.name not in UNTRACKED_TABLES:
+            names.add(table.name)
+    return names
+
+
+def bump(conn: Connection, tables: Iterable[str]) -> None:
+    """Increment the version of each table on the given connection"""
+    tables = sorted(set(tables) - UNTRACKED_TABLES)
+    if tables:
+        conn.execute(
+            update(DataVersion)
+            .where(DataVersion.table_name.in_(tables))
+            .values(version=DataVersion.version + 1)
+        )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _bump_after_flush(session: Session, flush_context) -> None:
+    tables = _table_names(session.new) | _table_names(session.dirty) | _table_names(session.deleted)
+    if tables:
+        bump(session.connection(), tables)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _bump_on_bulk_statement(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None:
+        bump(orm_execute_state.session.connection(), [table.name])
+
+
+def ensure_data_versions(conn: Connection) -> None:
+    """Insert a zero-version row for every model table that lacks one"""
+    existing = set(conn.execute(select(DataVersion.table_name)).scalars())
+    missing = [
+        {"table_name": name, "version": 0}
+        for name in Base.metadata.tables
+        if name not in existing and name not in UNTRACKED_TABLES
+    ]
+    if missing:
+        conn.execute(insert(DataVersion), missing)
+
+
+def get_data_versions(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """Current versions of the given tables (one query)"""
+    tables = sorted(set(tables))
+    rows = db.execute(
+        select(DataVersion.table_name, DataVersion.version).where(DataVersion.table_name.in_(tables))
+    ).all()
+    versions = {name: 0 for name in tables}
+    versions.update({name: version for name, version in rows})
+    return versions
+
+
+def version_key(db: Session, tables: Iterable[str]) -> Tuple[int, ...]:
+    """Versions of the given tables as a hashable tuple, ordered by table name"""
+    versions = get_data_versions(db, tables)
+    return tuple(versions[name] for name in sorted(versions))
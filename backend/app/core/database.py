@@ -30,6 +30,11 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    """Initialize database tables by applying pending schema migrations"""
+    import app.models  # noqa: F401 - register every model on Base.metadata
+    import app.core.data_version  # noqa: F401 - register write-version session hooks
+    import app.core.inventory_counters  # noqa: F401 - register inventory counter session hooks
+    import app.core.asset_rollups  # noqa: F401 - register asset rollup session hooks
+    from app.core.migrations import run_migrations
+    run_migrations(engine)
 
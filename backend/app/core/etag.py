@@ -0,0 +1,91 @@
+"""
+Conditional GET for read endpoints.
+
+A route opts in with dependencies=[Depends(etag_for(...tables))]. The
+dependency reads the data versions of those tables (one query), derives a
+strong ETag from them plus the request path and query string, and answers
+304 when If-None-Match already holds it, before the handler runs. Otherwise
+the ETag (and the versions, for handlers with version-keyed caches) is left
+on request.state and ETagMiddleware adds it to the 200 response, whichever
+Response class the handler returned.
+"""
+import hashlib
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.core.data_version import get_data_versions
+from app.core.database import get_db
+
+# Clients must revalidate, but may keep the body for a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(request: Request, versions: dict) -> str:
+    """Strong ETag for this path, query parameters and table versions"""
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    state = ",".join(f"{name}:{versions[name]}" for name in sorted(versions))
+    digest = hashlib.sha256(f"{request.url.path}?{query}|{state}".encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def etag_for(*tables: str) -> Callable:
+    """Dependency that short-circuits to 304 while the given tables are unchanged"""
+    def check(request: Request, db: Session = Depends(get_db)) -> None:
+        versions = get_data_versions(db, tables)
+        etag = compute_etag(request, versions)
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+            )
+        request.state.etag = etag
+        request.state.data_versions = versions
+
+    return check
+
+
+class ETagMiddleware:
+    """Adds the ETag computed by etag_for to successful responses"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        # request.state reads and writes this same dict
+        state = scope.setdefault("state", {})
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = state.get("etag")
+                if etag:
+                    headers = [
+                        (name, value) for name, value in message.get("headers", [])
+                        if name.lower() not in (b"etag", b"cache-control")
+                    ]
+                    headers.append((b"etag", etag.encode("latin-1")))
+                    headers.append((b"cache-control", CACHE_CONTROL.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
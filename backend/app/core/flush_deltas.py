@@ -0,0 +1,122 @@
+"""
+Shared machinery for summaries kept current by flush deltas.
+
+The inventory counters and asset rollups both add each flushed object's
+change to stored totals in the writing transaction. This module derives
+those changes from attribute history, and lets each summary register the
+tables whose bulk insert/update/delete statements bypass the flush hook: such
+a statement flags the session, and the summary's handler rebuilds it from the
+tables before commit (later pending changes are flushed after that and add
+their deltas on top). A rollback clears the flags.
+"""
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+
+UNKNOWN = object()
+
+# (attribute, measure, contribution of the attribute value)
+Measures = Iterable[Tuple[str, str, Callable]]
+
+
+def count(value) -> int:
+    return int(value or 0)
+
+
+def money(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def present(value) -> int:
+    return 0 if value is None else 1
+
+
+def value_before(history):
+    """Value before this flush, UNKNOWN if it was never loaded"""
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return UNKNOWN
+
+
+def value_after(history):
+    """Value after this flush, UNKNOWN if it was never loaded"""
+    if history.added:
+        return history.added[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return UNKNOWN
+
+
+def flushed_objects(session: Session) -> List[Tuple[object, bool, bool]]:
+    """(object, is_new, is_deleted) for every object in this flush"""
+    return (
+        [(obj, True, False) for obj in session.new]
+        + [(obj, False, True) for obj in session.deleted]
+        + [(obj, False, False) for obj in session.dirty]
+    )
+
+
+def measure_delta(obj, measures: Measures, is_new: bool, is_deleted: bool) -> Optional[Dict[str, object]]:
+    """Measure changes made by one flushed object, or None if they cannot be known"""
+    state = inspect(obj)
+    delta = {}
+    for attribute, measure, contribution in measures:
+        history = state.attrs[attribute].history
+        if is_new:
+            change = contribution(state.dict.get(attribute))
+        elif is_deleted:
+            old = value_before(history)
+            if old is UNKNOWN:
+                return None
+            change = -contribution(old)
+        else:
+            if not history.added and not history.deleted:
+                continue
+            old = value_before(history)
+            if old is UNKNOWN:
+                return None
+            change = contribution(history.added[0] if history.added else None) - contribution(old)
+        if change:
+            delta[measure] = delta.get(measure, 0) + change
+    return delta
+
+
+# (session.info flag, tables, rebuild handler) per registered summary
+_bulk_handlers: List[Tuple[str, frozenset, Callable[[Connection], None]]] = []
+
+
+def rebuild_after_bulk_statements(key: str, tables: Iterable[str], handler: Callable[[Connection], None]) -> None:
+    """Run handler before commit in any transaction with a bulk statement on one of tables"""
+    _bulk_handlers.append((key, frozenset(tables), handler))
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_bulk_statement(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is None:
+        return
+    for key, tables, _ in _bulk_handlers:
+        if table.name in tables:
+            orm_execute_state.session.info[key] = True
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _rebuild_flagged(session: Session) -> None:
+    for key, _, handler in _bulk_handlers:
+        if session.info.pop(key, False):
+            handler(session.connection())
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_flags(session: Session) -> None:
+    for key, _, _ in _bulk_handlers:
+        session.info.pop(key, None)
@@ -0,0 +1,246 @@
+"""
+Incrementally maintained global inventory totals.
+
+The inventory_counter row holds the totals the dashboard shows. An
+after_flush hook adds the change each flushed Asset and AssetStock object
+makes to them (from attribute history, see app.core.flush_deltas), in the
+same transaction as the write; assignment and scrap writes reach the totals
+through their asset_stock rows.
+Where a delta cannot be known (a bulk statement on asset or asset_stock, or an
+old value that was never loaded) the row is recomputed from the tables in the
+writing transaction instead. verify() recomputes from scratch and reports
+drift; InventoryVerifier runs it, and the asset rollup check, every
+INVENTORY_VERIFY_INTERVAL_SECONDS.
+"""
+import logging
+import threading
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import case, event, func, select, true, update, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.asset_rollups import verify as verify_rollups
+from app.core.data_version import bump
+from app.core.database import SessionLocal
+from app.core.flush_deltas import (
+    Measures, count, flushed_objects, measure_delta, money, present, rebuild_after_bulk_statements
+)
+from app.models import Asset, AssetStock, InventoryCounter
+
+logger = logging.getLogger(__name__)
+
+COUNTER_ID = 1
+
+COUNTER_FIELDS = (
+    "asset_count", "total_quantity", "original_cost", "current_cost",
+    "assigned_quantity", "scrapped_quantity", "multiple_teacher_assets"
+)
+COST_FIELDS = ("original_cost", "current_cost")
+
+# Bulk statements on these tables bypass the flush hook
+RECOMPUTE_TABLES = {Asset.__tablename__, AssetStock.__tablename__}
+
+
+def _normalize(name: str, value):
+    return money(value).quantize(Decimal("0.01")) if name in COST_FIELDS else count(value)
+
+
+def _shared(value) -> int:
+    return 1 if (value or 0) > 1 else 0
+
+
+# (attribute, counter, contribution of the attribute value) per counted model
+COUNTED_ATTRIBUTES: Dict[type, Measures] = {
+    Asset: (
+        ("asset_id", "asset_count", present),
+        ("total_quantity", "total_quantity", count),
+        ("original_total_cost", "original_cost", money),
+        ("current_total_cost", "current_cost", money),
+    ),
+    AssetStock: (
+        ("assigned_quantity", "assigned_quantity", count),
+        ("scrapped_quantity", "scrapped_quantity", count),
+        ("active_teacher_count", "multiple_teacher_assets", _shared),
+    ),
+}
+
+
+def _asset_totals():
+    return select(
+        func.count(Asset.asset_id).label("asset_count"),
+        func.coalesce(func.sum(Asset.total_quantity), 0).label("total_quantity"),
+        func.coalesce(func.sum(Asset.original_total_cost), 0).label("original_cost"),
+        func.coalesce(func.sum(Asset.current_total_cost), 0).label("current_cost"),
+    )
+
+
+def _stock_totals():
+    return select(
+        func.coalesce(func.sum(AssetStock.assigned_quantity), 0).label("assigned_quantity"),
+        func.coalesce(func.sum(AssetStock.scrapped_quantity), 0).label("scrapped_quantity"),
+        func.count(case((AssetStock.active_teacher_count > 1, 1))).label("multiple_teacher_assets"),
+    )
+
+
+def actual_totals_statement():
+    """One-row select of every counter computed from the asset and asset_stock tables"""
+    asset_totals = _asset_totals().cte("asset_totals")
+    stock_totals = _stock_totals().cte("stock_totals")
+    return select(asset_totals, stock_totals).select_from(asset_totals.join(stock_totals, true()))
+
+
+def compute_totals(conn: Connection) -> Dict[str, object]:
+    """Every counter recomputed from the tables"""
+    row = conn.execute(actual_totals_statement()).one()._mapping
+    return {name: _normalize(name, row[name]) for name in COUNTER_FIELDS}
+
+
+def _lock_counter_row(conn: Connection) -> None:
+    """
+    Row lock on the counter row, which every delta update also takes. Taken
+    before a transaction's first read, its snapshot then includes every delta
+    committed so far, and later writers wait until it commits.
+    """
+    conn.execute(select(InventoryCounter.id).where(InventoryCounter.id == COUNTER_ID).with_for_update())
+
+
+def _store(conn: Connection, totals: Dict[str, object]) -> None:
+    values = {**totals, "updated_at": datetime.now()}
+    result = conn.execute(update(InventoryCounter).where(InventoryCounter.id == COUNTER_ID).values(**values))
+    if result.rowcount == 0:
+        conn.execute(insert(InventoryCounter).values(id=COUNTER_ID, **values))
+
+
+def recompute(conn: Connection) -> None:
+    """
+    Overwrite the counter row with totals recomputed from the tables, in one
+    UPDATE. Its subqueries read the latest committed rows (InnoDB reads the
+    source tables of a DML statement with locks, not from the snapshot), so
+    this is safe inside a transaction that has already read: deltas other
+    writers committed since are counted rather than overwritten.
+    """
+    totals = {
+        column.name: statement.with_only_columns(column).scalar_subquery()
+        for statement in (_asset_totals(), _stock_totals())
+        for column in statement.selected_columns
+    }
+    _store(conn, totals)
+
+
+def read_counters(db: Session) -> Dict[str, object]:
+    """The stored counters (one primary-key read)"""
+    row = db.execute(
+        select(*(getattr(InventoryCounter, name) for name in COUNTER_FIELDS), InventoryCounter.updated_at)
+        .where(InventoryCounter.id == COUNTER_ID)
+    ).one_or_none()
+    if row is None:
+        return {name: 0 for name in COUNTER_FIELDS} | {"updated_at": None}
+    return dict(row._mapping)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _apply_flush_deltas(session: Session, flush_context) -> None:
+    totals: Dict[str, object] = {}
+    for obj, is_new, is_deleted in flushed_objects(session):
+        attributes = COUNTED_ATTRIBUTES.get(type(obj))
+        if attributes is None:
+            continue
+        delta = measure_delta(obj, attributes, is_new, is_deleted)
+        if delta is None:
+            # This flush is already in the database, so a recompute includes it
+            recompute(session.connection())
+            return
+        for counter, change in delta.items():
+            totals[counter] = totals.get(counter, 0) + change
+
+    if totals:
+        session.connection().execute(
+            update(InventoryCounter)
+            .where(InventoryCounter.id == COUNTER_ID)
+            .values(
+                updated_at=datetime.now(),
+                **{name: getattr(InventoryCounter, name) + change for name, change in totals.items()}
+            )
+        )
+
+
+rebuild_after_bulk_statements("inventory_counters_stale", RECOMPUTE_TABLES, recompute)
+
+
+def verify(db: Session, repair: bool = False) -> dict:
+    """
+    Compare the stored counters with totals recomputed from the tables.
+    With repair, db must not have read anything in its current transaction:
+    the counter row is locked first, so the comparison and the overwrite of
+    drifted counters can't race a writer's delta. The transaction is then
+    ended (committed if anything was repaired) to release the lock.
+    """
+    if repair:
+        _lock_counter_row(db.connection())
+    stored = read_counters(db)
+    actual = compute_totals(db.connection())
+    drift = {
+        name: {"stored": stored[name], "actual": actual[name]}
+        for name in COUNTER_FIELDS
+        if _normalize(name, stored[name]) != actual[name]
+    }
+    if repair and drift:
+        _store(db.connection(), actual)
+        # Cache keys cover the counter row's own version too
+        bump(db.connection(), [InventoryCounter.__tablename__])
+        db.commit()
+    elif repair:
+        db.rollback()
+    return {"checked_at": datetime.now().isoformat(timespec="seconds"), "drift": drift, "repaired": bool(repair and drift)}
+
+
+class InventoryVerifier:
+    """Background thread that verifies (and repairs) the counters and rollups periodically"""
+
+    def __init__(self):
+        self.last_report: Optional[dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> dict:
+        db = SessionLocal()
+        try:
+            report = verify(db, repair=True)
+            report["rollups"] = verify_rollups(db, repair=True)
+        finally:
+            db.close()
+        if report["drift"]:
+            fields = ", ".join(
+                f"{name}: {values['stored']} → {values['actual']}" for name, values in report["drift"].items()
+            )
+            logger.warning("Inventory counters drifted and were repaired (%s)", fields)
+        if report["rollups"]["drifted_groups"]:
+            logger.warning("%d asset rollup groups drifted and were rebuilt", len(report["rollups"]["drifted_groups"]))
+        self.last_report = report
+        return report
+
+    def _run(self, interval: int) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Inventory counter verification failed")
+
+    def start(self) -> None:
+        interval = settings.INVENTORY_VERIFY_INTERVAL_SECONDS
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="inventory-verifier", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+
+inventory_verifier = InventoryVerifier()
@@ -0,0 +1,176 @@
+"""
+Versioned schema migrations.
+
+Each migration is (version, description, upgrade) where upgrade receives a
+Connection inside its own transaction. Applied versions are recorded in the
+schema_migration table, so init_db only runs what a database is missing.
+Migrations create and backfill the objects frozen for them in
+app.core.schema_snapshots, never through the live models or services, so a
+version means the same schema on every database.
+Append new migrations to MIGRATIONS; never edit or reorder applied ones.
+"""
+from datetime import datetime
+from typing import Callable, Iterable, List, Tuple
+
+from sqlalchemy import (
+    Column, DateTime, Index, Integer, MetaData, String, Table, case, delete, func, insert, inspect, literal, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from app.core import schema_snapshots
+
+migration_metadata = MetaData()
+
+schema_migration = Table(
+    "schema_migration",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_tables(conn: Connection, tables: List[Table]) -> None:
+    """Create the given snapshot tables if missing (their indexes belong to the migrations that add them)"""
+    existing = set(inspect(conn).get_table_names())
+    for table in tables:
+        if table.name not in existing:
+            conn.execute(CreateTable(table))
+
+
+def _create_indexes(conn: Connection, indexes: List[Index]) -> None:
+    """Create each snapshot index if it is missing"""
+    for index in indexes:
+        index.create(bind=conn, checkfirst=True)
+
+
+def _drop_indexes(conn: Connection, table_name: str, index_names: Iterable[str]) -> None:
+    """Drop the named indexes that exist on the table"""
+    existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    for name in index_names:
+        if name in existing:
+            if conn.dialect.name == "mysql":
+                conn.execute(text(f"DROP INDEX {name} ON {table_name}"))
+            else:
+                conn.execute(text(f"DROP INDEX {name}"))
+
+
+def _baseline(conn: Connection) -> None:
+    """Create any missing tables of the pre-migration schema (existing tables are left untouched)"""
+    _create_tables(conn, schema_snapshots.BASELINE_TABLES)
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    """Composite indexes for the listing, stock, scrap and dashboard queries"""
+    _create_indexes(conn, schema_snapshots.HOT_PATH_INDEXES)
+
+
+def _full_text_search(conn: Connection) -> None:
+    """FULLTEXT indexes (MySQL) or FTS5 table and triggers (SQLite) for asset search"""
+    from app.services.search_backend import sqlite_has_fts5
+    if conn.dialect.name in ("mysql", "mariadb"):
+        inspector = inspect(conn)
+        for table_name, index_name, columns in schema_snapshots.FULLTEXT_INDEXES:
+            if index_name not in {index["name"] for index in inspector.get_indexes(table_name)}:
+                conn.execute(text(f"CREATE FULLTEXT INDEX {index_name} ON {table_name} ({columns})"))
+    elif conn.dialect.name == "sqlite" and sqlite_has_fts5(conn):
+        for statement in schema_snapshots.ASSET_FTS_DDL + schema_snapshots.ASSET_FTS_BACKFILL:
+            conn.execute(text(statement))
+
+
+def _data_versions(conn: Connection) -> None:
+    """Per-table write counters used to key caches"""
+    _create_tables(conn, [schema_snapshots.data_version])
+
+
+def _inventory_counters(conn: Connection) -> None:
+    """Global inventory totals row, seeded from the current tables"""
+    counter, asset, stock = schema_snapshots.inventory_counter, schema_snapshots.asset, schema_snapshots.asset_stock
+    _create_tables(conn, [counter])
+    totals = select(
+        literal(1).label("id"),
+        select(func.count(asset.c.asset_id)).scalar_subquery(),
+        select(func.coalesce(func.sum(asset.c.total_quantity), 0)).scalar_subquery(),
+        select(func.coalesce(func.sum(asset.c.original_total_cost), 0)).scalar_subquery(),
+        select(func.coalesce(func.sum(asset.c.current_total_cost), 0)).scalar_subquery(),
+        select(func.coalesce(func.sum(stock.c.assigned_quantity), 0)).scalar_subquery(),
+        select(func.coalesce(func.sum(stock.c.scrapped_quantity), 0)).scalar_subquery(),
+        select(func.count(case((stock.c.active_teacher_count > 1, 1)))).scalar_subquery(),
+        literal(datetime.now(), DateTime),
+    )
+    conn.execute(delete(counter))
+    conn.execute(insert(counter).from_select([column.name for column in counter.columns], totals))
+
+
+def _asset_rollups(conn: Connection) -> None:
+    """Asset totals per financial year, category, lab, vendor and special flag"""
+    rollup, asset, stock = schema_snapshots.asset_rollup, schema_snapshots.asset, schema_snapshots.asset_stock
+    _create_tables(conn, [rollup])
+    _create_indexes(conn, schema_snapshots.ASSET_ROLLUP_INDEXES)
+    dimensions = [asset.c.financial_year, asset.c.category_id, asset.c.lab_id, asset.c.vendor_id, asset.c.is_special_hardware]
+    groups = select(
+        (
+            asset.c.financial_year + "|" + func.coalesce(asset.c.category_id, "") + "|"
+            + func.coalesce(asset.c.lab_id, "") + "|" + func.coalesce(asset.c.vendor_id, "") + "|"
+            + case((asset.c.is_special_hardware, "1"), else_="0")
+        ),
+        *dimensions,
+        func.count(asset.c.asset_id),
+        func.coalesce(func.sum(asset.c.total_quantity), 0),
+        func.coalesce(func.sum(stock.c.assigned_quantity), 0),
+        func.coalesce(func.sum(stock.c.scrapped_quantity), 0),
+        func.coalesce(func.sum(asset.c.original_total_cost), 0),
+        func.coalesce(func.sum(asset.c.current_total_cost), 0),
+    ).select_from(asset.outerjoin(stock, stock.c.asset_id == asset.c.asset_id)).group_by(*dimensions)
+    conn.execute(delete(rollup))
+    conn.execute(insert(rollup).from_select([column.name for column in rollup.columns], groups))
+
+
+def _scrap_ledger_indexes(conn: Connection) -> None:
+    """Replace the scrap date indexes with ledger-order ones (same-day ties by created_at, scrap_id)"""
+    _create_indexes(conn, schema_snapshots.SCRAP_LEDGER_INDEXES)
+    _drop_indexes(conn, "scrap", schema_snapshots.SCRAP_DATE_INDEX_NAMES)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "baseline schema", _baseline),
+    (2, "indexes for hot filter and join columns", _hot_path_indexes),
+    (3, "full-text search index for assets", _full_text_search),
+    (4, "per-table data version counters", _data_versions),
+    (5, "global inventory counters", _inventory_counters),
+    (6, "asset rollups by financial year, category, lab and vendor", _asset_rollups),
+    (7, "scrap ledger-order indexes", _scrap_ledger_indexes),
+]
+
+
+def get_applied_versions(engine: Engine) -> List[int]:
+    """Versions already recorded in schema_migration"""
+    migration_metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        return [row.version for row in conn.execute(select(schema_migration.c.version))]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply pending migrations in order and return the versions applied"""
+    applied = set(get_applied_versions(engine))
+    newly_applied = []
+
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(schema_migration.insert().values(
+                version=version,
+                description=description,
+                applied_at=datetime.now()
+            ))
+        newly_applied.append(version)
+
+    # Every model table needs a data_version row for its writes to be counted
+    from app.core.data_version import ensure_data_versions
+    with engine.begin() as conn:
+        ensure_data_versions(conn)
+
+    return newly_applied
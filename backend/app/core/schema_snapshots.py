@@ -0,0 +1,261 @@
+"""
+Frozen table, index and trigger definitions for app.core.migrations.
+
+Each migration creates exactly the objects listed here for it, as they were
+when the migration was written, and backfills them with statements over
+these tables, so a version means the same schema and data however the
+models change later. Tables are created without their indexes; every index
+belongs to the migration that added it. Never edit these; describe a schema
+change as a new migration with its own definitions.
+"""
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, Numeric, String, Table, Text,
+    UniqueConstraint, text,
+)
+
+snapshot_metadata = MetaData()
+
+
+def _created_at() -> Column:
+    return Column("created_at", DateTime, server_default=text("CURRENT_TIMESTAMP"))
+
+
+# Migration 1: the schema before versioned migrations
+
+lab = Table(
+    "lab", snapshot_metadata,
+    Column("lab_id", String(36), primary_key=True),
+    Column("lab_name", Text, nullable=False),
+    Column("room_number", Text),
+    Column("status", String(50), nullable=False),
+    _created_at(),
+)
+
+vendor = Table(
+    "vendor", snapshot_metadata,
+    Column("vendor_id", String(36), primary_key=True),
+    Column("vendor_name", Text, nullable=False),
+    Column("bill_number", Text),
+    Column("contact_info", Text),
+    _created_at(),
+)
+
+category = Table(
+    "category", snapshot_metadata,
+    Column("category_id", String(36), primary_key=True),
+    Column("name", String(255), nullable=False, unique=True),
+    Column("is_special", Boolean, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+)
+
+teacher = Table(
+    "teacher", snapshot_metadata,
+    Column("teacher_id", String(36), primary_key=True),
+    Column("name", Text, nullable=False),
+    Column("department", Text),
+    Column("designation", Text),
+    Column("is_active", Boolean),
+    _created_at(),
+)
+
+scrap_phase = Table(
+    "scrap_phase", snapshot_metadata,
+    Column("phase_id", String(36), primary_key=True),
+    Column("name", String(255), nullable=False, unique=True),
+    Column("description", String(500)),
+    Column("is_active", Boolean, nullable=False),
+    _created_at(),
+)
+
+app_user = Table(
+    "app_user", snapshot_metadata,
+    Column("user_id", String(36), primary_key=True),
+    Column("email", String(255), nullable=False),
+    Column("role", String(50), nullable=False),
+    _created_at(),
+    UniqueConstraint("email", name="uq_user_email"),
+)
+
+asset = Table(
+    "asset", snapshot_metadata,
+    Column("asset_id", String(36), primary_key=True),
+    Column("description", Text, nullable=False),
+    Column("category_id", String(36), ForeignKey("category.category_id")),
+    Column("is_special_hardware", Boolean, nullable=False),
+    Column("total_quantity", Integer, nullable=False),
+    Column("purchase_date", Date, nullable=False),
+    Column("financial_year", Text, nullable=False),
+    Column("vendor_id", String(36), ForeignKey("vendor.vendor_id")),
+    Column("original_total_cost", Numeric(14, 2), nullable=False),
+    Column("current_total_cost", Numeric(14, 2), nullable=False),
+    Column("lab_id", String(36), ForeignKey("lab.lab_id")),
+    Column("physical_location", Text),
+    Column("remarks", Text),
+    _created_at(),
+    Column("updated_at", DateTime, server_default=text("CURRENT_TIMESTAMP")),
+)
+
+asset_assignment = Table(
+    "asset_assignment", snapshot_metadata,
+    Column("assignment_id", String(36), primary_key=True),
+    Column("asset_id", String(36), ForeignKey("asset.asset_id", ondelete="CASCADE"), nullable=False),
+    Column("teacher_id", String(36), ForeignKey("teacher.teacher_id", ondelete="SET NULL")),
+    Column("assigned_quantity", Integer, nullable=False),
+    Column("assignment_date", Date, nullable=False),
+    Column("return_date", Date),
+    Column("current_location", Text),
+    Column("remarks", Text),
+    _created_at(),
+)
+
+scrap = Table(
+    "scrap", snapshot_metadata,
+    Column("scrap_id", String(36), primary_key=True),
+    Column("asset_id", String(36), ForeignKey("asset.asset_id", ondelete="CASCADE"), nullable=False),
+    Column("scrapped_quantity", Integer, nullable=False),
+    Column("scrap_date", Date, nullable=False),
+    Column("phase_id", String(36), ForeignKey("scrap_phase.phase_id", ondelete="RESTRICT"), nullable=False),
+    Column("scrap_value", Numeric(14, 2), nullable=False),
+    Column("remarks", Text),
+    _created_at(),
+)
+
+asset_stock = Table(
+    "asset_stock", snapshot_metadata,
+    Column("asset_id", String(36), ForeignKey("asset.asset_id", ondelete="CASCADE"), primary_key=True),
+    Column("assigned_quantity", Integer, nullable=False),
+    Column("scrapped_quantity", Integer, nullable=False),
+    Column("available_quantity", Integer, nullable=False),
+    Column("active_teacher_count", Integer, nullable=False),
+    Column("updated_at", DateTime, server_default=text("CURRENT_TIMESTAMP")),
+)
+
+BASELINE_TABLES = [
+    lab, vendor, category, teacher, scrap_phase, app_user, asset, asset_assignment, scrap, asset_stock
+]
+
+# Migration 2: indexes for hot filter and join columns
+
+HOT_PATH_INDEXES = [
+    Index("ix_asset_purchase_date", asset.c.purchase_date, asset.c.asset_id),
+    Index(
+        "ix_asset_fy_purchase_date", asset.c.financial_year, asset.c.purchase_date, asset.c.asset_id,
+        mysql_length={"financial_year": 9}
+    ),
+    Index("ix_asset_lab_purchase_date", asset.c.lab_id, asset.c.purchase_date, asset.c.asset_id),
+    Index("ix_asset_category_purchase_date", asset.c.category_id, asset.c.purchase_date, asset.c.asset_id),
+    Index("ix_asset_vendor_purchase_date", asset.c.vendor_id, asset.c.purchase_date, asset.c.asset_id),
+    Index(
+        "ix_assignment_asset_return",
+        asset_assignment.c.asset_id, asset_assignment.c.return_date, asset_assignment.c.assigned_quantity
+    ),
+    Index(
+        "ix_assignment_teacher_return",
+        asset_assignment.c.teacher_id, asset_assignment.c.return_date, asset_assignment.c.asset_id
+    ),
+    Index("ix_assignment_teacher_date", asset_assignment.c.teacher_id, asset_assignment.c.assignment_date),
+    Index("ix_assignment_date", asset_assignment.c.assignment_date),
+    Index("ix_scrap_asset_date", scrap.c.asset_id, scrap.c.scrap_date),
+    Index("ix_scrap_date", scrap.c.scrap_date),
+    Index("ix_scrap_phase_date", scrap.c.phase_id, scrap.c.scrap_date),
+    Index("ix_asset_stock_teacher_count", asset_stock.c.active_teacher_count),
+]
+
+# Migration 3: full-text search. MySQL gets FULLTEXT indexes; SQLite builds
+# with FTS5 get a table keyed by asset.rowid, kept current by triggers
+
+FULLTEXT_INDEXES = [
+    ("asset", "ft_asset_text", "description, remarks"),
+    ("vendor", "ft_vendor_name", "vendor_name"),
+]
+
+_FTS_VENDOR_NAME = "(SELECT vendor_name FROM vendor WHERE vendor_id = NEW.vendor_id)"
+
+ASSET_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS asset_fts USING fts5("
+    "description, remarks, vendor_name, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    f"""CREATE TRIGGER IF NOT EXISTS asset_fts_ai AFTER INSERT ON asset BEGIN
+        INSERT INTO asset_fts(rowid, description, remarks, vendor_name)
+        VALUES (NEW.rowid, NEW.description, NEW.remarks, {_FTS_VENDOR_NAME});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS asset_fts_au AFTER UPDATE OF description, remarks, vendor_id ON asset BEGIN
+        DELETE FROM asset_fts WHERE rowid = OLD.rowid;
+        INSERT INTO asset_fts(rowid, description, remarks, vendor_name)
+        VALUES (NEW.rowid, NEW.description, NEW.remarks, {_FTS_VENDOR_NAME});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS asset_fts_ad AFTER DELETE ON asset BEGIN
+        DELETE FROM asset_fts WHERE rowid = OLD.rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS asset_fts_vendor_ai AFTER INSERT ON vendor BEGIN
+        UPDATE asset_fts SET vendor_name = NEW.vendor_name
+        WHERE rowid IN (SELECT rowid FROM asset WHERE vendor_id = NEW.vendor_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS asset_fts_vendor_au AFTER UPDATE OF vendor_name ON vendor BEGIN
+        UPDATE asset_fts SET vendor_name = NEW.vendor_name
+        WHERE rowid IN (SELECT rowid FROM asset WHERE vendor_id = NEW.vendor_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS asset_fts_vendor_ad AFTER DELETE ON vendor BEGIN
+        UPDATE asset_fts SET vendor_name = NULL
+        WHERE rowid IN (SELECT rowid FROM asset WHERE vendor_id = OLD.vendor_id);
+    END""",
+]
+
+ASSET_FTS_BACKFILL = [
+    "DELETE FROM asset_fts",
+    "INSERT INTO asset_fts(rowid, description, remarks, vendor_name) "
+    "SELECT asset.rowid, asset.description, asset.remarks, vendor.vendor_name "
+    "FROM asset LEFT JOIN vendor ON vendor.vendor_id = asset.vendor_id",
+]
+
+# Migration 4: per-table data version counters
+
+data_version = Table(
+    "data_version", snapshot_metadata,
+    Column("table_name", String(64), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+# Migration 5: global inventory counters
+
+inventory_counter = Table(
+    "inventory_counter", snapshot_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("asset_count", Integer, nullable=False),
+    Column("total_quantity", Integer, nullable=False),
+    Column("original_cost", Numeric(16, 2), nullable=False),
+    Column("current_cost", Numeric(16, 2), nullable=False),
+    Column("assigned_quantity", Integer, nullable=False),
+    Column("scrapped_quantity", Integer, nullable=False),
+    Column("multiple_teacher_assets", Integer, nullable=False),
+    Column("updated_at", DateTime),
+)
+
+# Migration 6: asset rollups
+
+asset_rollup = Table(
+    "asset_rollup", snapshot_metadata,
+    Column("rollup_key", String(160), primary_key=True),
+    Column("financial_year", Text, nullable=False),
+    Column("category_id", String(36)),
+    Column("lab_id", String(36)),
+    Column("vendor_id", String(36)),
+    Column("is_special_hardware", Boolean, nullable=False),
+    Column("asset_count", Integer, nullable=False),
+    Column("total_quantity", Integer, nullable=False),
+    Column("assigned_quantity", Integer, nullable=False),
+    Column("scrapped_quantity", Integer, nullable=False),
+    Column("original_cost", Numeric(16, 2), nullable=False),
+    Column("current_cost", Numeric(16, 2), nullable=False),
+)
+
+ASSET_ROLLUP_INDEXES = [
+    Index("ix_asset_rollup_financial_year", asset_rollup.c.financial_year, mysql_length={"financial_year": 9}),
+]
+
+# Migration 7: scrap ledger-order indexes, replacing ix_scrap_asset_date and ix_scrap_date
+
+SCRAP_LEDGER_INDEXES = [
+    Index("ix_scrap_asset_ledger", scrap.c.asset_id, scrap.c.scrap_date, scrap.c.created_at, scrap.c.scrap_id),
+    Index("ix_scrap_ledger", scrap.c.scrap_date, scrap.c.created_at, scrap.c.scrap_id),
+]
+SCRAP_DATE_INDEX_NAMES = ("ix_scrap_asset_date", "ix_scrap_date")
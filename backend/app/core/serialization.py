@@ -0,0 +1,69 @@
+"""
+Fast JSON responses for list endpoints.
+
+Services hand back plain dicts built from row tuples; FastJSONResponse
+encodes them with orjson in one pass, skipping response-model validation
+and jsonable_encoder. Output matches what the Pydantic response models
+produce: dates and datetimes as ISO strings, Decimal as a string.
+iter_ndjson and iter_json_object encode long item streams in batches for
+StreamingResponse, so the full list is never held in memory.
+"""
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+import orjson
+from fastapi.responses import Response
+
+
+def _default(value: Any):
+    """Types orjson doesn't encode natively"""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode trusted data to JSON bytes"""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(Response):
+    """JSON response for already-shaped dicts/lists; no validation is done"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Items encoded per chunk when streaming
+STREAM_BATCH_ITEMS = 500
+
+
+def _batches(items: Iterable[Any]) -> Iterator[list]:
+    items = iter(items)
+    while True:
+        batch = list(islice(items, STREAM_BATCH_ITEMS))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_ndjson(items: Iterable[Any]) -> Iterator[bytes]:
+    """One JSON document per line"""
+    for batch in _batches(items):
+        yield b"".join(dumps(item) + b"\n" for item in batch)
+
+
+def iter_json_object(head: dict, key: str, items: Iterable[Any]) -> Iterator[bytes]:
+    """A JSON object with head's fields plus key holding items as an array"""
+    prefix = dumps(head)[:-1] + (b"," if head else b"")
+    yield prefix + dumps(key) + b":["
+    first = True
+    for batch in _batches(items):
+        yield (b"" if first else b",") + b",".join(dumps(item) for item in batch)
+        first = False
+    yield b"]}"
@@ -1,8 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import init_db
+from app.core.database import init_db, SessionLocal
+from app.core import data_version  # noqa: F401 - registers write-version session hooks
+from app.core.inventory_counters import inventory_verifier
 from app.api.v1 import api_router
 from app.core.config import settings
+from app.core.etag import ETagMiddleware
+from app.services.dashboard_service import AGE_SECONDS_HEADER, COMPUTED_AT_HEADER
+from app.services.stock_service import StockService
+from app.services.report_jobs import report_job_manager
+from app.services.report_pdf import shutdown_pdf_pool
 
 app = FastAPI(
     title="Deadstock & Asset Management System",
@@ -22,8 +29,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[COMPUTED_AT_HEADER, AGE_SECONDS_HEADER],
 )
 
+# ETag / 304 handling for read endpoints (see app.core.etag)
+app.add_middleware(ETagMiddleware)
+
 # Include routers
 app.include_router(api_router)
 
@@ -31,6 +42,22 @@ app.include_router(api_router)
 @app.on_event("startup")
 def startup_event():
     init_db()
+    
+    # Backfill the stock summary for databases created before it existed
+    db = SessionLocal()
+    try:
+        StockService().ensure_populated(db)
+    finally:
+        db.close()
+    
+    inventory_verifier.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    report_job_manager.shutdown()
+    inventory_verifier.stop()
+    shutdown_pdf_pool()
 
 
 @app.get("/")
@@ -7,6 +7,10 @@ from app.models.assignment import AssetAssignment
 from app.models.scrap import Scrap
 from app.models.scrap_phase import ScrapPhase
 from app.models.user import User
+from app.models.asset_stock import AssetStock
+from app.models.data_version import DataVersion
+from app.models.inventory_counter import InventoryCounter
+from app.models.asset_rollup import AssetRollup
 
 __all__ = [
     "Lab",
@@ -18,5 +22,9 @@ __all__ = [
     "Scrap",
     "ScrapPhase",
     "User",
+    "AssetStock",
+    "DataVersion",
+    "InventoryCounter",
+    "AssetRollup",
 ]
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Date, Numeric, Boolean, DateTime, ForeignKey, text
+from sqlalchemy import Column, String, Text, Integer, Date, Numeric, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -7,6 +7,14 @@ import uuid
 
 class Asset(Base):
     __tablename__ = "asset"
+    __table_args__ = (
+        # Default listing order (purchase_date, asset_id) doubles as the keyset
+        Index("ix_asset_purchase_date", "purchase_date", "asset_id"),
+        Index("ix_asset_fy_purchase_date", "financial_year", "purchase_date", "asset_id", mysql_length={"financial_year": 9}),
+        Index("ix_asset_lab_purchase_date", "lab_id", "purchase_date", "asset_id"),
+        Index("ix_asset_category_purchase_date", "category_id", "purchase_date", "asset_id"),
+        Index("ix_asset_vendor_purchase_date", "vendor_id", "purchase_date", "asset_id"),
+    )
     
     asset_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     description = Column(Text, nullable=False)
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Text, Integer, Numeric, Boolean, Index
+from app.core.database import Base
+
+
+class AssetRollup(Base):
+    """
+    Asset totals pre-aggregated by financial year, category, lab, vendor and
+    special-hardware flag.
+    
+    One row per combination that has assets, adjusted in the same transaction
+    as every asset and stock-row write (see app.core.asset_rollups), so
+    summaries read these rows instead of scanning the register. rollup_key
+    joins the dimension values, since nullable columns can't form the key.
+    """
+    __tablename__ = "asset_rollup"
+    __table_args__ = (
+        Index("ix_asset_rollup_financial_year", "financial_year", mysql_length={"financial_year": 9}),
+    )
+    
+    rollup_key = Column(String(160), primary_key=True)
+    financial_year = Column(Text, nullable=False)
+    category_id = Column(String(36), nullable=True)
+    lab_id = Column(String(36), nullable=True)
+    vendor_id = Column(String(36), nullable=True)
+    is_special_hardware = Column(Boolean, nullable=False)
+    
+    asset_count = Column(Integer, default=0, nullable=False)
+    total_quantity = Column(Integer, default=0, nullable=False)
+    assigned_quantity = Column(Integer, default=0, nullable=False)
+    scrapped_quantity = Column(Integer, default=0, nullable=False)
+    original_cost = Column(Numeric(16, 2), default=0, nullable=False)
+    current_cost = Column(Numeric(16, 2), default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<AssetRollup(key={self.rollup_key}, assets={self.asset_count}, quantity={self.total_quantity})>"
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, text
+from sqlalchemy.orm import relationship, backref
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AssetStock(Base):
+    """
+    Materialized per-asset stock summary.
+    
+    Maintained in the same transaction as every assignment, return, scrap and
+    asset write so availability checks and listings read one row instead of
+    summing the assignment and scrap history.
+    """
+    __tablename__ = "asset_stock"
+    __table_args__ = (
+        # Dashboard count of assets held by more than one teacher
+        Index("ix_asset_stock_teacher_count", "active_teacher_count"),
+    )
+    
+    asset_id = Column(String(36), ForeignKey("asset.asset_id", ondelete="CASCADE"), primary_key=True)
+    assigned_quantity = Column(Integer, default=0, nullable=False)
+    scrapped_quantity = Column(Integer, default=0, nullable=False)
+    available_quantity = Column(Integer, default=0, nullable=False)
+    active_teacher_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now())
+    
+    # Relationships
+    asset = relationship("Asset", backref=backref("stock", uselist=False, cascade="all, delete-orphan"))
+    
+    def __repr__(self):
+        return (
+            f"<AssetStock(asset_id={self.asset_id}, assigned={self.assigned_quantity}, "
+            f"scrapped={self.scrapped_quantity}, available={self.available_quantity})>"
+        )
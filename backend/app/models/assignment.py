@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Date, DateTime, ForeignKey, text
+from sqlalchemy import Column, String, Text, Integer, Date, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -7,6 +7,15 @@ import uuid
 
 class AssetAssignment(Base):
     __tablename__ = "asset_assignment"
+    __table_args__ = (
+        # Active-quantity sums: asset_id = ? AND return_date IS NULL
+        Index("ix_assignment_asset_return", "asset_id", "return_date", "assigned_quantity"),
+        # Teacher filter: teacher_id = ? AND return_date IS NULL (per asset)
+        Index("ix_assignment_teacher_return", "teacher_id", "return_date", "asset_id"),
+        # Teacher assignment listing ordered by date
+        Index("ix_assignment_teacher_date", "teacher_id", "assignment_date"),
+        Index("ix_assignment_date", "assignment_date"),
+    )
     
     assignment_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     asset_id = Column(String(36), ForeignKey("asset.asset_id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer
+from app.core.database import Base
+
+
+class DataVersion(Base):
+    """
+    Per-table write counter.
+    
+    Bumped in the writing transaction whenever rows of table_name are
+    inserted, updated or deleted (see app.core.data_version), so caches can
+    be keyed on the versions of the tables they read.
+    """
+    __tablename__ = "data_version"
+    
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<DataVersion(table_name={self.table_name}, version={self.version})>"
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime
+from app.core.database import Base
+
+
+class InventoryCounter(Base):
+    """
+    Global inventory totals (a single row, id 1).
+    
+    Adjusted by deltas in the same transaction as every asset and stock-row
+    write (see app.core.inventory_counters), so the dashboard reads one row
+    instead of summing the asset and stock tables.
+    """
+    __tablename__ = "inventory_counter"
+    
+    id = Column(Integer, primary_key=True)
+    asset_count = Column(Integer, default=0, nullable=False)
+    total_quantity = Column(Integer, default=0, nullable=False)
+    original_cost = Column(Numeric(16, 2), default=0, nullable=False)
+    current_cost = Column(Numeric(16, 2), default=0, nullable=False)
+    assigned_quantity = Column(Integer, default=0, nullable=False)
+    scrapped_quantity = Column(Integer, default=0, nullable=False)
+    multiple_teacher_assets = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime)
+    
+    def __repr__(self):
+        return (
+            f"<InventoryCounter(assets={self.asset_count}, quantity={self.total_quantity}, "
+            f"assigned={self.assigned_quantity}, scrapped={self.scrapped_quantity})>"
+        )
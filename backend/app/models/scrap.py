@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Date, Numeric, DateTime, ForeignKey, text
+from sqlalchemy import Column, String, Text, Integer, Date, Numeric, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -7,6 +7,13 @@ import uuid
 
 class Scrap(Base):
     __tablename__ = "scrap"
+    __table_args__ = (
+        # Per-asset sums and running totals in ledger order (scrap_date, created_at, scrap_id)
+        Index("ix_scrap_asset_ledger", "asset_id", "scrap_date", "created_at", "scrap_id"),
+        # Scrap listing, newest first in ledger order
+        Index("ix_scrap_ledger", "scrap_date", "created_at", "scrap_id"),
+        Index("ix_scrap_phase_date", "phase_id", "scrap_date"),
+    )
     
     scrap_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     asset_id = Column(String(36), ForeignKey("asset.asset_id", ondelete="CASCADE"), nullable=False)
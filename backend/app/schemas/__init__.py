@@ -3,22 +3,26 @@ from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.schemas.teacher import TeacherCreate, TeacherUpdate, TeacherResponse
 from app.schemas.asset import (
-    AssetCreate, AssetUpdate, AssetResponse, AssetListResponse, AssetFilters
+    AssetCreate, AssetUpdate, AssetResponse, AssetListResponse, AssetCursorResponse, AssetFilters,
+    AssetBatchRequest, AssetBatchResponse
 )
 from app.schemas.assignment import (
     AssignmentCreate, AssignmentUpdate, AssignmentResponse, AssignmentReturn
 )
 from app.schemas.scrap import ScrapCreate, ScrapResponse, ScrapPhaseSummary
 from app.schemas.user import UserCreate, UserResponse, UserRoleResponse
+from app.schemas.report import AssignmentReportFilters, ReportJobCreate, ReportJobResponse
 
 __all__ = [
     "LabCreate", "LabUpdate", "LabResponse",
     "VendorCreate", "VendorUpdate", "VendorResponse",
     "CategoryCreate", "CategoryUpdate", "CategoryResponse",
     "TeacherCreate", "TeacherUpdate", "TeacherResponse",
-    "AssetCreate", "AssetUpdate", "AssetResponse", "AssetListResponse", "AssetFilters",
+    "AssetCreate", "AssetUpdate", "AssetResponse", "AssetListResponse", "AssetCursorResponse", "AssetFilters",
+    "AssetBatchRequest", "AssetBatchResponse",
     "AssignmentCreate", "AssignmentUpdate", "AssignmentResponse", "AssignmentReturn",
     "ScrapCreate", "ScrapResponse", "ScrapPhaseSummary",
     "UserCreate", "UserResponse", "UserRoleResponse",
+    "AssignmentReportFilters", "ReportJobCreate", "ReportJobResponse",
 ]
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
@@ -75,8 +75,24 @@ class AssetFilters(BaseModel):
 
 class AssetListResponse(BaseModel):
     items: List[AssetResponse]
-    total: int
+    total: Optional[int] = None  # None when count=none
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    total_is_estimate: bool = False
 
+
+class AssetBatchRequest(BaseModel):
+    asset_ids: List[str] = Field(..., min_length=1, max_length=5000)
+
+
+class AssetBatchResponse(BaseModel):
+    items: List[AssetResponse]  # In request order, duplicates collapsed
+    missing: List[str]  # Requested IDs with no matching asset
+
+
+class AssetCursorResponse(BaseModel):
+    items: List[AssetResponse]
+    size: int
+    next_cursor: Optional[str] = None  # Pass as `after` to fetch the next page
+    total: Optional[int] = None  # Only computed when with_total=true
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Literal
+from datetime import date, datetime
+
+from app.schemas.asset import AssetFilters
+
+
+class AssignmentReportFilters(BaseModel):
+    asset_id: Optional[str] = None
+    teacher_id: Optional[str] = None
+    lab_id: Optional[str] = None
+    category_id: Optional[str] = None
+    active_only: Optional[bool] = None
+    assignment_date_from: Optional[date] = None
+    assignment_date_to: Optional[date] = None
+
+
+class ReportJobCreate(BaseModel):
+    report: Literal["assets", "assignments"]
+    format: Literal["pdf", "csv", "xlsx", "parquet", "arrow"] = "pdf"
+    # Used for report=assets
+    asset_filters: AssetFilters = Field(default_factory=AssetFilters)
+    # Used for report=assignments
+    assignment_filters: AssignmentReportFilters = Field(default_factory=AssignmentReportFilters)
+
+
+class ReportJobResponse(BaseModel):
+    job_id: str
+    report: str
+    format: str
+    status: str  # queued, running, done, failed
+    rows_processed: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    filename: Optional[str] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
@@ -2,11 +2,13 @@ from app.services.asset_service import AssetService
 from app.services.assignment_service import AssignmentService
 from app.services.scrap_service import ScrapService
 from app.services.report_service import ReportService
+from app.services.stock_service import StockService
 
 __all__ = [
     "AssetService",
     "AssignmentService",
     "ScrapService",
     "ReportService",
+    "StockService",
 ]
 
@@ -1,14 +1,43 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_, or_, distinct
+from sqlalchemy import select, func, and_, or_, distinct, literal, text, type_coerce, String, Text, DateTime, Date, Numeric, Integer, Boolean
 from typing import Optional, List
-from datetime import date
+from datetime import date, datetime
+from decimal import Decimal
+import base64
+import binascii
+import json
 import math
 
-from app.models import Asset, AssetAssignment, Scrap, Lab, Vendor, Category, Teacher
-from app.schemas.asset import AssetCreate, AssetUpdate, AssetFilters, AssetResponse, AssetListResponse
+from app.models import Asset, AssetAssignment, Scrap, Lab, Vendor, Category, Teacher, AssetStock
+from app.schemas.asset import AssetCreate, AssetUpdate, AssetFilters, AssetResponse, AssetListResponse, AssetCursorResponse, AssetBatchResponse
+from app.core.data_version import version_key
+from app.services.count_cache import asset_count_cache, filters_signature
+from app.services.search_backend import get_active_search_backend
+from app.services.stock_service import StockService
 from app.utils.financial_year import calculate_financial_year
 
 
+# Tables whose writes can change a filtered asset listing
+ASSET_LISTING_TABLES = ("asset", "asset_stock", "asset_assignment", "vendor")
+
+# Fields of AssetResponse computed from the stock quantities rather than stored on asset
+DERIVED_FIELDS = (
+    "active_assigned_quantity",
+    "total_scrapped_quantity",
+    "available_quantity",
+    "is_issued",
+    "is_fully_issued",
+    "is_partially_issued",
+    "is_scrapped",
+)
+
+# Every AssetResponse field, in response order
+ASSET_FIELDS = tuple(AssetResponse.model_fields)
+
+# IN-list size per query when hydrating assets by ID
+BATCH_CHUNK_SIZE = 1000
+
+
 class AssetService:
     
     def create_asset(self, db: Session, asset_data: AssetCreate) -> Asset:
@@ -22,6 +51,8 @@ class AssetService:
         )
         
         db.add(db_asset)
+        db.flush()
+        StockService().init_stock(db, db_asset)
         db.commit()
         db.refresh(db_asset)
         return db_asset
@@ -45,6 +76,10 @@ class AssetService:
         for key, value in update_data.items():
             setattr(db_asset, key, value)
         
+        # Keep available quantity in step with total_quantity edits
+        if "total_quantity" in update_data:
+            StockService().apply(db, db_asset)
+        
         db.commit()
         db.refresh(db_asset)
         return db_asset
@@ -71,45 +106,63 @@ class AssetService:
         db.commit()
         return True
     
-    def _get_active_assigned_quantity(self, db: Session, asset_id: str) -> int:
-        """Get total active assigned quantity for an asset"""
-        result = db.query(func.coalesce(func.sum(AssetAssignment.assigned_quantity), 0)).filter(
-            and_(
-                AssetAssignment.asset_id == asset_id,
-                AssetAssignment.return_date.is_(None)
-            )
-        ).scalar()
-        return int(result) if result else 0
-    
-    def _get_total_scrapped_quantity(self, db: Session, asset_id: str) -> int:
-        """Get total scrapped quantity for an asset"""
-        result = db.query(func.coalesce(func.sum(Scrap.scrapped_quantity), 0)).filter(
-            Scrap.asset_id == asset_id
-        ).scalar()
-        return int(result) if result else 0
+    def parse_fields(self, fields: Optional[str]) -> Optional[List[str]]:
+        """
+        Parse a comma-separated `fields` parameter into AssetResponse field names.
+        asset_id is always included; unknown names raise ValueError.
+        """
+        if fields is None:
+            return None
+        
+        names = ["asset_id"]
+        for name in fields.split(","):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+        
+        unknown = [name for name in names if name not in AssetResponse.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        return names
     
-    def _get_available_quantity(self, db: Session, asset: Asset) -> int:
-        """Calculate available quantity"""
-        active_assigned = self._get_active_assigned_quantity(db, asset.asset_id)
-        total_scrapped = self._get_total_scrapped_quantity(db, asset.asset_id)
-        return asset.total_quantity - active_assigned - total_scrapped
+    def _projection_columns(self, fields: List[str], active_assigned, total_scrapped) -> list:
+        """Labelled SQL columns needed to produce the requested fields"""
+        columns = [Asset.__table__.columns[name].label(name) for name in fields if name not in DERIVED_FIELDS]
+        if any(name in DERIVED_FIELDS for name in fields):
+            if "total_quantity" not in fields:
+                columns.append(Asset.total_quantity.label("total_quantity"))
+            columns.append(active_assigned.label("active_assigned"))
+            columns.append(total_scrapped.label("total_scrapped"))
+        return columns
     
-    def get_filtered_assets(
-        self,
-        db: Session,
-        filters: AssetFilters,
-        page: int = 1,
-        size: int = 50,
-        sort_by: str = "purchase_date",
-        sort_order: str = "desc"
-    ) -> AssetListResponse:
-        """Get filtered assets with pagination"""
-        
-        # Base query
-        query = db.query(Asset).distinct()
+    def _build_filtered_query(self, db: Session, filters: AssetFilters, fields: Optional[List[str]] = None):
+        """
+        Build a query yielding (Asset, active_assigned, total_scrapped) rows with
+        every AssetFilters predicate evaluated in SQL. Returns (query, relevance)
+        where relevance orders full-text matches when a search term is given.
+        
+        With `fields`, rows hold only the labelled columns those fields need
+        instead of the full Asset entity.
+        
+        Assigned/scrapped quantities come from the asset_stock read model joined
+        once per asset, so the query never fans out and needs no DISTINCT.
+        """
+        active_assigned = func.coalesce(AssetStock.assigned_quantity, 0)
+        teacher_count = func.coalesce(AssetStock.active_teacher_count, 0)
+        total_scrapped = func.coalesce(AssetStock.scrapped_quantity, 0)
+        
+        if fields:
+            columns = self._projection_columns(fields, active_assigned, total_scrapped)
+        else:
+            columns = [
+                Asset,
+                active_assigned.label("active_assigned"),
+                total_scrapped.label("total_scrapped")
+            ]
         
-        # Track if we need vendor join for search
-        needs_vendor_join = False
+        query = db.query(*columns).select_from(Asset).outerjoin(
+            AssetStock, AssetStock.asset_id == Asset.asset_id
+        )
         
         # Apply filters
         conditions = []
@@ -141,132 +194,55 @@ class AssetService:
         if filters.cost_max is not None:
             conditions.append(Asset.original_total_cost <= filters.cost_max)
         
-        # Status filters require subqueries
-        if filters.issued_status or filters.scrap_status or filters.teacher_id or filters.has_multiple_teachers:
-            # We'll filter after fetching and calculating
-            pass
+        if filters.issued_status == "issued_only":
+            conditions.append(active_assigned > 0)
+        elif filters.issued_status == "not_issued":
+            conditions.append(active_assigned == 0)
+        elif filters.issued_status == "partially_issued":
+            conditions.append(and_(active_assigned > 0, active_assigned < Asset.total_quantity))
+        
+        if filters.scrap_status == "scrapped_only":
+            conditions.append(total_scrapped > 0)
+        elif filters.scrap_status == "exclude_scrapped":
+            # Exclude only if ALL are scrapped (fully scrapped)
+            conditions.append(total_scrapped != Asset.total_quantity)
+        
+        if filters.teacher_id:
+            # Asset has an active assignment to this teacher
+            conditions.append(
+                select(AssetAssignment.assignment_id).where(
+                    and_(
+                        AssetAssignment.asset_id == Asset.asset_id,
+                        AssetAssignment.teacher_id == filters.teacher_id,
+                        AssetAssignment.return_date.is_(None)
+                    )
+                ).exists()
+            )
         
-        if filters.search:
-            search_term = f"%{filters.search}%"
-            # Search in asset description, remarks, and vendor name (via join)
-            search_conditions = [
-                Asset.description.ilike(search_term),
-                Asset.remarks.ilike(search_term)
-            ]
-            
-            # Add vendor name search - need to join Vendor table
-            needs_vendor_join = True
-            search_conditions.append(Vendor.vendor_name.ilike(search_term))
-            
-            conditions.append(or_(*search_conditions))
+        if filters.has_multiple_teachers:
+            conditions.append(teacher_count > 1)
         
-        # Apply vendor join if needed for search
-        if needs_vendor_join:
-            query = query.outerjoin(Vendor, Vendor.vendor_id == Asset.vendor_id)
+        if filters.scrap_cost_min is not None:
+            conditions.append(Asset.original_total_cost - Asset.current_total_cost >= filters.scrap_cost_min)
+        
+        if filters.scrap_cost_max is not None:
+            conditions.append(Asset.original_total_cost - Asset.current_total_cost <= filters.scrap_cost_max)
         
         if conditions:
             query = query.filter(and_(*conditions))
         
-        # Get total count
-        total = query.count()
-        
-        # Apply sorting
-        sort_column = getattr(Asset, sort_by, Asset.purchase_date)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        # Pagination
-        offset = (page - 1) * size
-        assets = query.offset(offset).limit(size).all()
-        
-        # Calculate derived fields and apply status filters
-        asset_responses = []
-        for asset in assets:
-            active_assigned = self._get_active_assigned_quantity(db, asset.asset_id)
-            total_scrapped = self._get_total_scrapped_quantity(db, asset.asset_id)
-            available = asset.total_quantity - active_assigned - total_scrapped
-            
-            # Apply status filters
-            if filters.issued_status:
-                if filters.issued_status == "issued_only" and active_assigned == 0:
-                    continue
-                elif filters.issued_status == "not_issued" and active_assigned > 0:
-                    continue
-                elif filters.issued_status == "partially_issued":
-                    if not (0 < active_assigned < asset.total_quantity):
-                        continue
-            
-            if filters.scrap_status:
-                if filters.scrap_status == "scrapped_only" and total_scrapped == 0:
-                    continue
-                elif filters.scrap_status == "exclude_scrapped" and total_scrapped == asset.total_quantity:
-                    # Exclude only if ALL are scrapped (fully scrapped)
-                    continue
-            
-            if filters.teacher_id:
-                # Check if asset has active assignment to this teacher
-                has_assignment = db.query(AssetAssignment).filter(
-                    and_(
-                        AssetAssignment.asset_id == asset.asset_id,
-                        AssetAssignment.teacher_id == filters.teacher_id,
-                        AssetAssignment.return_date.is_(None)
-                    )
-                ).first() is not None
-                if not has_assignment:
-                    continue
-            
-            if filters.has_multiple_teachers:
-                # Count distinct teachers with active assignments
-                teacher_count = db.query(func.count(distinct(AssetAssignment.teacher_id))).filter(
-                    and_(
-                        AssetAssignment.asset_id == asset.asset_id,
-                        AssetAssignment.return_date.is_(None)
-                    )
-                ).scalar()
-                if teacher_count <= 1:
-                    continue
-            
-            # Apply scrap cost filters
-            if filters.scrap_cost_min is not None or filters.scrap_cost_max is not None:
-                scrap_cost = float(asset.original_total_cost - asset.current_total_cost)
-                if filters.scrap_cost_min is not None and scrap_cost < filters.scrap_cost_min:
-                    continue
-                if filters.scrap_cost_max is not None and scrap_cost > filters.scrap_cost_max:
-                    continue
-            
-            asset_dict = {
-                **asset.__dict__,
-                "active_assigned_quantity": active_assigned,
-                "total_scrapped_quantity": total_scrapped,
-                "available_quantity": available,
-                "is_issued": active_assigned > 0,
-                "is_fully_issued": active_assigned == asset.total_quantity,
-                "is_partially_issued": 0 < active_assigned < asset.total_quantity,
-                "is_scrapped": total_scrapped > 0
-            }
-            asset_responses.append(AssetResponse(**asset_dict))
-        
-        # Recalculate total after filtering
-        total = len(asset_responses) if filters.issued_status or filters.scrap_status or filters.teacher_id or filters.has_multiple_teachers else total
+        relevance = None
+        if filters.search:
+            # Search in asset description, remarks, and vendor name
+            backend = get_active_search_backend(db.connection())
+            query, relevance = backend.apply(query, filters.search)
         
-        return AssetListResponse(
-            items=asset_responses,
-            total=total,
-            page=page,
-            size=size,
-            pages=math.ceil(total / size) if total > 0 else 0
-        )
+        return query, relevance
     
-    def get_asset_with_details(self, db: Session, asset_id: str) -> Optional[AssetResponse]:
-        """Get asset with all computed fields"""
-        asset = self.get_asset(db, asset_id)
-        if not asset:
-            return None
-        
-        active_assigned = self._get_active_assigned_quantity(db, asset_id)
-        total_scrapped = self._get_total_scrapped_quantity(db, asset_id)
+    def _build_response(self, asset: Asset, active_assigned: int, total_scrapped: int) -> AssetResponse:
+        """Build an AssetResponse with the derived quantity fields"""
+        active_assigned = int(active_assigned or 0)
+        total_scrapped = int(total_scrapped or 0)
         available = asset.total_quantity - active_assigned - total_scrapped
         
         asset_dict = {
@@ -279,6 +255,280 @@ class AssetService:
             "is_partially_issued": 0 < active_assigned < asset.total_quantity,
             "is_scrapped": total_scrapped > 0
         }
-        
         return AssetResponse(**asset_dict)
-
+    
+    def _project_row(self, row, fields: List[str]) -> dict:
+        """Build a dict of the requested fields from a projection row (for FastJSONResponse)"""
+        values = row._mapping
+        item = {}
+        derived = {}
+        
+        if any(name in DERIVED_FIELDS for name in fields):
+            active_assigned = int(values["active_assigned"] or 0)
+            total_scrapped = int(values["total_scrapped"] or 0)
+            total_quantity = values["total_quantity"]
+            derived = {
+                "active_assigned_quantity": active_assigned,
+                "total_scrapped_quantity": total_scrapped,
+                "available_quantity": total_quantity - active_assigned - total_scrapped,
+                "is_issued": active_assigned > 0,
+                "is_fully_issued": active_assigned == total_quantity,
+                "is_partially_issued": 0 < active_assigned < total_quantity,
+                "is_scrapped": total_scrapped > 0
+            }
+        
+        for name in fields:
+            item[name] = derived[name] if name in DERIVED_FIELDS else values[name]
+        
+        return item
+    
+    def _build_item(self, row, fields: Optional[List[str]]):
+        """AssetResponse for an entity row, or a field dict for a projection row"""
+        if fields:
+            return self._project_row(row, fields)
+        asset, active_assigned, total_scrapped = row[0], row[1], row[2]
+        return self._build_response(asset, active_assigned, total_scrapped)
+    
+    def _estimate_asset_rows(self, db: Session) -> Optional[int]:
+        """Table-statistics row estimate for the unfiltered register, if the backend keeps one"""
+        if db.bind.dialect.name in ("mysql", "mariadb"):
+            return db.execute(text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'asset'"
+            )).scalar()
+        return None
+    
+    def _count_assets(self, db: Session, filters: AssetFilters, query, count: str = "exact"):
+        """
+        Count the filtered query, returning (total, is_estimate).
+        
+        exact:    cached per filter signature and data version, else counted
+        estimate: like exact, but may answer from an older cached count or
+                  table statistics instead of running the count
+        none:     skip counting
+        """
+        if count == "none":
+            return None, False
+        
+        # Read versions before counting so a concurrent write can only make the entry unreachable
+        signature = filters_signature(filters)
+        versions = version_key(db, ASSET_LISTING_TABLES)
+        
+        cached = asset_count_cache.get(signature, versions)
+        if cached is not None:
+            return cached, False
+        
+        if count == "estimate":
+            latest = asset_count_cache.get_latest(signature)
+            if latest is not None:
+                return latest, True
+            if signature == "{}":
+                estimate = self._estimate_asset_rows(db)
+                if estimate is not None:
+                    return int(estimate), True
+        
+        total = query.order_by(None).count()
+        asset_count_cache.put(signature, versions, total)
+        return total, False
+    
+    def get_filtered_assets(
+        self,
+        db: Session,
+        filters: AssetFilters,
+        page: int = 1,
+        size: int = 50,
+        sort_by: str = "purchase_date",
+        sort_order: str = "desc",
+        count: str = "exact",
+        fields: Optional[List[str]] = None
+    ):
+        """
+        Get filtered assets with pagination (one count query + one page query).
+        
+        Returns an AssetListResponse, or with `fields` the same envelope as a
+        plain dict whose items hold only those fields.
+        """
+        query, relevance = self._build_filtered_query(db, filters, fields)
+        
+        # Get total count
+        total, total_is_estimate = self._count_assets(db, filters, query, count)
+        
+        # Apply sorting, with asset_id as a tiebreaker so pages are stable
+        sort_column = Asset.__table__.columns.get(sort_by, Asset.purchase_date)
+        if sort_by == "relevance" and relevance is not None:
+            query = query.order_by(relevance, Asset.asset_id.asc())
+        elif sort_order == "desc":
+            query = query.order_by(sort_column.desc(), Asset.asset_id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Asset.asset_id.asc())
+        
+        # Pagination
+        offset = (page - 1) * size
+        rows = query.offset(offset).limit(size).all()
+        
+        result = {
+            "items": [self._build_item(row, fields) for row in rows],
+            "total": total,
+            "page": page,
+            "size": size,
+            "pages": (math.ceil(total / size) if total > 0 else 0) if total is not None else None,
+            "total_is_estimate": total_is_estimate
+        }
+        return result if fields else AssetListResponse(**result)
+    
+    def _keyset_expression(self, sort_by: str):
+        """
+        Expression used to order and compare rows in cursor mode.
+        
+        Nullable text columns are coalesced so NULLs take part in the ordering,
+        and DateTime columns are compared as their stored text so values written
+        by server defaults round-trip exactly on every backend.
+        """
+        column = Asset.__table__.columns.get(sort_by)
+        if column is None:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+        
+        if isinstance(column.type, DateTime):
+            return type_coerce(column, String)
+        if column.nullable and isinstance(column.type, (String, Text)):
+            return func.coalesce(column, "")
+        return column
+    
+    def _encode_cursor(self, sort_by: str, sort_order: str, value, asset_id: str) -> str:
+        """Build an opaque cursor token from the last row of a page"""
+        if isinstance(value, datetime):
+            value = value.isoformat(sep=" ")
+        elif isinstance(value, date):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        payload = json.dumps([sort_by, sort_order, value, asset_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+    
+    def _decode_cursor(self, token: str, sort_by: str, sort_order: str):
+        """Decode a cursor token into (sort value, asset_id) for the given sort"""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            cursor_sort_by, cursor_sort_order, value, asset_id = json.loads(
+                base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            )
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor")
+        
+        if cursor_sort_by != sort_by or cursor_sort_order != sort_order:
+            raise ValueError("Cursor does not match the requested sort order")
+        
+        column_type = Asset.__table__.columns[sort_by].type
+        if value is not None and not isinstance(column_type, (DateTime, String, Text)):
+            if isinstance(column_type, Date):
+                value = date.fromisoformat(value)
+            elif isinstance(column_type, Numeric):
+                value = Decimal(value)
+            elif isinstance(column_type, Boolean):
+                value = bool(value)
+            elif isinstance(column_type, Integer):
+                value = int(value)
+        
+        return value, asset_id
+    
+    def get_assets_by_cursor(
+        self,
+        db: Session,
+        filters: AssetFilters,
+        after: Optional[str] = None,
+        size: int = 50,
+        sort_by: str = "purchase_date",
+        sort_order: str = "desc",
+        with_total: bool = False,
+        fields: Optional[List[str]] = None
+    ):
+        """
+        Get filtered assets with keyset pagination.
+        
+        Each page seeks past the (sort value, asset_id) pair of the previous page's
+        last row, so page 2000 costs the same as page 1. The total count is only
+        computed when requested. With `fields` the envelope is a plain dict.
+        """
+        query, _ = self._build_filtered_query(db, filters, fields)
+        
+        total, _ = self._count_assets(db, filters, query, "exact" if with_total else "none")
+        
+        sort_key = self._keyset_expression(sort_by)
+        query = query.add_columns(sort_key.label("sort_key"))
+        
+        if after:
+            value, last_id = self._decode_cursor(after, sort_by, sort_order)
+            value = literal(value, sort_key.type)
+            if sort_order == "desc":
+                query = query.filter(or_(
+                    sort_key < value,
+                    and_(sort_key == value, Asset.asset_id < last_id)
+                ))
+            else:
+                query = query.filter(or_(
+                    sort_key > value,
+                    and_(sort_key == value, Asset.asset_id > last_id)
+                ))
+        
+        if sort_order == "desc":
+            query = query.order_by(sort_key.desc(), Asset.asset_id.desc())
+        else:
+            query = query.order_by(sort_key.asc(), Asset.asset_id.asc())
+        
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(size + 1).all()
+        has_more = len(rows) > size
+        rows = rows[:size]
+        
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            last_id = last.asset_id if fields else last[0].asset_id
+            next_cursor = self._encode_cursor(sort_by, sort_order, last.sort_key, last_id)
+        
+        result = {
+            "items": [self._build_item(row, fields) for row in rows],
+            "size": size,
+            "next_cursor": next_cursor,
+            "total": total
+        }
+        return result if fields else AssetCursorResponse(**result)
+    
+    def get_asset_with_details(self, db: Session, asset_id: str) -> Optional[AssetResponse]:
+        """Get asset with all computed fields (reads the asset_stock row)"""
+        asset = self.get_asset(db, asset_id)
+        if not asset:
+            return None
+        
+        stock = StockService().get_stock(db, asset)
+        return self._build_response(asset, stock.assigned_quantity, stock.scrapped_quantity)
+    
+    def get_assets_batch(self, db: Session, asset_ids: List[str]) -> AssetBatchResponse:
+        """
+        Get many assets with computed fields by ID.
+        
+        One query per BATCH_CHUNK_SIZE IDs, each joining the asset_stock row so
+        the quantities come back with the asset. Unknown IDs are listed in
+        `missing` instead of raising.
+        """
+        requested = list(dict.fromkeys(asset_ids))
+        found = {}
+        
+        for start in range(0, len(requested), BATCH_CHUNK_SIZE):
+            chunk = requested[start:start + BATCH_CHUNK_SIZE]
+            query, _ = self._build_filtered_query(db, AssetFilters())
+            for row in query.filter(Asset.asset_id.in_(chunk)).all():
+                found[row[0].asset_id] = self._build_item(row, None)
+        
+        return AssetBatchResponse(
+            items=[found[asset_id] for asset_id in requested if asset_id in found],
+            missing=[asset_id for asset_id in requested if asset_id not in found]
+        )
+    
+    def get_asset_fields(self, db: Session, asset_id: str, fields: List[str]) -> Optional[dict]:
+        """Get only the requested fields of one asset in a single query"""
+        query, _ = self._build_filtered_query(db, AssetFilters(), fields)
+        row = query.filter(Asset.asset_id == asset_id).first()
+        if row is None:
+            return None
+        return self._project_row(row, fields)
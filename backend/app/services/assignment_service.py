@@ -6,6 +6,7 @@ from decimal import Decimal
 
 from app.models import Asset, AssetAssignment, Teacher, Scrap
 from app.schemas.assignment import AssignmentCreate, AssignmentUpdate, AssignmentReturn, AssignmentResponse
+from app.services.stock_service import StockService
 
 
 class AssignmentService:
@@ -26,18 +27,11 @@ class AssignmentService:
         if not asset:
             raise ValueError(f"Asset {asset_id} not found")
         
-        # Calculate current usage
-        active_assigned = db.query(func.coalesce(func.sum(AssetAssignment.assigned_quantity), 0)).filter(
-            and_(
-                AssetAssignment.asset_id == asset_id,
-                AssetAssignment.return_date.is_(None)
-            )
-        ).scalar() or 0
-        
-        total_scrapped = db.query(func.coalesce(func.sum(Scrap.scrapped_quantity), 0)).filter(
-            Scrap.asset_id == asset_id
-        ).scalar() or 0
-        
+        # Current usage from the stock summary row
+        stock_service = StockService()
+        stock = stock_service.get_stock(db, asset)
+        active_assigned = stock.assigned_quantity
+        total_scrapped = stock.scrapped_quantity
         available = asset.total_quantity - active_assigned - total_scrapped
         
         # Validate
@@ -55,6 +49,8 @@ class AssignmentService:
         )
         
         db.add(assignment)
+        stock_service.apply(db, asset, assigned_delta=assignment.assigned_quantity)
+        
         db.commit()
         db.refresh(assignment)
         return assignment
@@ -80,6 +76,72 @@ class AssignmentService:
         
         return query.order_by(AssetAssignment.assignment_date.desc()).all()
     
+    def get_assignment_rows(
+        self,
+        db: Session,
+        asset_id: Optional[str] = None,
+        teacher_id: Optional[str] = None,
+        active_only: bool = False
+    ) -> List[dict]:
+        """
+        Assignment list rows with teacher name, asset description and assigned
+        cost from one joined query, as AssignmentResponse-shaped dicts.
+        """
+        query = db.query(
+            AssetAssignment.teacher_id,
+            AssetAssignment.assigned_quantity,
+            AssetAssignment.assignment_date,
+            AssetAssignment.current_location,
+            AssetAssignment.remarks,
+            AssetAssignment.assignment_id,
+            AssetAssignment.asset_id,
+            AssetAssignment.return_date,
+            AssetAssignment.created_at,
+            Asset.original_total_cost,
+            Asset.total_quantity,
+            Asset.description,
+            Teacher.name
+        ).outerjoin(Asset, Asset.asset_id == AssetAssignment.asset_id
+        ).outerjoin(Teacher, Teacher.teacher_id == AssetAssignment.teacher_id)
+        
+        if asset_id:
+            query = query.filter(AssetAssignment.asset_id == asset_id)
+        
+        if teacher_id:
+            query = query.filter(AssetAssignment.teacher_id == teacher_id)
+        
+        if active_only:
+            query = query.filter(AssetAssignment.return_date.is_(None))
+        
+        result = []
+        for (
+            row_teacher_id, assigned_quantity, assignment_date, current_location, remarks,
+            assignment_id, row_asset_id, return_date, created_at,
+            original_total_cost, total_quantity, description, teacher_name
+        ) in query.order_by(AssetAssignment.assignment_date.desc()).all():
+            # Calculate assigned cost if asset exists
+            assigned_cost = None
+            if total_quantity:
+                per_unit_cost = float(original_total_cost) / total_quantity
+                assigned_cost = Decimal(str(per_unit_cost * assigned_quantity))
+            
+            result.append({
+                "teacher_id": row_teacher_id,
+                "assigned_quantity": assigned_quantity,
+                "assignment_date": assignment_date,
+                "current_location": current_location,
+                "remarks": remarks,
+                "assignment_id": assignment_id,
+                "asset_id": row_asset_id,
+                "return_date": return_date,
+                "created_at": created_at,
+                "assigned_cost": assigned_cost,
+                "teacher_name": teacher_name,
+                "asset_description": description
+            })
+        
+        return result
+    
     def return_assignment(
         self,
         db: Session,
@@ -94,10 +156,18 @@ class AssignmentService:
         if not assignment:
             return None
         
+        # Only an active assignment releases quantity back to stock
+        was_active = assignment.return_date is None
+        
         assignment.return_date = return_data.return_date
         if return_data.remarks:
             assignment.remarks = (assignment.remarks or "") + f"\nReturn: {return_data.remarks}"
         
+        if was_active:
+            asset = db.query(Asset).filter(Asset.asset_id == assignment.asset_id).with_for_update().first()
+            if asset:
+                StockService().apply(db, asset, assigned_delta=-assignment.assigned_quantity)
+        
         db.commit()
         db.refresh(assignment)
         return assignment
@@ -0,0 +1,65 @@
+"""
+In-process cache of filtered asset counts.
+
+Entries are keyed by a normalized AssetFilters signature plus the data
+versions of the tables the count reads, so any write makes old entries
+unreachable without explicit invalidation. The most recent value per
+signature is also kept (regardless of version) to answer estimate requests.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.schemas.asset import AssetFilters
+from app.services.search_backend import tokenize
+
+
+def filters_signature(filters: AssetFilters) -> str:
+    """Stable string for a filter set: unset fields dropped, search normalized"""
+    data = filters.model_dump(exclude_none=True, mode="json")
+    if "search" in data:
+        data["search"] = " ".join(tokenize(data["search"])) or data["search"].strip().lower()
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+class CountCache:
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._exact: "OrderedDict[Tuple[str, tuple], int]" = OrderedDict()
+        self._latest: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, signature: str, versions: tuple) -> Optional[int]:
+        """Exact count for this signature at these data versions"""
+        with self._lock:
+            key = (signature, versions)
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                return self._exact[key]
+        return None
+
+    def get_latest(self, signature: str) -> Optional[int]:
+        """Most recent count for this signature at any data version"""
+        with self._lock:
+            return self._latest.get(signature)
+
+    def put(self, signature: str, versions: tuple, count: int) -> None:
+        with self._lock:
+            self._exact[(signature, versions)] = count
+            self._exact.move_to_end((signature, versions))
+            self._latest[signature] = count
+            self._latest.move_to_end(signature)
+            while len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+            while len(self._latest) > self.max_entries:
+                self._latest.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._exact.clear()
+            self._latest.clear()
+
+
+asset_count_cache = CountCache()
@@ -0,0 +1,93 @@
+"""
+Dashboard statistics.
+
+The totals are read from the inventory_counter row, which writes keep up to
+date (see app.core.inventory_counters), so the cost does not grow with the
+register. The result is also cached in-process keyed by the data versions of
+the tables behind it, so any asset, assignment, scrap or restore write
+invalidates it; DASHBOARD_CACHE_TTL_SECONDS bounds its age for writes made
+outside the application. Concurrent misses wait for one computation.
+How fresh the totals are is reported apart from them (the route sends it as
+headers), so the body stays fixed for a given ETag.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.data_version import get_data_versions
+from app.core.inventory_counters import read_counters
+
+# Assignment and scrap writes reach the dashboard through asset_stock; they are
+# listed so the cache does not depend on that. inventory_counter is bumped when
+# the verifier repairs drift.
+DASHBOARD_TABLES = ("asset", "asset_stock", "asset_assignment", "scrap", "inventory_counter")
+
+# Response headers carrying the freshness of the cached totals
+COMPUTED_AT_HEADER = "X-Computed-At"
+AGE_SECONDS_HEADER = "X-Age-Seconds"
+
+
+class DashboardService:
+
+    def __init__(self):
+        self._entry: Optional[Tuple[tuple, float, datetime, dict]] = None
+        self._lock = threading.Lock()
+
+    def _fresh(self, versions: tuple) -> Optional[Tuple[float, datetime, dict]]:
+        entry = self._entry
+        if entry is None:
+            return None
+        entry_versions, computed, computed_at, stats = entry
+        if entry_versions != versions or time.monotonic() - computed > settings.DASHBOARD_CACHE_TTL_SECONDS:
+            return None
+        return computed, computed_at, stats
+
+    def compute(self, db: Session) -> dict:
+        """Dashboard totals from the inventory counters"""
+        counters = read_counters(db)
+        total_quantity = int(counters["total_quantity"])
+        total_assigned = int(counters["assigned_quantity"])
+        total_scrapped = int(counters["scrapped_quantity"])
+        return {
+            "total_assets": int(counters["asset_count"]),
+            "total_quantity_purchased": total_quantity,
+            "total_original_cost": float(counters["original_cost"]),
+            "total_current_cost": float(counters["current_cost"]),
+            "total_assigned_quantity": total_assigned,
+            "total_scrapped_quantity": total_scrapped,
+            "total_available_quantity": total_quantity - total_assigned - total_scrapped,
+            "assets_with_multiple_teachers": int(counters["multiple_teacher_assets"]),
+        }
+
+    def get_stats(self, db: Session, versions: Optional[Dict[str, int]] = None) -> Tuple[dict, datetime, float]:
+        """
+        Cached dashboard totals, when they were computed and their age in
+        seconds. versions are the DASHBOARD_TABLES data versions if the caller
+        has already read them.
+        """
+        if versions is None:
+            versions = get_data_versions(db, DASHBOARD_TABLES)
+        versions = tuple(versions[name] for name in sorted(versions))
+
+        fresh = self._fresh(versions)
+        if fresh is None:
+            with self._lock:
+                fresh = self._fresh(versions)
+                if fresh is None:
+                    stats = self.compute(db)
+                    fresh = (time.monotonic(), datetime.now(), stats)
+                    self._entry = (versions,) + fresh
+
+        computed, computed_at, stats = fresh
+        return stats, computed_at, round(time.monotonic() - computed, 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry = None
+
+
+dashboard_service = DashboardService()
@@ -0,0 +1,163 @@
+"""
+Pivot and summary reports over assets.
+
+Grouped sums are computed by the database over just the requested
+dimensions, read into a DataFrame from the cursor, and shaped with pandas:
+derived measures are vectorized column arithmetic and the cross-tab with its
+totals is a pivot_table. The frame therefore has one row per group, not per
+asset. When the filters only narrow rollup dimensions the sums come from the
+asset_rollup groups; otherwise from one GROUP BY on the filtered asset query.
+"""
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+
+from app.models import Asset, AssetStock, Category, Lab, Vendor
+from app.schemas.asset import AssetFilters
+from app.services.asset_service import AssetService
+from app.services.report_service import ASSET_REPORT_TABLES, XLSX_CONTENT_TYPE
+from app.services.rollup_service import ROLLUP_FILTERS, ROLLUP_TABLES, RollupService
+
+
+# Either source may answer, so both sets of tables validate the ETag
+PIVOT_TABLES = tuple(dict.fromkeys(ASSET_REPORT_TABLES + ROLLUP_TABLES))
+
+PIVOT_DIMENSIONS = ("financial_year", "category", "lab", "vendor")
+
+PIVOT_MEASURES = (
+    "asset_count", "total_quantity", "assigned_quantity", "scrapped_quantity",
+    "available_quantity", "original_cost", "current_cost", "scrap_cost"
+)
+COST_MEASURES = ("original_cost", "current_cost", "scrap_cost")
+
+# Label for assets without a category, lab or vendor
+MISSING_LABEL = "N/A"
+TOTAL_LABEL = "Total"
+
+
+class PivotService:
+
+    def load_frame(self, db: Session, filters: AssetFilters, dimensions: List[str]) -> pd.DataFrame:
+        """Per-group sums of every measure for the given dimensions"""
+        rollup_filters = filters.model_dump(exclude_none=True)
+        if set(rollup_filters) <= set(ROLLUP_FILTERS):
+            statement = RollupService().grouped_query(dimensions, rollup_filters)
+        else:
+            statement = self._asset_query(db, filters, dimensions)
+
+        result = db.execute(statement)
+        frame = pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()), coerce_float=True)
+        frame = frame[dimensions + ["asset_count", "total_quantity", "assigned_quantity",
+                                    "scrapped_quantity", "original_cost", "current_cost"]]
+
+        frame[dimensions] = frame[dimensions].fillna(MISSING_LABEL).astype(str)
+        quantities = ["asset_count", "total_quantity", "assigned_quantity", "scrapped_quantity"]
+        frame[quantities] = frame[quantities].fillna(0).astype("int64")
+        frame[["original_cost", "current_cost"]] = frame[["original_cost", "current_cost"]].fillna(0).astype("float64")
+        frame["available_quantity"] = frame["total_quantity"] - frame["assigned_quantity"] - frame["scrapped_quantity"]
+        frame["scrap_cost"] = frame["original_cost"] - frame["current_cost"]
+        return frame
+
+    def _asset_query(self, db: Session, filters: AssetFilters, dimensions: List[str]):
+        """GROUP BY over the filtered asset query, for filters the rollups can't answer"""
+        query, _ = AssetService()._build_filtered_query(db, filters, ["total_quantity"])
+
+        category = aliased(Category)
+        lab = aliased(Lab)
+        vendor = aliased(Vendor)
+        dimension_columns = {
+            "financial_year": Asset.financial_year,
+            "category": category.name,
+            "lab": lab.lab_name,
+            "vendor": vendor.vendor_name,
+        }
+        group_columns = [dimension_columns[name] for name in dimensions]
+
+        query = query.with_entities(
+            *(column.label(name) for name, column in zip(dimensions, group_columns)),
+            func.count(Asset.asset_id).label("asset_count"),
+            func.sum(Asset.total_quantity).label("total_quantity"),
+            func.sum(func.coalesce(AssetStock.assigned_quantity, 0)).label("assigned_quantity"),
+            func.sum(func.coalesce(AssetStock.scrapped_quantity, 0)).label("scrapped_quantity"),
+            func.sum(Asset.original_total_cost).label("original_cost"),
+            func.sum(Asset.current_total_cost).label("current_cost")
+        )
+        if "category" in dimensions:
+            query = query.outerjoin(category, category.category_id == Asset.category_id)
+        if "lab" in dimensions:
+            query = query.outerjoin(lab, lab.lab_id == Asset.lab_id)
+        if "vendor" in dimensions:
+            query = query.outerjoin(vendor, vendor.vendor_id == Asset.vendor_id)
+        return query.group_by(*group_columns).statement
+
+    def pivot(
+        self,
+        db: Session,
+        filters: AssetFilters,
+        rows: List[str],
+        column: Optional[str] = None,
+        values: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Totals grouped by the row dimensions. With a column dimension the
+        result is a cross-tab (measure, column value) with Total margins;
+        otherwise one row per group plus a Total row.
+        """
+        values = list(values or PIVOT_MEASURES)
+        frame = self.load_frame(db, filters, rows + ([column] if column else []))
+
+        if column:
+            if frame.empty:
+                return pd.DataFrame(columns=pd.MultiIndex.from_product([values, [TOTAL_LABEL]]))
+            return frame.pivot_table(
+                index=rows, columns=column, values=values, aggfunc="sum",
+                fill_value=0, margins=True, margins_name=TOTAL_LABEL
+            )[values]
+
+        table = frame.groupby(rows, sort=True)[values].sum()
+        total = frame[values].sum().to_frame().T
+        if len(rows) > 1:
+            total.index = pd.MultiIndex.from_tuples([(TOTAL_LABEL,) + ("",) * (len(rows) - 1)], names=rows)
+        else:
+            total.index = pd.Index([TOTAL_LABEL], name=rows[0])
+        return pd.concat([table, total])
+
+    def to_json(self, table: pd.DataFrame, rows: List[str], column: Optional[str]) -> dict:
+        """Records keyed by row dimension; with a column dimension each measure maps column value -> total"""
+        table = table.copy()
+        cost_columns = [c for c in table.columns if (c[0] if column else c) in COST_MEASURES]
+        table[cost_columns] = table[cost_columns].astype("float64").round(2)
+        other_columns = [c for c in table.columns if c not in cost_columns]
+        table[other_columns] = table[other_columns].astype("int64")
+
+        data = []
+        for index, values in zip(table.index, table.to_dict("records")):
+            keys = index if isinstance(index, tuple) else (index,)
+            record = dict(zip(rows, keys))
+            if column:
+                for (measure, column_value), value in values.items():
+                    record.setdefault(measure, {})[str(column_value)] = value
+            else:
+                record.update(values)
+            data.append(record)
+
+        totals = data.pop() if data else {}
+        for name in rows:
+            totals.pop(name, None)
+        return {"rows": rows, "column": column, "data": data, "totals": totals}
+
+    def to_file(self, table: pd.DataFrame, format: str) -> Tuple[bytes, str]:
+        """CSV or XLSX bytes and content type; cross-tab columns are flattened to 'measure | value'"""
+        if isinstance(table.columns, pd.MultiIndex):
+            table = table.copy()
+            table.columns = [f"{measure} | {value}" for measure, value in table.columns]
+
+        if format == "csv":
+            return table.to_csv().encode("utf-8"), "text/csv"
+
+        buffer = BytesIO()
+        table.to_excel(buffer, sheet_name="Pivot", engine="openpyxl")
+        return buffer.getvalue(), XLSX_CONTENT_TYPE
@@ -0,0 +1,147 @@
+"""
+Disk cache of rendered report files.
+
+Keys combine the report kind, format, a normalized filter signature and the
+data versions of the tables the report reads, so any write makes old
+entries unreachable without explicit invalidation. Entries are plain files
+in REPORT_CACHE_DIR; a hit refreshes the file's mtime and eviction removes
+the least recently used files once the directory exceeds
+REPORT_CACHE_MAX_BYTES. Hit/miss counters are per process.
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from typing import BinaryIO, Optional
+
+from app.core.config import settings
+
+
+class ReportCacheWriter:
+    """Collects a report streamed in chunks and adds it to the cache once complete"""
+
+    def __init__(self, cache: "ReportCache", key: str):
+        self.cache = cache
+        self.key = key
+        self._tmp_path = os.path.join(cache.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+        self._file = open(self._tmp_path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+
+    def commit(self) -> None:
+        self._file.close()
+        os.replace(self._tmp_path, self.cache._path(self.key))
+        self.cache._evict()
+
+    def discard(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class ReportCache:
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, report: str, format: str, signature: str, versions: tuple) -> str:
+        """Cache key for a report at the given filter signature and data versions"""
+        payload = json.dumps([report, format, signature, list(versions)], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open the cached file for reading, refreshing the entry's LRU position"""
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return f
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached file contents"""
+        f = self.open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def put(self, key: str, data: bytes) -> None:
+        writer = self.open_writer(key)
+        writer.write(data)
+        writer.commit()
+
+    def open_writer(self, key: str) -> ReportCacheWriter:
+        return ReportCacheWriter(self, key)
+
+    def _entries(self):
+        """(mtime, size, path) of every cached file"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used files until the cache fits in max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+report_cache = ReportCache(settings.REPORT_CACHE_DIR, settings.REPORT_CACHE_MAX_BYTES)
@@ -0,0 +1,130 @@
+"""
+Columnar (Parquet / Arrow IPC) report and backup files.
+
+Rows are gathered into per-column lists and written as typed Arrow record
+batches, so dates, Decimal costs and integer quantities keep their types
+and pandas / pyarrow readers load them without parsing text. Missing
+values stay null instead of the "N/A" placeholders used by the printable
+formats.
+"""
+from decimal import Decimal
+from io import BytesIO
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, Table, select
+from sqlalchemy.orm import Session
+
+
+# Rows per record batch (and Parquet row group)
+COLUMNAR_BATCH_ROWS = 50000
+
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.file"
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+MONEY = pa.decimal128(14, 2)
+CENT = Decimal("0.01")
+
+ASSET_COLUMNAR_SCHEMA = pa.schema([
+    ("description", pa.string()),
+    ("category", pa.string()),
+    ("total_quantity", pa.int64()),
+    ("assigned_quantity", pa.int64()),
+    ("scrapped_quantity", pa.int64()),
+    ("available_quantity", pa.int64()),
+    ("purchase_date", pa.date32()),
+    ("financial_year", pa.string()),
+    ("vendor", pa.string()),
+    ("original_cost", MONEY),
+    ("current_cost", MONEY),
+    ("scrap_cost", MONEY),
+    ("lab", pa.string()),
+    ("physical_location", pa.string()),
+    ("assigned_to", pa.string()),
+    ("remarks", pa.string()),
+])
+
+ASSIGNMENT_COLUMNAR_SCHEMA = pa.schema([
+    ("assignment_id", pa.string()),
+    ("asset_description", pa.string()),
+    ("category", pa.string()),
+    ("teacher_name", pa.string()),
+    ("assigned_quantity", pa.int64()),
+    ("assignment_date", pa.date32()),
+    ("return_date", pa.date32()),
+    ("status", pa.string()),
+    ("lab", pa.string()),
+    ("vendor", pa.string()),
+    ("financial_year", pa.string()),
+    ("purchase_date", pa.date32()),
+    ("original_cost", MONEY),
+    ("assigned_cost", MONEY),
+    ("current_location", pa.string()),
+    ("remarks", pa.string()),
+])
+
+
+def to_money(value) -> Optional[Decimal]:
+    """Decimal rounded to cents; SQLite hands back floats for computed costs"""
+    if value is None:
+        return None
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.quantize(CENT)
+
+
+def _record_batches(schema: pa.Schema, records: Iterable[tuple]) -> Iterator[pa.RecordBatch]:
+    """Record batches built column by column from tuples in schema order"""
+    records = iter(records)
+    while True:
+        batch = list(islice(records, COLUMNAR_BATCH_ROWS))
+        if not batch:
+            return
+        columns = zip(*batch)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        )
+
+
+def write_columnar(format: str, schema: pa.Schema, records: Iterable[tuple]) -> bytes:
+    """Encode records (tuples in schema order) as a Parquet or Arrow IPC file"""
+    buffer = BytesIO()
+    if format == "parquet":
+        with pq.ParquetWriter(buffer, schema, compression="zstd") as writer:
+            for batch in _record_batches(schema, records):
+                writer.write_batch(batch)
+    elif format == "arrow":
+        with pa.ipc.new_file(buffer, schema) as writer:
+            for batch in _record_batches(schema, records):
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"Unsupported format: {format}")
+    return buffer.getvalue()
+
+
+def arrow_type(column) -> pa.DataType:
+    """Arrow type for a SQLAlchemy column"""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def export_table(db: Session, table: Table, format: str = "parquet") -> bytes:
+    """Every row of a table as a typed Parquet or Arrow IPC file"""
+    schema = pa.schema([(column.name, arrow_type(column)) for column in table.columns])
+    rows = db.execute(select(table)).yield_per(COLUMNAR_BATCH_ROWS)
+    return write_columnar(format, schema, (tuple(row) for row in rows))
@@ -0,0 +1,208 @@
+"""
+Background report jobs.
+
+Jobs are rendered in a process pool, since reportlab and openpyxl work is
+CPU-bound and would otherwise hold a web worker (and the GIL) for the whole
+export. Job state lives on disk in REPORT_JOB_DIR as <job_id>.json: the web
+process writes it when the job is queued and the worker updates it as it
+runs, so status and download requests can be answered by any web worker.
+Finished files are kept for REPORT_JOB_TTL_SECONDS and swept lazily.
+"""
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.schemas.asset import AssetFilters
+from app.schemas.report import AssignmentReportFilters, ReportJobCreate
+
+
+def _job_dir() -> str:
+    path = os.path.abspath(settings.REPORT_JOB_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _meta_path(job_dir: str, job_id: str) -> str:
+    return os.path.join(job_dir, f"{job_id}.json")
+
+
+def _output_path(job_dir: str, job_id: str) -> str:
+    return os.path.join(job_dir, f"{job_id}.out")
+
+
+def _read_meta(job_dir: str, job_id: str) -> Optional[dict]:
+    try:
+        with open(_meta_path(job_dir, job_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_meta(job_dir: str, job_id: str, meta: dict) -> None:
+    """Replace the job file atomically so readers never see a partial write"""
+    tmp_path = f"{_meta_path(job_dir, job_id)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, _meta_path(job_dir, job_id))
+
+
+def _update_meta(job_dir: str, job_id: str, **changes) -> None:
+    meta = _read_meta(job_dir, job_id)
+    if meta is not None:
+        meta.update(changes)
+        _write_meta(job_dir, job_id, meta)
+
+
+def _finished(**changes) -> dict:
+    now = datetime.now()
+    return {
+        "finished_at": now.isoformat(),
+        "expires_at": (now + timedelta(seconds=settings.REPORT_JOB_TTL_SECONDS)).isoformat(),
+        **changes
+    }
+
+
+def run_report_job(job_dir: str, job_id: str, report: str, format: str, filters: dict) -> None:
+    """Render one report into the job directory (runs in a pool process)"""
+    from app.core.database import SessionLocal
+    from app.services.report_service import ReportService
+
+    _update_meta(job_dir, job_id, status="running", started_at=datetime.now().isoformat())
+
+    def progress(count: int) -> None:
+        _update_meta(job_dir, job_id, rows_processed=count)
+
+    db = SessionLocal()
+    try:
+        service = ReportService()
+        if report == "assets":
+            file_bytes, filename, content_type = service.generate_asset_report(
+                db, AssetFilters(**filters), format, progress=progress
+            )
+        else:
+            file_bytes, filename, content_type = service.generate_assignment_report(
+                db, **AssignmentReportFilters(**filters).model_dump(), format=format, progress=progress
+            )
+
+        part_path = f"{_output_path(job_dir, job_id)}.part"
+        with open(part_path, "wb") as f:
+            f.write(file_bytes)
+        os.replace(part_path, _output_path(job_dir, job_id))
+
+        _update_meta(job_dir, job_id, **_finished(
+            status="done", filename=filename, content_type=content_type
+        ))
+    except Exception as e:
+        _update_meta(job_dir, job_id, **_finished(status="failed", error=str(e)))
+    finally:
+        db.close()
+
+
+class ReportJobManager:
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: workers start clean instead of inheriting the web process's DB connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.REPORT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(self, request: ReportJobCreate) -> dict:
+        """Record a queued job and hand it to the pool"""
+        self.sweep()
+
+        job_dir = _job_dir()
+        job_id = str(uuid.uuid4())
+        filters = request.asset_filters if request.report == "assets" else request.assignment_filters
+        meta = {
+            "job_id": job_id,
+            "report": request.report,
+            "format": request.format,
+            "status": "queued",
+            "rows_processed": 0,
+            "created_at": datetime.now().isoformat(),
+        }
+        _write_meta(job_dir, job_id, meta)
+
+        args = (
+            job_dir, job_id, request.report, request.format,
+            filters.model_dump(mode="json", exclude_none=True)
+        )
+        try:
+            future = self._get_executor().submit(run_report_job, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool
+            self.shutdown()
+            future = self._get_executor().submit(run_report_job, *args)
+        future.add_done_callback(lambda f: self._on_done(job_dir, job_id, f))
+        return meta
+
+    def _on_done(self, job_dir: str, job_id: str, future: Future) -> None:
+        """Mark the job failed if its worker process died before recording a result"""
+        if future.cancelled():
+            _update_meta(job_dir, job_id, **_finished(status="failed", error="Job was cancelled"))
+        elif future.exception() is not None:
+            _update_meta(job_dir, job_id, **_finished(status="failed", error=str(future.exception())))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Job state, or None for unknown, malformed or expired ids"""
+        try:
+            job_id = str(uuid.UUID(job_id))
+        except ValueError:
+            return None
+
+        meta = _read_meta(_job_dir(), job_id)
+        if meta is None or self._is_expired(meta):
+            return None
+        return meta
+
+    def output_path(self, job_id: str) -> Optional[str]:
+        """Path of the rendered file for a finished job"""
+        meta = self.get(job_id)
+        if meta is None or meta["status"] != "done":
+            return None
+        path = _output_path(_job_dir(), meta["job_id"])
+        return path if os.path.exists(path) else None
+
+    def _is_expired(self, meta: dict) -> bool:
+        expires_at = meta.get("expires_at")
+        return expires_at is not None and datetime.fromisoformat(expires_at) < datetime.now()
+
+    def sweep(self) -> None:
+        """Delete job files whose TTL has passed"""
+        job_dir = _job_dir()
+        for name in os.listdir(job_dir):
+            if not name.endswith(".json"):
+                continue
+            job_id = name[:-len(".json")]
+            meta = _read_meta(job_dir, job_id)
+            if meta is None or not self._is_expired(meta):
+                continue
+            for path in (_output_path(job_dir, job_id), _meta_path(job_dir, job_id)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+report_job_manager = ReportJobManager()
@@ -0,0 +1,201 @@
+"""
+PDF rendering for report registers.
+
+reportlab measures every row of a Table before it can split it across
+pages, so one table holding a whole register gets slower per row as it
+grows. Registers are instead written as a run of page-sized tables that
+share precomputed column widths, one cached TableStyle and a repeated
+header row. Registers longer than PDF_SECTION_ROWS are split into sections
+rendered in a process pool (REPORT_PDF_WORKERS) and concatenated with pypdf;
+the last section is rendered in the calling process while the pool works.
+With REPORT_PDF_WORKERS=0 (single-CPU hosts) sections are rendered in turn
+in the calling process, which still bounds how many rows reportlab holds.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Callable, Iterable, List, Optional, Union
+
+from pypdf import PdfWriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from app.core.config import settings
+
+
+# Data rows per table flowable; about one A4 page at the register font size
+PDF_TABLE_CHUNK_ROWS = 50
+
+# Data rows per section document for long registers
+PDF_SECTION_ROWS = 5000
+
+BRAND_COLOR = colors.HexColor('#1a56db')
+
+_SAMPLE_STYLES = getSampleStyleSheet()
+COLLEGE_STYLE = ParagraphStyle('ReportCollege', parent=_SAMPLE_STYLES['Title'], fontSize=16, alignment=1)
+DEPARTMENT_STYLE = _SAMPLE_STYLES['Heading2']
+TITLE_STYLE = ParagraphStyle('ReportTitle', parent=_SAMPLE_STYLES['Heading1'], fontSize=14, textColor=BRAND_COLOR)
+FILTER_STYLE = ParagraphStyle('ReportFilter', parent=_SAMPLE_STYLES['Normal'], fontSize=9, textColor=colors.grey)
+FOOTER_STYLE = ParagraphStyle('ReportFooter', parent=_SAMPLE_STYLES['Normal'], fontSize=8, textColor=colors.grey)
+
+DATA_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), BRAND_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 7),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('FONTSIZE', (0, 1), (-1, -1), 6),
+])
+
+SUMMARY_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), BRAND_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+]
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: workers start clean instead of inheriting the web process's DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.REPORT_PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def shutdown_pdf_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _table_chunks(headers: List[str], col_widths: List[float], rows: List[List[str]]) -> List[Table]:
+    """Page-sized tables sharing one style; repeatRows carries the header if a chunk still splits"""
+    return [
+        Table([headers] + rows[start:start + PDF_TABLE_CHUNK_ROWS], colWidths=col_widths,
+              style=DATA_TABLE_STYLE, repeatRows=1)
+        for start in range(0, len(rows), PDF_TABLE_CHUNK_ROWS)
+    ]
+
+
+def render_section(
+    headers: List[str],
+    col_widths: List[float],
+    rows: List[List[str]],
+    heading: Optional[dict] = None,
+    closing: Optional[dict] = None
+) -> bytes:
+    """
+    Render one section of a register as a standalone PDF.
+    heading (title, filter_text) starts the report; closing (summary_rows,
+    highlight_from, generated_on) ends it with the summary table and footer.
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=0.5*inch,
+        rightMargin=0.5*inch,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch
+    )
+
+    elements = []
+    if heading:
+        elements.append(Paragraph("Sardar Patel Institute of Technology", COLLEGE_STYLE))
+        elements.append(Paragraph("Computer Engineering Department", DEPARTMENT_STYLE))
+        elements.append(Spacer(1, 0.2*inch))
+        elements.append(Paragraph(heading['title'], TITLE_STYLE))
+        elements.append(Spacer(1, 0.1*inch))
+        if heading['filter_text']:
+            elements.append(Paragraph(f"<b>Applied Filters:</b> {heading['filter_text']}", FILTER_STYLE))
+            elements.append(Spacer(1, 0.15*inch))
+
+    elements.extend(_table_chunks(headers, col_widths, rows))
+
+    if closing:
+        elements.append(Spacer(1, 0.3*inch))
+        summary_rows = closing['summary_rows']
+        highlight_from = closing['highlight_from']
+        elements.append(Table(summary_rows, colWidths=[3*inch, 2*inch], style=TableStyle(SUMMARY_TABLE_STYLE + [
+            ('BACKGROUND', (0, highlight_from), (-1, -1), colors.HexColor('#fef3c7')),
+            ('FONTNAME', (0, highlight_from), (-1, -1), 'Helvetica-Bold'),
+        ])))
+        elements.append(Spacer(1, 0.3*inch))
+        elements.append(Paragraph(f"Generated on: {closing['generated_on']}", FOOTER_STYLE))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def _submit(*args) -> Future:
+    try:
+        return _get_executor().submit(render_section, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool
+        shutdown_pdf_pool()
+        return _get_executor().submit(render_section, *args)
+
+
+def render_register(
+    title: str,
+    filter_text: str,
+    headers: List[str],
+    col_widths: List[float],
+    rows: Iterable[List[str]],
+    closing: Callable[[], dict]
+) -> bytes:
+    """
+    Render a full register. rows are formatted cell lists; closing is called
+    once rows are exhausted, so it can report totals tallied while reading.
+    """
+    heading = {'title': title, 'filter_text': filter_text}
+    workers = settings.REPORT_PDF_WORKERS
+    parts: List[Union[Future, bytes]] = []
+    section: List[List[str]] = []
+
+    for cells in rows:
+        if len(section) == PDF_SECTION_ROWS:
+            args = (headers, col_widths, section, heading if not parts else None, None)
+            if workers > 0:
+                # Keep at most one queued section per worker so buffered rows stay bounded
+                pending = [p for p in parts if not p.done()]
+                if len(pending) >= workers:
+                    wait(pending, return_when=FIRST_COMPLETED)
+                parts.append(_submit(*args))
+            else:
+                parts.append(render_section(*args))
+            section = []
+        section.append(cells)
+
+    last = render_section(headers, col_widths, section, heading if not parts else None, closing())
+    if not parts:
+        return last
+
+    writer = PdfWriter()
+    for part in parts + [last]:
+        writer.append(BytesIO(part.result() if isinstance(part, Future) else part))
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
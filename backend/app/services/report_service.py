@@ -1,23 +1,146 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_, or_
-from typing import Optional, List, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, func, and_, or_, case, text
+from typing import Optional, List, Tuple, Iterable, Iterator, Callable
 from datetime import datetime, date
-from io import BytesIO
+from io import BytesIO, StringIO
 from decimal import Decimal
 
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.units import inch
+from itertools import chain, islice
 import csv
+import json
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 
+from app.core.data_version import version_key
 from app.models import Asset, AssetAssignment, Scrap, Lab, Vendor, Category, Teacher
 from app.schemas.asset import AssetFilters
+from app.schemas.report import AssignmentReportFilters
 from app.services.asset_service import AssetService
+from app.services.count_cache import filters_signature
+from app.services.report_cache import report_cache
+from app.services.report_columnar import (
+    ARROW_CONTENT_TYPE, ASSET_COLUMNAR_SCHEMA, ASSIGNMENT_COLUMNAR_SCHEMA, COLUMNAR_FORMATS,
+    PARQUET_CONTENT_TYPE, to_money, write_columnar
+)
+from app.services.report_pdf import render_register
+
+
+# Rows fetched per server-side cursor batch and encoded per streamed chunk
+REPORT_CHUNK_SIZE = 500
+
+# Joins aggregated teacher names; a control character no name contains, so the list splits back exactly
+TEACHER_NAME_SEPARATOR = "\x1f"
+
+# MySQL truncates GROUP_CONCAT results at group_concat_max_len bytes (default 1024);
+# report connections raise it so long teacher lists come back whole
+REPORT_GROUP_CONCAT_MAX_LEN = 1024 * 1024
+
+# Asset columns the report reads; a derived field pulls in the stock quantities
+ASSET_REPORT_FIELDS = [
+    "asset_id", "description", "total_quantity", "purchase_date", "financial_year",
+    "original_total_cost", "current_total_cost", "physical_location", "remarks",
+    "available_quantity"
+]
+
+ASSET_CSV_HEADERS = [
+    'Description', 'Category', 'Total Quantity', 'Assigned Quantity',
+    'Scrapped Quantity', 'Available Quantity', 'Purchase Date', 'Financial Year',
+    'Vendor', 'Original Cost', 'Current Cost', 'Scrap Cost', 'Lab',
+    'Physical Location', 'Assigned To', 'Remarks'
+]
+ASSET_REPORT_KEYS = [
+    'description', 'category', 'total_quantity', 'assigned_quantity',
+    'scrapped_quantity', 'available_quantity', 'purchase_date', 'financial_year',
+    'vendor', 'original_cost', 'current_cost', 'scrap_cost', 'lab',
+    'physical_location', 'assigned_to', 'remarks'
+]
+
+ASSET_EXCEL_HEADERS = [
+    'Description', 'Category', 'Total Qty', 'Assigned', 'Scrapped', 'Available',
+    'Purchase Date', 'Financial Year', 'Vendor', 'Original Cost', 'Current Cost',
+    'Scrap Cost', 'Lab', 'Physical Location', 'Assigned To', 'Remarks'
+]
+
+ASSIGNMENT_CSV_HEADERS = [
+    'Assignment ID', 'Asset Description', 'Category', 'Teacher Name', 'Assigned Quantity',
+    'Assignment Date', 'Return Date', 'Status', 'Lab', 'Vendor', 'Financial Year',
+    'Purchase Date', 'Original Cost', 'Assigned Cost', 'Current Location', 'Remarks'
+]
+ASSIGNMENT_REPORT_KEYS = [
+    'assignment_id', 'asset_description', 'category', 'teacher_name', 'assigned_quantity',
+    'assignment_date', 'return_date', 'status', 'lab', 'vendor', 'financial_year',
+    'purchase_date', 'original_cost', 'assigned_cost', 'current_location', 'remarks'
+]
+
+ASSIGNMENT_EXCEL_HEADERS = [
+    'Assignment ID', 'Asset Description', 'Category', 'Teacher Name', 'Assigned Qty',
+    'Assignment Date', 'Return Date', 'Status', 'Lab', 'Vendor', 'Financial Year',
+    'Purchase Date', 'Original Cost', 'Assigned Cost', 'Current Location', 'Remarks'
+]
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+REPORT_CONTENT_TYPES = {
+    'pdf': "application/pdf",
+    'csv': "text/csv",
+    'xlsx': XLSX_CONTENT_TYPE,
+    'parquet': PARQUET_CONTENT_TYPE,
+    'arrow': ARROW_CONTENT_TYPE,
+}
+
+# Tables whose writes can change each report (keys the report cache)
+ASSET_REPORT_TABLES = ("asset", "asset_stock", "asset_assignment", "teacher", "category", "vendor", "lab")
+ASSIGNMENT_REPORT_TABLES = ("asset_assignment", "asset", "teacher", "category", "vendor", "lab")
+
+# Read size when streaming a cached file
+CACHE_READ_CHUNK_BYTES = 64 * 1024
+
+ASSET_PDF_HEADERS = [
+    'Description', 'Category', 'Total', 'Assigned', 'Scrapped', 'Available',
+    'Purchase Date', 'FY', 'Vendor', 'Original Cost', 'Current Cost', 'Lab'
+]
+
+# Column widths for A4 portrait (total ~7.5 inches)
+ASSET_PDF_COL_WIDTHS = [
+    1.2*inch,  # Description
+    0.6*inch,  # Category
+    0.4*inch,  # Total
+    0.4*inch,  # Assigned
+    0.4*inch,  # Scrapped
+    0.4*inch,  # Available
+    0.6*inch,  # Purchase Date
+    0.5*inch,  # FY
+    0.7*inch,  # Vendor
+    0.7*inch,  # Original Cost
+    0.7*inch,  # Current Cost
+    0.6*inch   # Lab
+]
+
+ASSIGNMENT_PDF_HEADERS = [
+    'Asset Description', 'Category', 'Teacher', 'Qty', 'Assigned Date',
+    'Return Date', 'Status', 'Lab', 'Assigned Cost'
+]
+
+ASSIGNMENT_PDF_COL_WIDTHS = [
+    1.2*inch, 0.7*inch, 0.9*inch, 0.4*inch, 0.7*inch,
+    0.7*inch, 0.5*inch, 0.6*inch, 0.8*inch
+]
+
+# Rows sampled to size data-sheet columns in write-only mode
+XLSX_WIDTH_SAMPLE_ROWS = 200
+
+# Shared cell styles (openpyxl registers each distinct style once per workbook)
+HEADER_FILL = PatternFill(start_color='1a56db', end_color='1a56db', fill_type='solid')
+HEADER_FONT = Font(bold=True, color='FFFFFF', size=11)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+STRIPE_FILL = PatternFill(start_color='f3f4f6', end_color='f3f4f6', fill_type='solid')
+SECTION_FILL = PatternFill(start_color='fef3c7', end_color='fef3c7', fill_type='solid')
+SUMMARY_TITLE_FONT = Font(bold=True, color='FFFFFF', size=14)
+SUMMARY_HEADER_FONT = Font(bold=True, color='FFFFFF')
+SUMMARY_SECTION_FONT = Font(bold=True, size=12)
 
 
 class ReportService:
@@ -26,154 +149,126 @@ class ReportService:
         self,
         db: Session,
         filters: AssetFilters,
-        format: str = 'pdf'
+        format: str = 'pdf',
+        progress: Optional[Callable[[int], None]] = None
     ) -> Tuple[bytes, str, str]:
-        """Generate asset report in requested format"""
+        """
+        Generate asset report in requested format, served from the report
+        cache while the data it reads is unchanged.
+        progress, if given, is called with the running row count as rows are read.
+        """
+        if format not in REPORT_CONTENT_TYPES:
+            raise ValueError(f"Unsupported format: {format}")
         
-        # Fetch data
-        asset_service = AssetService()
-        asset_list = asset_service.get_filtered_assets(
-            db, filters, page=1, size=10000  # Get all for report
-        )
+        filename = self._report_filename("asset_report", format)
+        cache_key = self._asset_cache_key(db, filters, format)
+        file_bytes = report_cache.get(cache_key)
+        if file_bytes is not None:
+            return file_bytes, filename, REPORT_CONTENT_TYPES[format]
         
-        # Enhance with additional data
-        report_data = []
-        for asset_response in asset_list.items:
-            asset = asset_service.get_asset(db, asset_response.asset_id)
-            if not asset:
-                continue
-            
-            # Get category, vendor, lab names
-            category_name = None
-            if asset.category_id:
-                category = db.query(Category).filter(Category.category_id == asset.category_id).first()
-                category_name = category.name if category else None
-            
-            vendor_name = None
-            if asset.vendor_id:
-                vendor = db.query(Vendor).filter(Vendor.vendor_id == asset.vendor_id).first()
-                vendor_name = vendor.vendor_name if vendor else None
-            
-            lab_info = None
-            if asset.lab_id:
-                lab = db.query(Lab).filter(Lab.lab_id == asset.lab_id).first()
-                if lab:
-                    lab_info = f"{lab.lab_name} ({lab.room_number})" if lab.room_number else lab.lab_name
-            
-            # Get assigned teachers
-            assignments = db.query(AssetAssignment).filter(
-                and_(
-                    AssetAssignment.asset_id == asset.asset_id,
-                    AssetAssignment.return_date.is_(None)
-                )
-            ).all()
-            teachers = [a.teacher.name for a in assignments if a.teacher for a in [a]]
-            assigned_to = ", ".join(teachers) if teachers else "Not Assigned"
-            
-            report_data.append({
-                'description': asset.description,
-                'category': category_name or 'N/A',
-                'total_quantity': asset.total_quantity,
-                'assigned_quantity': asset_response.active_assigned_quantity,
-                'scrapped_quantity': asset_response.total_scrapped_quantity,
-                'available_quantity': asset_response.available_quantity,
-                'purchase_date': asset.purchase_date.strftime('%d-%b-%Y'),
-                'financial_year': asset.financial_year,
-                'vendor': vendor_name or 'N/A',
-                'original_cost': float(asset.original_total_cost),
-                'current_cost': float(asset.current_total_cost),
-                'scrap_cost': float(asset.original_total_cost - asset.current_total_cost),
-                'lab': lab_info or 'N/A',
-                'physical_location': asset.physical_location or 'N/A',
-                'assigned_to': assigned_to,
-                'remarks': asset.remarks or ''
-            })
+        if format in COLUMNAR_FORMATS:
+            records = self._with_progress(self.iter_asset_report_records(db, filters), progress)
+            file_bytes = write_columnar(format, ASSET_COLUMNAR_SCHEMA, records)
+            report_cache.put(cache_key, file_bytes)
+            return file_bytes, filename, REPORT_CONTENT_TYPES[format]
         
-        # Calculate summary
-        summary = {
-            'total_assets': len(report_data),
-            'total_quantity': sum(r['total_quantity'] for r in report_data),
-            'total_assigned': sum(r['assigned_quantity'] for r in report_data),
-            'total_scrapped': sum(r['scrapped_quantity'] for r in report_data),
-            'total_available': sum(r['available_quantity'] for r in report_data),
-            'total_original_cost': sum(r['original_cost'] for r in report_data),
-            'total_current_cost': sum(r['current_cost'] for r in report_data),
-            'total_scrap_cost': sum(r['scrap_cost'] for r in report_data)
-        }
+        rows = self._with_progress(self.iter_asset_report_rows(db, filters), progress)
         
-        # Generate in requested format
-        if format == 'pdf':
-            file_bytes = self._generate_asset_pdf(report_data, summary, filters)
-            filename = f"asset_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            content_type = "application/pdf"
-        elif format == 'csv':
-            file_bytes = self._generate_asset_csv(report_data)
-            filename = f"asset_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            content_type = "text/csv"
+        if format == 'csv':
+            file_bytes = b"".join(self._stream_csv(ASSET_CSV_HEADERS, ASSET_REPORT_KEYS, rows))
         elif format == 'xlsx':
-            file_bytes = self._generate_asset_excel(report_data, summary)
-            filename = f"asset_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            file_bytes = self._generate_asset_excel(rows)
         else:
-            raise ValueError(f"Unsupported format: {format}")
+            file_bytes = self._generate_asset_pdf(rows, filters)
         
-        return file_bytes, filename, content_type
+        report_cache.put(cache_key, file_bytes)
+        return file_bytes, filename, REPORT_CONTENT_TYPES[format]
+    
+    def _report_filename(self, prefix: str, format: str) -> str:
+        return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    
+    def _asset_cache_key(self, db: Session, filters: AssetFilters, format: str) -> str:
+        return report_cache.key(
+            "assets", format, filters_signature(filters), version_key(db, ASSET_REPORT_TABLES)
+        )
     
-    def _generate_asset_pdf(
+    def _assignment_cache_key(self, db: Session, filters: dict, format: str) -> str:
+        signature = json.dumps(
+            AssignmentReportFilters(**filters).model_dump(exclude_none=True, mode="json"),
+            sort_keys=True, separators=(",", ":")
+        )
+        return report_cache.key("assignments", format, signature, version_key(db, ASSIGNMENT_REPORT_TABLES))
+    
+    def _cached_stream(self, cache_key: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Serve a cached file in chunks, or pass chunks through while writing them to the cache"""
+        cached = report_cache.open(cache_key)
+        if cached is not None:
+            with cached:
+                while True:
+                    chunk = cached.read(CACHE_READ_CHUNK_BYTES)
+                    if not chunk:
+                        return
+                    yield chunk
+        
+        writer = report_cache.open_writer(cache_key)
+        completed = False
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+                yield chunk
+            completed = True
+        finally:
+            # Only a fully streamed report is cached; a dropped client leaves nothing behind
+            if completed:
+                writer.commit()
+            else:
+                writer.discard()
+    
+    def _with_progress(
         self,
-        data: List[dict],
-        summary: dict,
-        filters: AssetFilters
-    ) -> bytes:
+        rows: Iterable[dict],
+        progress: Optional[Callable[[int], None]]
+    ) -> Iterable[dict]:
+        """Report the running row count every REPORT_CHUNK_SIZE rows and once at the end"""
+        if progress is None:
+            return rows
+        
+        def counted():
+            count = 0
+            for row in rows:
+                yield row
+                count += 1
+                if count % REPORT_CHUNK_SIZE == 0:
+                    progress(count)
+            progress(count)
+        
+        return counted()
+    
+    def _new_asset_summary(self) -> dict:
+        return {
+            'total_assets': 0, 'total_quantity': 0, 'total_assigned': 0, 'total_scrapped': 0,
+            'total_available': 0, 'total_original_cost': 0, 'total_current_cost': 0, 'total_scrap_cost': 0
+        }
+    
+    def _tally_asset_rows(self, rows: Iterable[dict], summary: dict) -> Iterator[dict]:
+        """Pass rows through, adding each to the running asset summary"""
+        for row in rows:
+            summary['total_assets'] += 1
+            summary['total_quantity'] += row['total_quantity']
+            summary['total_assigned'] += row['assigned_quantity']
+            summary['total_scrapped'] += row['scrapped_quantity']
+            summary['total_available'] += row['available_quantity']
+            summary['total_original_cost'] += row['original_cost']
+            summary['total_current_cost'] += row['current_cost']
+            summary['total_scrap_cost'] += row['scrap_cost']
+            yield row
+    
+    def _generate_asset_pdf(self, rows: Iterable[dict], filters: AssetFilters) -> bytes:
         """Generate professional PDF report"""
-        buffer = BytesIO()
-        
-        # Use portrait A4 for better print compatibility
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,  # Changed from landscape to portrait A4
-            leftMargin=0.5*inch,
-            rightMargin=0.5*inch,
-            topMargin=0.75*inch,
-            bottomMargin=0.75*inch
-        )
-        
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Header
-        college_style = styles['Title']
-        college_style.fontSize = 16
-        college_style.alignment = 1
-        
-        elements.append(Paragraph("Sardar Patel Institute of Technology", college_style))
-        elements.append(Paragraph("Computer Engineering Department", styles['Heading2']))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        title_style = styles['Heading1']
-        title_style.fontSize = 14
-        title_style.textColor = colors.HexColor('#1a56db')
+        summary = self._new_asset_summary()
         
-        elements.append(Paragraph("Asset Master Report", title_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        # Applied filters
-        filter_text = self._format_applied_filters(filters)
-        if filter_text:
-            filter_style = styles['Normal']
-            filter_style.fontSize = 9
-            filter_style.textColor = colors.grey
-            elements.append(Paragraph(f"<b>Applied Filters:</b> {filter_text}", filter_style))
-            elements.append(Spacer(1, 0.15*inch))
-        
-        # Table - Adjusted for A4 portrait
-        table_data = [[
-            'Description', 'Category', 'Total', 'Assigned', 'Scrapped', 'Available',
-            'Purchase Date', 'FY', 'Vendor', 'Original Cost', 'Current Cost', 'Lab'
-        ]]
-        
-        for row in data:
-            table_data.append([
+        def cells(row: dict) -> List[str]:
+            return [
                 row['description'][:25],  # Shorter for portrait
                 row['category'][:10],
                 str(row['total_quantity']),
@@ -186,168 +281,183 @@ class ReportService:
                 f"₹{row['original_cost']:,.0f}",
                 f"₹{row['current_cost']:,.0f}",
                 row['lab'][:10]
-            ])
-        
-        # Adjusted column widths for A4 portrait (total ~7.5 inches)
-        table = Table(table_data, colWidths=[
-            1.2*inch,  # Description
-            0.6*inch,  # Category
-            0.4*inch,  # Total
-            0.4*inch,  # Assigned
-            0.4*inch,  # Scrapped
-            0.4*inch,  # Available
-            0.6*inch,  # Purchase Date
-            0.5*inch,  # FY
-            0.7*inch,  # Vendor
-            0.7*inch,  # Original Cost
-            0.7*inch,  # Current Cost
-            0.6*inch   # Lab
-        ])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a56db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 7),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 6),
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Summary
-        summary_data = [
-            ['Summary Statistics', ''],
-            ['Total Assets', str(summary['total_assets'])],
-            ['Total Quantity Purchased', str(summary['total_quantity'])],
-            ['Total Quantity Assigned', str(summary['total_assigned'])],
-            ['Total Quantity Scrapped', str(summary['total_scrapped'])],
-            ['Total Quantity Available', str(summary['total_available'])],
-            ['', ''],
-            ['Total Original Cost', f"₹{summary['total_original_cost']:,.2f}"],
-            ['Total Scrap Cost', f"₹{summary['total_scrap_cost']:,.2f}"],
-            ['Total Current Value', f"₹{summary['total_current_cost']:,.2f}"]
-        ]
-        
-        summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a56db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-            ('BACKGROUND', (0, 7), (-1, 9), colors.HexColor('#fef3c7')),
-            ('FONTNAME', (0, 7), (-1, 9), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Footer
-        footer_style = styles['Normal']
-        footer_style.fontSize = 8
-        footer_style.textColor = colors.grey
-        elements.append(Paragraph(
-            f"Generated on: {datetime.now().strftime('%d %B %Y at %I:%M %p')}",
-            footer_style
-        ))
-        
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer.read()
-    
-    def _generate_asset_csv(self, data: List[dict]) -> bytes:
-        """Generate CSV report"""
-        buffer = BytesIO()
-        writer = csv.writer(buffer)
+            ]
+        
+        def closing() -> dict:
+            return {
+                'summary_rows': [
+                    ['Summary Statistics', ''],
+                    ['Total Assets', str(summary['total_assets'])],
+                    ['Total Quantity Purchased', str(summary['total_quantity'])],
+                    ['Total Quantity Assigned', str(summary['total_assigned'])],
+                    ['Total Quantity Scrapped', str(summary['total_scrapped'])],
+                    ['Total Quantity Available', str(summary['total_available'])],
+                    ['', ''],
+                    ['Total Original Cost', f"₹{summary['total_original_cost']:,.2f}"],
+                    ['Total Scrap Cost', f"₹{summary['total_scrap_cost']:,.2f}"],
+                    ['Total Current Value', f"₹{summary['total_current_cost']:,.2f}"]
+                ],
+                'highlight_from': 7,
+                'generated_on': datetime.now().strftime('%d %B %Y at %I:%M %p')
+            }
         
-        writer.writerow([
-            'Description', 'Category', 'Total Quantity', 'Assigned Quantity',
-            'Scrapped Quantity', 'Available Quantity', 'Purchase Date', 'Financial Year',
-            'Vendor', 'Original Cost', 'Current Cost', 'Scrap Cost', 'Lab',
-            'Physical Location', 'Assigned To', 'Remarks'
-        ])
-        
-        for row in data:
-            writer.writerow([
-                row['description'], row['category'], row['total_quantity'],
-                row['assigned_quantity'], row['scrapped_quantity'], row['available_quantity'],
-                row['purchase_date'], row['financial_year'], row['vendor'],
-                row['original_cost'], row['current_cost'], row['scrap_cost'],
-                row['lab'], row['physical_location'], row['assigned_to'], row['remarks']
-            ])
-        
-        buffer.seek(0)
-        return buffer.read()
+        return render_register(
+            "Asset Master Report",
+            self._format_applied_filters(filters),
+            ASSET_PDF_HEADERS,
+            ASSET_PDF_COL_WIDTHS,
+            (cells(row) for row in self._tally_asset_rows(rows, summary)),
+            closing
+        )
     
-    def _generate_asset_excel(self, data: List[dict], summary: dict) -> bytes:
-        """Generate Excel report"""
-        buffer = BytesIO()
-        wb = openpyxl.Workbook()
+    def _asset_report_query(self, db: Session, filters: AssetFilters):
+        """
+        Query behind every asset report format, read through a server-side cursor.
+        
+        One query supplies every column: stock quantities, category, vendor and
+        lab names via outer joins, and active teacher names aggregated in SQL
+        (aggregate_strings: GROUP_CONCAT on MySQL/SQLite, string_agg on
+        PostgreSQL), so nothing else runs on the connection while the cursor
+        is open. The aggregate's order is unspecified, so _teacher_names sorts
+        the names.
+        """
+        if db.get_bind().dialect.name == "mysql":
+            db.execute(
+                text("SET SESSION group_concat_max_len = :length"),
+                {"length": REPORT_GROUP_CONCAT_MAX_LEN}
+            )
         
-        ws_data = wb.active
-        ws_data.title = "Asset Data"
-        
-        headers = [
-            'Description', 'Category', 'Total Qty', 'Assigned', 'Scrapped', 'Available',
-            'Purchase Date', 'Financial Year', 'Vendor', 'Original Cost', 'Current Cost',
-            'Scrap Cost', 'Lab', 'Physical Location', 'Assigned To', 'Remarks'
-        ]
+        asset_service = AssetService()
+        query, _ = asset_service._build_filtered_query(db, filters, ASSET_REPORT_FIELDS)
+        
+        category = aliased(Category)
+        vendor = aliased(Vendor)
+        lab = aliased(Lab)
+        teacher_names = select(
+            func.aggregate_strings(Teacher.name, TEACHER_NAME_SEPARATOR)
+        ).select_from(AssetAssignment).join(
+            Teacher, Teacher.teacher_id == AssetAssignment.teacher_id
+        ).where(
+            and_(
+                AssetAssignment.asset_id == Asset.asset_id,
+                AssetAssignment.return_date.is_(None)
+            )
+        ).scalar_subquery()
+        
+        query = query.add_columns(
+            category.name.label("category_name"),
+            vendor.vendor_name.label("vendor_name"),
+            lab.lab_name.label("lab_name"),
+            lab.room_number.label("room_number"),
+            teacher_names.label("teacher_names")
+        ).outerjoin(category, category.category_id == Asset.category_id
+        ).outerjoin(vendor, vendor.vendor_id == Asset.vendor_id
+        ).outerjoin(lab, lab.lab_id == Asset.lab_id
+        ).order_by(Asset.purchase_date.desc(), Asset.asset_id.desc())
+        
+        return query.yield_per(REPORT_CHUNK_SIZE)
+    
+    def _lab_label(self, lab_name: Optional[str], room_number: Optional[str]) -> Optional[str]:
+        if not lab_name:
+            return None
+        return f"{lab_name} ({room_number})" if room_number else lab_name
+    
+    def _teacher_names(self, aggregated: Optional[str]) -> Optional[str]:
+        """Aggregated active teacher names, sorted and comma separated"""
+        if not aggregated:
+            return None
+        return ", ".join(sorted(aggregated.split(TEACHER_NAME_SEPARATOR)))
+    
+    def iter_asset_report_rows(self, db: Session, filters: AssetFilters) -> Iterator[dict]:
+        """Asset report rows formatted for CSV, XLSX and PDF"""
+        for row in self._asset_report_query(db, filters):
+            active_assigned = int(row.active_assigned or 0)
+            total_scrapped = int(row.total_scrapped or 0)
+            lab_info = self._lab_label(row.lab_name, row.room_number)
+            
+            yield {
+                'description': row.description,
+                'category': row.category_name or 'N/A',
+                'total_quantity': row.total_quantity,
+                'assigned_quantity': active_assigned,
+                'scrapped_quantity': total_scrapped,
+                'available_quantity': row.total_quantity - active_assigned - total_scrapped,
+                'purchase_date': row.purchase_date.strftime('%d-%b-%Y'),
+                'financial_year': row.financial_year,
+                'vendor': row.vendor_name or 'N/A',
+                'original_cost': float(row.original_total_cost),
+                'current_cost': float(row.current_total_cost),
+                'scrap_cost': float(row.original_total_cost - row.current_total_cost),
+                'lab': lab_info or 'N/A',
+                'physical_location': row.physical_location or 'N/A',
+                'assigned_to': self._teacher_names(row.teacher_names) or 'Not Assigned',
+                'remarks': row.remarks or ''
+            }
+    
+    def iter_asset_report_records(self, db: Session, filters: AssetFilters) -> Iterator[tuple]:
+        """Typed asset report rows in ASSET_COLUMNAR_SCHEMA order; missing values stay None"""
+        for row in self._asset_report_query(db, filters):
+            active_assigned = int(row.active_assigned or 0)
+            total_scrapped = int(row.total_scrapped or 0)
+            original_cost = to_money(row.original_total_cost)
+            current_cost = to_money(row.current_total_cost)
+            yield (
+                row.description,
+                row.category_name,
+                row.total_quantity,
+                active_assigned,
+                total_scrapped,
+                row.total_quantity - active_assigned - total_scrapped,
+                row.purchase_date,
+                row.financial_year,
+                row.vendor_name,
+                original_cost,
+                current_cost,
+                original_cost - current_cost,
+                self._lab_label(row.lab_name, row.room_number),
+                row.physical_location,
+                self._teacher_names(row.teacher_names),
+                row.remarks
+            )
+    
+    def _stream_csv(self, headers: List[str], keys: List[str], rows: Iterable[dict]) -> Iterator[bytes]:
+        """Encode rows as UTF-8 CSV, yielding one chunk per REPORT_CHUNK_SIZE rows"""
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        
+        pending = 0
+        for row in rows:
+            writer.writerow([row[key] for key in keys])
+            pending += 1
+            if pending == REPORT_CHUNK_SIZE:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        
+        # Header only (empty report) or the last partial chunk
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    
+    def stream_asset_csv(self, db: Session, filters: AssetFilters) -> Tuple[Iterator[bytes], str, str]:
+        """Asset report as a CSV byte stream with no row cap"""
+        chunks = self._cached_stream(
+            self._asset_cache_key(db, filters, 'csv'),
+            self._stream_csv(ASSET_CSV_HEADERS, ASSET_REPORT_KEYS, self.iter_asset_report_rows(db, filters))
+        )
+        return chunks, self._report_filename("asset_report", 'csv'), "text/csv"
+    
+    def _generate_asset_excel(self, rows: Iterable[dict]) -> bytes:
+        """Generate Excel report, writing rows as they are read"""
+        wb = openpyxl.Workbook(write_only=True)
+        summary = self._new_asset_summary()
         
-        header_fill = PatternFill(start_color='1a56db', end_color='1a56db', fill_type='solid')
-        header_font = Font(bold=True, color='FFFFFF', size=11)
+        self._write_excel_data_sheet(
+            wb, "Asset Data", ASSET_EXCEL_HEADERS, ASSET_REPORT_KEYS, self._tally_asset_rows(rows, summary)
+        )
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws_data.cell(row=1, column=col_num, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        for row_num, row_data in enumerate(data, 2):
-            ws_data.cell(row=row_num, column=1, value=row_data['description'])
-            ws_data.cell(row=row_num, column=2, value=row_data['category'])
-            ws_data.cell(row=row_num, column=3, value=row_data['total_quantity'])
-            ws_data.cell(row=row_num, column=4, value=row_data['assigned_quantity'])
-            ws_data.cell(row=row_num, column=5, value=row_data['scrapped_quantity'])
-            ws_data.cell(row=row_num, column=6, value=row_data['available_quantity'])
-            ws_data.cell(row=row_num, column=7, value=row_data['purchase_date'])
-            ws_data.cell(row=row_num, column=8, value=row_data['financial_year'])
-            ws_data.cell(row=row_num, column=9, value=row_data['vendor'])
-            ws_data.cell(row=row_num, column=10, value=row_data['original_cost'])
-            ws_data.cell(row=row_num, column=11, value=row_data['current_cost'])
-            ws_data.cell(row=row_num, column=12, value=row_data['scrap_cost'])
-            ws_data.cell(row=row_num, column=13, value=row_data['lab'])
-            ws_data.cell(row=row_num, column=14, value=row_data['physical_location'])
-            ws_data.cell(row=row_num, column=15, value=row_data['assigned_to'])
-            ws_data.cell(row=row_num, column=16, value=row_data['remarks'])
-            
-            if row_num % 2 == 0:
-                fill = PatternFill(start_color='f3f4f6', end_color='f3f4f6', fill_type='solid')
-                for col in range(1, 17):
-                    ws_data.cell(row=row_num, column=col).fill = fill
-        
-        # Auto-adjust column widths
-        for col in ws_data.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_data.column_dimensions[column].width = adjusted_width
-        
-        # Summary sheet
-        ws_summary = wb.create_sheet(title="Summary")
-        summary_data = [
+        self._write_excel_summary_sheet(wb, [
             ['Asset Report Summary', ''],
             ['', ''],
             ['Metric', 'Value'],
@@ -361,29 +471,77 @@ class ReportService:
             ['Total Original Cost', summary['total_original_cost']],
             ['Total Scrap Cost', summary['total_scrap_cost']],
             ['Total Current Value', summary['total_current_cost']]
-        ]
+        ], section_row=10)
+        
+        buffer = BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+    
+    def _write_excel_data_sheet(
+        self,
+        wb: openpyxl.Workbook,
+        title: str,
+        headers: List[str],
+        keys: List[str],
+        rows: Iterable[dict]
+    ) -> None:
+        """
+        Append a styled data sheet to a write-only workbook.
+        
+        Column widths must be fixed before the first row is written, so they
+        are taken from the first XLSX_WIDTH_SAMPLE_ROWS rows, which are then
+        written followed by the rest of the iterator.
+        """
+        ws = wb.create_sheet(title=title)
+        
+        rows = iter(rows)
+        sample = list(islice(rows, XLSX_WIDTH_SAMPLE_ROWS))
+        
+        for col_num, header in enumerate(headers, 1):
+            max_length = max([len(header)] + [len(str(row[keys[col_num - 1]])) for row in sample])
+            ws.column_dimensions[get_column_letter(col_num)].width = min(max_length + 2, 50)
+        
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGNMENT
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        for row_num, row in enumerate(chain(sample, rows), 2):
+            if row_num % 2 == 0:
+                cells = []
+                for key in keys:
+                    cell = WriteOnlyCell(ws, value=row[key])
+                    cell.fill = STRIPE_FILL
+                    cells.append(cell)
+                ws.append(cells)
+            else:
+                ws.append([row[key] for key in keys])
+    
+    def _write_excel_summary_sheet(self, wb: openpyxl.Workbook, summary_data: List[list], section_row: int) -> None:
+        """Append the Summary sheet: title row 1, metric header row 3, highlighted section_row"""
+        ws = wb.create_sheet(title="Summary")
+        ws.column_dimensions['A'].width = 30
+        ws.column_dimensions['B'].width = 20
         
         for row_num, row_data in enumerate(summary_data, 1):
-            for col_num, value in enumerate(row_data, 1):
-                cell = ws_summary.cell(row=row_num, column=col_num, value=value)
+            cells = []
+            for value in row_data:
+                cell = WriteOnlyCell(ws, value=value)
                 if row_num == 1:
-                    cell.font = Font(bold=True, size=14)
-                    cell.fill = header_fill
-                    cell.font = Font(bold=True, color='FFFFFF', size=14)
+                    cell.fill = HEADER_FILL
+                    cell.font = SUMMARY_TITLE_FONT
                 elif row_num == 3:
-                    cell.font = Font(bold=True, size=12)
-                    cell.fill = header_fill
-                    cell.font = Font(bold=True, color='FFFFFF')
-                elif row_num == 10:
-                    cell.font = Font(bold=True, size=12)
-                    cell.fill = PatternFill(start_color='fef3c7', end_color='fef3c7', fill_type='solid')
-        
-        ws_summary.column_dimensions['A'].width = 30
-        ws_summary.column_dimensions['B'].width = 20
-        
-        wb.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
+                    cell.fill = HEADER_FILL
+                    cell.font = SUMMARY_HEADER_FONT
+                elif row_num == section_row:
+                    cell.fill = SECTION_FILL
+                    cell.font = SUMMARY_SECTION_FONT
+                cells.append(cell)
+            ws.append(cells)
     
     def _format_applied_filters(self, filters: AssetFilters) -> str:
         """Format applied filters into readable text"""
@@ -428,134 +586,71 @@ class ReportService:
         active_only: Optional[bool] = None,
         assignment_date_from: Optional[date] = None,
         assignment_date_to: Optional[date] = None,
-        format: str = 'pdf'
+        format: str = 'pdf',
+        progress: Optional[Callable[[int], None]] = None
     ) -> Tuple[bytes, str, str]:
-        """Generate assignment report in requested format"""
-        
-        from app.services.assignment_service import AssignmentService
-        assignment_service = AssignmentService()
+        """
+        Generate assignment report in requested format, served from the report
+        cache while the data it reads is unchanged.
+        progress, if given, is called with the running row count as rows are read.
+        """
+        if format not in REPORT_CONTENT_TYPES:
+            raise ValueError(f"Unsupported format: {format}")
         
-        # Get assignments with filters
-        assignments = assignment_service.get_assignments(
-            db, asset_id=asset_id, teacher_id=teacher_id, active_only=active_only if active_only is not None else False
+        row_filters = dict(
+            asset_id=asset_id, teacher_id=teacher_id, lab_id=lab_id,
+            category_id=category_id, active_only=active_only,
+            assignment_date_from=assignment_date_from, assignment_date_to=assignment_date_to
         )
-        
-        # Apply additional filters
-        report_data = []
-        for assignment in assignments:
-            asset = db.query(Asset).filter(Asset.asset_id == assignment.asset_id).first()
-            if not asset:
-                continue
-            
-            # Filter by lab_id if provided
-            if lab_id and asset.lab_id != lab_id:
-                continue
-            
-            # Filter by category_id if provided
-            if category_id and asset.category_id != category_id:
-                continue
-            
-            # Filter by date range
-            if assignment_date_from and assignment.assignment_date < assignment_date_from:
-                continue
-            if assignment_date_to and assignment.assignment_date > assignment_date_to:
-                continue
-            
-            # Get related data
-            teacher_name = assignment.teacher.name if assignment.teacher else 'N/A'
-            category_name = asset.category.name if asset.category else 'N/A'
-            lab_name = asset.lab.lab_name if asset.lab else 'N/A'
-            vendor_name = asset.vendor.vendor_name if asset.vendor else 'N/A'
-            
-            # Calculate assigned cost
-            per_unit_cost = float(asset.original_total_cost) / asset.total_quantity if asset.total_quantity > 0 else 0
-            assigned_cost = per_unit_cost * assignment.assigned_quantity
-            
-            report_data.append({
-                'assignment_id': assignment.assignment_id,
-                'asset_description': asset.description,
-                'category': category_name,
-                'teacher_name': teacher_name,
-                'assigned_quantity': assignment.assigned_quantity,
-                'assignment_date': assignment.assignment_date.strftime('%d-%b-%Y'),
-                'return_date': assignment.return_date.strftime('%d-%b-%Y') if assignment.return_date else 'Active',
-                'status': 'Active' if assignment.return_date is None else 'Returned',
-                'lab': lab_name,
-                'vendor': vendor_name,
-                'financial_year': asset.financial_year,
-                'purchase_date': asset.purchase_date.strftime('%d-%b-%Y'),
-                'original_cost': float(asset.original_total_cost),
-                'assigned_cost': assigned_cost,
-                'current_location': assignment.current_location or 'N/A',
-                'remarks': assignment.remarks or ''
-            })
-        
-        # Calculate summary
-        summary = {
-            'total_assignments': len(report_data),
-            'active_assignments': len([r for r in report_data if r['status'] == 'Active']),
-            'returned_assignments': len([r for r in report_data if r['status'] == 'Returned']),
-            'total_assigned_quantity': sum(r['assigned_quantity'] for r in report_data),
-            'total_assigned_cost': sum(r['assigned_cost'] for r in report_data),
-            'active_assigned_cost': sum(r['assigned_cost'] for r in report_data if r['status'] == 'Active')
-        }
-        
-        # Generate in requested format
-        if format == 'pdf':
-            file_bytes = self._generate_assignment_pdf(report_data, summary, {
+        filename = self._report_filename("assignment_report", format)
+        cache_key = self._assignment_cache_key(db, row_filters, format)
+        file_bytes = report_cache.get(cache_key)
+        if file_bytes is not None:
+            return file_bytes, filename, REPORT_CONTENT_TYPES[format]
+        
+        if format in COLUMNAR_FORMATS:
+            records = self._with_progress(self.iter_assignment_report_records(db, **row_filters), progress)
+            file_bytes = write_columnar(format, ASSIGNMENT_COLUMNAR_SCHEMA, records)
+            report_cache.put(cache_key, file_bytes)
+            return file_bytes, filename, REPORT_CONTENT_TYPES[format]
+        
+        rows = self._with_progress(self.iter_assignment_report_rows(db, **row_filters), progress)
+        
+        if format == 'csv':
+            file_bytes = b"".join(self._stream_csv(ASSIGNMENT_CSV_HEADERS, ASSIGNMENT_REPORT_KEYS, rows))
+        elif format == 'xlsx':
+            file_bytes = self._generate_assignment_excel(rows)
+        else:
+            file_bytes = self._generate_assignment_pdf(rows, {
                 'asset_id': asset_id, 'teacher_id': teacher_id, 'lab_id': lab_id,
                 'category_id': category_id, 'active_only': active_only
             })
-            filename = f"assignment_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            content_type = "application/pdf"
-        elif format == 'csv':
-            file_bytes = self._generate_assignment_csv(report_data)
-            filename = f"assignment_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            content_type = "text/csv"
-        elif format == 'xlsx':
-            file_bytes = self._generate_assignment_excel(report_data, summary)
-            filename = f"assignment_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        else:
-            raise ValueError(f"Unsupported format: {format}")
         
-        return file_bytes, filename, content_type
+        report_cache.put(cache_key, file_bytes)
+        return file_bytes, filename, REPORT_CONTENT_TYPES[format]
     
-    def _generate_assignment_pdf(
-        self,
-        data: List[dict],
-        summary: dict,
-        filters: dict
-    ) -> bytes:
+    def _new_assignment_summary(self) -> dict:
+        return {
+            'total_assignments': 0, 'active_assignments': 0, 'returned_assignments': 0,
+            'total_assigned_quantity': 0, 'total_assigned_cost': 0, 'active_assigned_cost': 0
+        }
+    
+    def _tally_assignment_rows(self, rows: Iterable[dict], summary: dict) -> Iterator[dict]:
+        """Pass rows through, adding each to the running assignment summary"""
+        for row in rows:
+            summary['total_assignments'] += 1
+            summary['total_assigned_quantity'] += row['assigned_quantity']
+            summary['total_assigned_cost'] += row['assigned_cost']
+            if row['status'] == 'Active':
+                summary['active_assignments'] += 1
+                summary['active_assigned_cost'] += row['assigned_cost']
+            else:
+                summary['returned_assignments'] += 1
+            yield row
+    
+    def _generate_assignment_pdf(self, rows: Iterable[dict], filters: dict) -> bytes:
         """Generate professional PDF report for assignments"""
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            leftMargin=0.5*inch,
-            rightMargin=0.5*inch,
-            topMargin=0.75*inch,
-            bottomMargin=0.75*inch
-        )
-        
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Header
-        college_style = styles['Title']
-        college_style.fontSize = 16
-        college_style.alignment = 1
-        
-        elements.append(Paragraph("Sardar Patel Institute of Technology", college_style))
-        elements.append(Paragraph("Computer Engineering Department", styles['Heading2']))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        title_style = styles['Heading1']
-        title_style.fontSize = 14
-        title_style.textColor = colors.HexColor('#1a56db')
-        
-        elements.append(Paragraph("Assignment Report", title_style))
-        elements.append(Spacer(1, 0.1*inch))
+        summary = self._new_assignment_summary()
         
         # Applied filters
         filter_parts = []
@@ -568,21 +663,8 @@ class ReportService:
         if filters.get('active_only'):
             filter_parts.append("Status: Active Only")
         
-        if filter_parts:
-            filter_style = styles['Normal']
-            filter_style.fontSize = 9
-            filter_style.textColor = colors.grey
-            elements.append(Paragraph(f"<b>Applied Filters:</b> {' | '.join(filter_parts)}", filter_style))
-            elements.append(Spacer(1, 0.15*inch))
-        
-        # Table
-        table_data = [[
-            'Asset Description', 'Category', 'Teacher', 'Qty', 'Assigned Date',
-            'Return Date', 'Status', 'Lab', 'Assigned Cost'
-        ]]
-        
-        for row in data:
-            table_data.append([
+        def cells(row: dict) -> List[str]:
+            return [
                 row['asset_description'][:20],
                 row['category'][:10],
                 row['teacher_name'][:15],
@@ -592,154 +674,164 @@ class ReportService:
                 row['status'],
                 row['lab'][:10],
                 f"₹{row['assigned_cost']:,.0f}"
-            ])
-        
-        table = Table(table_data, colWidths=[
-            1.2*inch, 0.7*inch, 0.9*inch, 0.4*inch, 0.7*inch,
-            0.7*inch, 0.5*inch, 0.6*inch, 0.8*inch
-        ])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a56db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 7),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 6),
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Summary
-        summary_data = [
-            ['Summary Statistics', ''],
-            ['Total Assignments', str(summary['total_assignments'])],
-            ['Active Assignments', str(summary['active_assignments'])],
-            ['Returned Assignments', str(summary['returned_assignments'])],
-            ['Total Assigned Quantity', str(summary['total_assigned_quantity'])],
-            ['', ''],
-            ['Total Assigned Cost', f"₹{summary['total_assigned_cost']:,.2f}"],
-            ['Active Assigned Cost', f"₹{summary['active_assigned_cost']:,.2f}"]
-        ]
-        
-        summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a56db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-            ('BACKGROUND', (0, 5), (-1, 7), colors.HexColor('#fef3c7')),
-            ('FONTNAME', (0, 5), (-1, 7), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Footer
-        footer_style = styles['Normal']
-        footer_style.fontSize = 8
-        footer_style.textColor = colors.grey
-        elements.append(Paragraph(
-            f"Generated on: {datetime.now().strftime('%d %B %Y at %I:%M %p')}",
-            footer_style
-        ))
-        
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer.read()
-    
-    def _generate_assignment_csv(self, data: List[dict]) -> bytes:
-        """Generate CSV report for assignments"""
-        buffer = BytesIO()
-        writer = csv.writer(buffer)
+            ]
+        
+        def closing() -> dict:
+            return {
+                'summary_rows': [
+                    ['Summary Statistics', ''],
+                    ['Total Assignments', str(summary['total_assignments'])],
+                    ['Active Assignments', str(summary['active_assignments'])],
+                    ['Returned Assignments', str(summary['returned_assignments'])],
+                    ['Total Assigned Quantity', str(summary['total_assigned_quantity'])],
+                    ['', ''],
+                    ['Total Assigned Cost', f"₹{summary['total_assigned_cost']:,.2f}"],
+                    ['Active Assigned Cost', f"₹{summary['active_assigned_cost']:,.2f}"]
+                ],
+                'highlight_from': 5,
+                'generated_on': datetime.now().strftime('%d %B %Y at %I:%M %p')
+            }
         
-        writer.writerow([
-            'Assignment ID', 'Asset Description', 'Category', 'Teacher Name', 'Assigned Quantity',
-            'Assignment Date', 'Return Date', 'Status', 'Lab', 'Vendor', 'Financial Year',
-            'Purchase Date', 'Original Cost', 'Assigned Cost', 'Current Location', 'Remarks'
-        ])
-        
-        for row in data:
-            writer.writerow([
-                row['assignment_id'], row['asset_description'], row['category'],
-                row['teacher_name'], row['assigned_quantity'], row['assignment_date'],
-                row['return_date'], row['status'], row['lab'], row['vendor'],
-                row['financial_year'], row['purchase_date'], row['original_cost'],
-                row['assigned_cost'], row['current_location'], row['remarks']
-            ])
-        
-        buffer.seek(0)
-        return buffer.read()
+        return render_register(
+            "Assignment Report",
+            ' | '.join(filter_parts),
+            ASSIGNMENT_PDF_HEADERS,
+            ASSIGNMENT_PDF_COL_WIDTHS,
+            (cells(row) for row in self._tally_assignment_rows(rows, summary)),
+            closing
+        )
     
-    def _generate_assignment_excel(self, data: List[dict], summary: dict) -> bytes:
-        """Generate Excel report for assignments"""
-        buffer = BytesIO()
-        wb = openpyxl.Workbook()
-        
-        ws_data = wb.active
-        ws_data.title = "Assignment Data"
-        
-        headers = [
-            'Assignment ID', 'Asset Description', 'Category', 'Teacher Name', 'Assigned Qty',
-            'Assignment Date', 'Return Date', 'Status', 'Lab', 'Vendor', 'Financial Year',
-            'Purchase Date', 'Original Cost', 'Assigned Cost', 'Current Location', 'Remarks'
-        ]
+    def _assignment_report_query(
+        self,
+        db: Session,
+        asset_id: Optional[str] = None,
+        teacher_id: Optional[str] = None,
+        lab_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+        active_only: Optional[bool] = None,
+        assignment_date_from: Optional[date] = None,
+        assignment_date_to: Optional[date] = None
+    ):
+        """
+        One filtered, joined query behind every assignment report format.
+        Every filter is in the WHERE clause and per-unit and assigned cost are
+        computed in SQL.
+        """
+        # * 1.0 keeps the division fractional where costs are stored as integers (SQLite)
+        per_unit_cost = case(
+            (Asset.total_quantity > 0, Asset.original_total_cost * 1.0 / Asset.total_quantity),
+            else_=0
+        )
         
-        header_fill = PatternFill(start_color='1a56db', end_color='1a56db', fill_type='solid')
-        header_font = Font(bold=True, color='FFFFFF', size=11)
+        query = db.query(
+            AssetAssignment.assignment_id,
+            AssetAssignment.assigned_quantity,
+            AssetAssignment.assignment_date,
+            AssetAssignment.return_date,
+            AssetAssignment.current_location,
+            AssetAssignment.remarks,
+            Asset.description,
+            Asset.financial_year,
+            Asset.purchase_date,
+            Asset.original_total_cost,
+            (per_unit_cost * AssetAssignment.assigned_quantity).label("assigned_cost"),
+            Teacher.name.label("teacher_name"),
+            Category.name.label("category_name"),
+            Lab.lab_name,
+            Vendor.vendor_name
+        ).join(Asset, Asset.asset_id == AssetAssignment.asset_id
+        ).outerjoin(Teacher, Teacher.teacher_id == AssetAssignment.teacher_id
+        ).outerjoin(Category, Category.category_id == Asset.category_id
+        ).outerjoin(Lab, Lab.lab_id == Asset.lab_id
+        ).outerjoin(Vendor, Vendor.vendor_id == Asset.vendor_id)
+        
+        conditions = []
+        if asset_id:
+            conditions.append(AssetAssignment.asset_id == asset_id)
+        if teacher_id:
+            conditions.append(AssetAssignment.teacher_id == teacher_id)
+        if active_only:
+            conditions.append(AssetAssignment.return_date.is_(None))
+        if lab_id:
+            conditions.append(Asset.lab_id == lab_id)
+        if category_id:
+            conditions.append(Asset.category_id == category_id)
+        if assignment_date_from:
+            conditions.append(AssetAssignment.assignment_date >= assignment_date_from)
+        if assignment_date_to:
+            conditions.append(AssetAssignment.assignment_date <= assignment_date_to)
+        if conditions:
+            query = query.filter(and_(*conditions))
+        
+        query = query.order_by(AssetAssignment.assignment_date.desc())
+        
+        return query.yield_per(REPORT_CHUNK_SIZE)
+    
+    def iter_assignment_report_rows(self, db: Session, **filters) -> Iterator[dict]:
+        """Assignment report rows formatted for CSV, XLSX and PDF; takes _assignment_report_query filters"""
+        for row in self._assignment_report_query(db, **filters):
+            yield {
+                'assignment_id': row.assignment_id,
+                'asset_description': row.description,
+                'category': row.category_name or 'N/A',
+                'teacher_name': row.teacher_name or 'N/A',
+                'assigned_quantity': row.assigned_quantity,
+                'assignment_date': row.assignment_date.strftime('%d-%b-%Y'),
+                'return_date': row.return_date.strftime('%d-%b-%Y') if row.return_date else 'Active',
+                'status': 'Active' if row.return_date is None else 'Returned',
+                'lab': row.lab_name or 'N/A',
+                'vendor': row.vendor_name or 'N/A',
+                'financial_year': row.financial_year,
+                'purchase_date': row.purchase_date.strftime('%d-%b-%Y'),
+                'original_cost': float(row.original_total_cost),
+                'assigned_cost': float(row.assigned_cost or 0),
+                'current_location': row.current_location or 'N/A',
+                'remarks': row.remarks or ''
+            }
+    
+    def iter_assignment_report_records(self, db: Session, **filters) -> Iterator[tuple]:
+        """Typed assignment report rows in ASSIGNMENT_COLUMNAR_SCHEMA order; missing values stay None"""
+        for row in self._assignment_report_query(db, **filters):
+            yield (
+                row.assignment_id,
+                row.description,
+                row.category_name,
+                row.teacher_name,
+                row.assigned_quantity,
+                row.assignment_date,
+                row.return_date,
+                'Active' if row.return_date is None else 'Returned',
+                row.lab_name,
+                row.vendor_name,
+                row.financial_year,
+                row.purchase_date,
+                to_money(row.original_total_cost),
+                to_money(row.assigned_cost or 0),
+                row.current_location,
+                row.remarks
+            )
+    
+    def stream_assignment_csv(self, db: Session, **filters) -> Tuple[Iterator[bytes], str, str]:
+        """Assignment report as a CSV byte stream; takes _assignment_report_query filters"""
+        chunks = self._cached_stream(
+            self._assignment_cache_key(db, filters, 'csv'),
+            self._stream_csv(
+                ASSIGNMENT_CSV_HEADERS, ASSIGNMENT_REPORT_KEYS, self.iter_assignment_report_rows(db, **filters)
+            )
+        )
+        return chunks, self._report_filename("assignment_report", 'csv'), "text/csv"
+    
+    def _generate_assignment_excel(self, rows: Iterable[dict]) -> bytes:
+        """Generate Excel report for assignments, writing rows as they are read"""
+        wb = openpyxl.Workbook(write_only=True)
+        summary = self._new_assignment_summary()
+        
+        self._write_excel_data_sheet(
+            wb, "Assignment Data", ASSIGNMENT_EXCEL_HEADERS, ASSIGNMENT_REPORT_KEYS,
+            self._tally_assignment_rows(rows, summary)
+        )
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws_data.cell(row=1, column=col_num, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        for row_num, row_data in enumerate(data, 2):
-            ws_data.cell(row=row_num, column=1, value=row_data['assignment_id'])
-            ws_data.cell(row=row_num, column=2, value=row_data['asset_description'])
-            ws_data.cell(row=row_num, column=3, value=row_data['category'])
-            ws_data.cell(row=row_num, column=4, value=row_data['teacher_name'])
-            ws_data.cell(row=row_num, column=5, value=row_data['assigned_quantity'])
-            ws_data.cell(row=row_num, column=6, value=row_data['assignment_date'])
-            ws_data.cell(row=row_num, column=7, value=row_data['return_date'])
-            ws_data.cell(row=row_num, column=8, value=row_data['status'])
-            ws_data.cell(row=row_num, column=9, value=row_data['lab'])
-            ws_data.cell(row=row_num, column=10, value=row_data['vendor'])
-            ws_data.cell(row=row_num, column=11, value=row_data['financial_year'])
-            ws_data.cell(row=row_num, column=12, value=row_data['purchase_date'])
-            ws_data.cell(row=row_num, column=13, value=row_data['original_cost'])
-            ws_data.cell(row=row_num, column=14, value=row_data['assigned_cost'])
-            ws_data.cell(row=row_num, column=15, value=row_data['current_location'])
-            ws_data.cell(row=row_num, column=16, value=row_data['remarks'])
-            
-            if row_num % 2 == 0:
-                fill = PatternFill(start_color='f3f4f6', end_color='f3f4f6', fill_type='solid')
-                for col in range(1, 17):
-                    ws_data.cell(row=row_num, column=col).fill = fill
-        
-        # Auto-adjust column widths
-        for col in ws_data.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_data.column_dimensions[column].width = adjusted_width
-        
-        # Summary sheet
-        ws_summary = wb.create_sheet(title="Summary")
-        summary_data = [
+        self._write_excel_summary_sheet(wb, [
             ['Assignment Report Summary', ''],
             ['', ''],
             ['Metric', 'Value'],
@@ -751,27 +843,8 @@ class ReportService:
             ['Financial Summary', ''],
             ['Total Assigned Cost', summary['total_assigned_cost']],
             ['Active Assigned Cost', summary['active_assigned_cost']]
-        ]
-        
-        for row_num, row_data in enumerate(summary_data, 1):
-            for col_num, value in enumerate(row_data, 1):
-                cell = ws_summary.cell(row=row_num, column=col_num, value=value)
-                if row_num == 1:
-                    cell.font = Font(bold=True, size=14)
-                    cell.fill = header_fill
-                    cell.font = Font(bold=True, color='FFFFFF', size=14)
-                elif row_num == 3:
-                    cell.font = Font(bold=True, size=12)
-                    cell.fill = header_fill
-                    cell.font = Font(bold=True, color='FFFFFF')
-                elif row_num == 9:
-                    cell.font = Font(bold=True, size=12)
-                    cell.fill = PatternFill(start_color='fef3c7', end_color='fef3c7', fill_type='solid')
-        
-        ws_summary.column_dimensions['A'].width = 30
-        ws_summary.column_dimensions['B'].width = 20
+        ], section_row=9)
         
+        buffer = BytesIO()
         wb.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
-
+        return buffer.getvalue()
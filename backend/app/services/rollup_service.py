@@ -0,0 +1,90 @@
+"""
+Summaries over the asset_rollup groups.
+
+Totals for any subset of (financial_year, category, lab, vendor,
+is_special_hardware), narrowed by any of those dimensions, are sums over the
+pre-aggregated rollup rows (see app.core.asset_rollups) rather than scans of
+the register. Category, lab and vendor groups carry both id and name so a
+client can drill down by passing the id back as a filter.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import AssetRollup, Category, Lab, Vendor
+
+# Rollup rows change with these tables; verifier repairs bump asset_rollup itself
+ROLLUP_TABLES = ("asset", "asset_stock", "asset_rollup", "category", "lab", "vendor")
+
+ROLLUP_DIMENSIONS = ("financial_year", "category", "lab", "vendor", "is_special_hardware")
+
+# Filter name -> rollup column; "none" selects assets without a category, lab or vendor
+ROLLUP_FILTERS = {
+    "financial_year": AssetRollup.financial_year,
+    "category_id": AssetRollup.category_id,
+    "lab_id": AssetRollup.lab_id,
+    "vendor_id": AssetRollup.vendor_id,
+    "is_special_hardware": AssetRollup.is_special_hardware,
+}
+NONE_FILTER = "none"
+
+# Dimension -> (id column, master table, master id column, name column)
+NAMED_DIMENSIONS = {
+    "category": (AssetRollup.category_id, Category, Category.category_id, Category.name),
+    "lab": (AssetRollup.lab_id, Lab, Lab.lab_id, Lab.lab_name),
+    "vendor": (AssetRollup.vendor_id, Vendor, Vendor.vendor_id, Vendor.vendor_name),
+}
+
+SUMMED_MEASURES = (
+    "asset_count", "total_quantity", "assigned_quantity", "scrapped_quantity", "original_cost", "current_cost"
+)
+
+
+class RollupService:
+
+    def grouped_query(self, group_by: List[str], filters: Optional[Dict[str, object]] = None):
+        """
+        Select of the summed measures per group. Named dimensions yield
+        <dimension>_id and <dimension> (name) columns.
+        """
+        columns, group_columns, joins = [], [], []
+        for name in group_by:
+            if name in NAMED_DIMENSIONS:
+                id_column, table, table_id, name_column = NAMED_DIMENSIONS[name]
+                columns += [id_column.label(f"{name}_id"), name_column.label(name)]
+                group_columns += [id_column, name_column]
+                joins.append((table, table_id == id_column))
+            else:
+                column = getattr(AssetRollup, name)
+                columns.append(column.label(name))
+                group_columns.append(column)
+
+        query = select(
+            *columns,
+            *(func.coalesce(func.sum(getattr(AssetRollup, measure)), 0).label(measure) for measure in SUMMED_MEASURES)
+        ).select_from(AssetRollup)
+        for table, condition in joins:
+            query = query.outerjoin(table, condition)
+
+        for name, value in (filters or {}).items():
+            column = ROLLUP_FILTERS[name]
+            query = query.where(column.is_(None) if value == NONE_FILTER else column == value)
+
+        if group_columns:
+            query = query.group_by(*group_columns).order_by(*group_columns)
+        return query
+
+    def summarize(self, db: Session, group_by: List[str], filters: Optional[Dict[str, object]] = None) -> dict:
+        """Groups with their totals, plus overall totals for the filtered rollups"""
+        groups = [self._with_derived(dict(row._mapping)) for row in db.execute(self.grouped_query(group_by, filters))]
+        totals = self._with_derived(dict(db.execute(self.grouped_query([], filters)).one()._mapping))
+        return {"group_by": group_by, "filters": filters or {}, "groups": groups, "totals": totals}
+
+    def _with_derived(self, record: dict) -> dict:
+        for measure in SUMMED_MEASURES:
+            value = record[measure]
+            record[measure] = round(float(value), 2) if measure.endswith("_cost") else int(value)
+        record["available_quantity"] = record["total_quantity"] - record["assigned_quantity"] - record["scrapped_quantity"]
+        record["scrap_cost"] = round(record["original_cost"] - record["current_cost"], 2)
+        return record
@@ -1,12 +1,56 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_
-from typing import Optional, List
+from sqlalchemy import select, func
+from typing import Iterable, Iterator, Optional, List, Tuple
 from datetime import date
 from decimal import Decimal
 import math
+import sqlite3
+from itertools import islice
 
 from app.models import Asset, Scrap, ScrapPhase
 from app.schemas.scrap import ScrapCreate, ScrapResponse, ScrapPhaseSummary
+from app.services.stock_service import StockService
+
+
+# Rows fetched per round trip when reading an asset's scrap ledger
+HISTORY_BATCH_ROWS = 1000
+
+# Order in which an asset's scraps accumulate; created_at and scrap_id break same-day ties
+SCRAP_LEDGER_ORDER = (Scrap.scrap_date, Scrap.created_at, Scrap.scrap_id)
+
+
+def to_money(value) -> Decimal:
+    """Decimal rounded to cents (SQLite returns sums of money columns as floats)"""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.quantize(Decimal("0.01"))
+
+
+def supports_window_functions(bind) -> bool:
+    """Whether the database supports SUM() OVER (SQLite 3.25+, MySQL 8.0+, MariaDB 10.2+)"""
+    dialect = bind.dialect
+    if dialect.name == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 25, 0)
+    if dialect.name == "mysql":
+        version = dialect.server_version_info or (0,)
+        return version >= ((10, 2) if dialect.is_mariadb else (8, 0))
+    return True
+
+
+def accumulate_ledger(rows: Iterable) -> Iterator[Tuple[object, int, Decimal]]:
+    """
+    Yield (row, cumulative quantity, cumulative value) for scrap rows ordered by
+    asset_id and then SCRAP_LEDGER_ORDER, restarting the totals for each asset
+    """
+    current_asset = None
+    quantity, value = 0, Decimal("0")
+    for row in rows:
+        if row.asset_id != current_asset:
+            current_asset = row.asset_id
+            quantity, value = 0, Decimal("0")
+        quantity += row.scrapped_quantity
+        value += to_money(row.scrap_value)
+        yield row, quantity, value
 
 
 class ScrapService:
@@ -27,11 +71,11 @@ class ScrapService:
         if not asset:
             raise ValueError(f"Asset {asset_id} not found")
         
-        # Calculate current usage
-        from app.services.asset_service import AssetService
-        asset_service = AssetService()
-        active_assigned = asset_service._get_active_assigned_quantity(db, asset_id)
-        total_scrapped = asset_service._get_total_scrapped_quantity(db, asset_id)
+        # Current usage from the stock summary row
+        stock_service = StockService()
+        stock = stock_service.get_stock(db, asset)
+        active_assigned = stock.assigned_quantity
+        total_scrapped = stock.scrapped_quantity
         
         available = asset.total_quantity - active_assigned - total_scrapped
         
@@ -68,25 +112,20 @@ class ScrapService:
         
         # Update asset's current cost
         asset.current_total_cost = asset.current_total_cost - scrap_value
+        stock_service.apply(db, asset, scrapped_delta=scrap.scrapped_quantity)
         
         db.commit()
         db.refresh(scrap)
         return scrap
     
-    def get_scrap_records(
+    def _scrap_conditions(
         self,
-        db: Session,
-        asset_id: Optional[str] = None,
-        phase_id: Optional[str] = None,
-        financial_year: Optional[str] = None,
-        date_from: Optional[date] = None,
-        date_to: Optional[date] = None,
-        page: int = 1,
-        size: int = 50
-    ) -> dict:
-        """Get scrap records with filters"""
-        query = db.query(Scrap).join(Asset)
-        
+        asset_id: Optional[str],
+        phase_id: Optional[str],
+        financial_year: Optional[str],
+        date_from: Optional[date],
+        date_to: Optional[date]
+    ) -> list:
         conditions = []
         
         if asset_id:
@@ -104,48 +143,165 @@ class ScrapService:
         if date_to:
             conditions.append(Scrap.scrap_date <= date_to)
         
-        if conditions:
-            query = query.filter(and_(*conditions))
-        
-        # Count
-        total = query.count()
-        
-        # Paginate
-        query = query.order_by(Scrap.scrap_date.desc())
-        scraps = query.offset((page - 1) * size).limit(size).all()
-        
-        # Enhance with asset and phase info
-        result = []
-        for scrap in scraps:
-            asset = db.query(Asset).filter(Asset.asset_id == scrap.asset_id).first()
-            phase = db.query(ScrapPhase).filter(ScrapPhase.phase_id == scrap.phase_id).first()
-            
-            # Calculate cumulative values
-            cumulative_scrapped = db.query(func.coalesce(func.sum(Scrap.scrapped_quantity), 0)).filter(
-                and_(
-                    Scrap.asset_id == scrap.asset_id,
-                    Scrap.scrap_date <= scrap.scrap_date
-                )
-            ).scalar() or 0
-            
-            cumulative_value = db.query(func.coalesce(func.sum(Scrap.scrap_value), 0)).filter(
-                and_(
-                    Scrap.asset_id == scrap.asset_id,
-                    Scrap.scrap_date <= scrap.scrap_date
+        return conditions
+    
+    def get_scrap_records(
+        self,
+        db: Session,
+        asset_id: Optional[str] = None,
+        phase_id: Optional[str] = None,
+        financial_year: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        page: int = 1,
+        size: int = 50
+    ) -> dict:
+        """
+        Get scrap records with filters (items are ScrapResponse-shaped dicts).
+        
+        Two queries: the count, and the page with asset description, phase name
+        and running totals. cumulative_scrapped / cumulative_value cover the
+        asset's whole history up to and including each row in ledger order
+        (scrap_date, created_at, scrap_id), so same-day scraps accumulate in a
+        stable order. Running totals are SUM() OVER windows computed only for
+        the assets on the page; without window functions one ordered query of
+        those assets' scraps is accumulated in Python instead.
+        """
+        conditions = self._scrap_conditions(asset_id, phase_id, financial_year, date_from, date_to)
+        
+        total = db.execute(
+            select(func.count(Scrap.scrap_id))
+            .select_from(Scrap)
+            .join(Asset, Asset.asset_id == Scrap.asset_id)
+            .where(*conditions)
+        ).scalar() or 0
+        
+        page_rows = (
+            select(Scrap.scrap_id, Scrap.asset_id)
+            .join(Asset, Asset.asset_id == Scrap.asset_id)
+            .where(*conditions)
+            .order_by(*(column.desc() for column in SCRAP_LEDGER_ORDER))
+            .offset((page - 1) * size)
+            .limit(size)
+            .cte("page_rows")
+        )
+        columns = [
+            Scrap.scrapped_quantity,
+            Scrap.scrap_date,
+            Scrap.phase_id,
+            Scrap.remarks,
+            Scrap.scrap_id,
+            Scrap.asset_id,
+            Scrap.scrap_value,
+            Scrap.created_at,
+            Asset.description.label("asset_description"),
+            ScrapPhase.name.label("phase_name")
+        ]
+        source = (
+            page_rows.join(Scrap, Scrap.scrap_id == page_rows.c.scrap_id)
+            .join(Asset, Asset.asset_id == Scrap.asset_id)
+            .outerjoin(ScrapPhase, ScrapPhase.phase_id == Scrap.phase_id)
+        )
+        page_assets = select(page_rows.c.asset_id)
+        ordering = [column.desc() for column in SCRAP_LEDGER_ORDER]
+        
+        if supports_window_functions(db.get_bind()):
+            # Entries are summed at cents like accumulate_ledger (SQLite keeps money unrounded)
+            window = {
+                "partition_by": Scrap.asset_id,
+                "order_by": list(SCRAP_LEDGER_ORDER),
+                "rows": (None, 0)
+            }
+            running = (
+                select(
+                    Scrap.scrap_id,
+                    func.sum(Scrap.scrapped_quantity).over(**window).label("cumulative_scrapped"),
+                    func.sum(func.round(Scrap.scrap_value, 2)).over(**window).label("cumulative_value")
                 )
-            ).scalar() or 0
-            
-            scrap_dict = {
-                **scrap.__dict__,
-                "asset_description": asset.description if asset else None,
-                "phase_name": phase.name if phase else None,
-                "cumulative_scrapped": int(cumulative_scrapped),
-                "cumulative_value": float(cumulative_value)
+                .where(Scrap.asset_id.in_(page_assets))
+                .cte("running_totals")
+            )
+            rows = db.execute(
+                select(*columns, running.c.cumulative_scrapped, running.c.cumulative_value)
+                .select_from(source.join(running, running.c.scrap_id == Scrap.scrap_id))
+                .order_by(*ordering)
+            ).mappings().all()
+            items = [
+                {
+                    **row,
+                    "cumulative_scrapped": int(row["cumulative_scrapped"] or 0),
+                    "cumulative_value": to_money(row["cumulative_value"] or 0)
+                }
+                for row in rows
+            ]
+        else:
+            rows = db.execute(select(*columns).select_from(source).order_by(*ordering)).mappings().all()
+            ledger = db.execute(
+                select(Scrap.asset_id, Scrap.scrap_id, Scrap.scrapped_quantity, Scrap.scrap_value)
+                .where(Scrap.asset_id.in_({row["asset_id"] for row in rows}))
+                .order_by(Scrap.asset_id, *SCRAP_LEDGER_ORDER)
+            )
+            running = {
+                entry.scrap_id: (quantity, value)
+                for entry, quantity, value in accumulate_ledger(ledger)
             }
-            result.append(ScrapResponse(**scrap_dict))
+            items = [
+                {
+                    **row,
+                    "cumulative_scrapped": running[row["scrap_id"]][0],
+                    "cumulative_value": running[row["scrap_id"]][1]
+                }
+                for row in rows
+            ]
         
         return {
-            "items": result,
+            "items": items,
+            "total": total,
+            "page": page,
+            "pages": math.ceil(total / size) if total > 0 else 0
+        }
+    
+    def iter_scrap_history(self, db: Session, asset_id: str) -> Iterator[dict]:
+        """
+        Every scrap of an asset in ledger order with running totals, from one
+        ordered query read in batches and accumulated in a single pass
+        """
+        rows = db.execute(
+            select(
+                Scrap.scrapped_quantity,
+                Scrap.scrap_date,
+                Scrap.phase_id,
+                Scrap.remarks,
+                Scrap.scrap_id,
+                Scrap.asset_id,
+                Scrap.scrap_value,
+                Scrap.created_at,
+                Asset.description.label("asset_description"),
+                ScrapPhase.name.label("phase_name")
+            )
+            .join(Asset, Asset.asset_id == Scrap.asset_id)
+            .outerjoin(ScrapPhase, ScrapPhase.phase_id == Scrap.phase_id)
+            .where(Scrap.asset_id == asset_id)
+            .order_by(*SCRAP_LEDGER_ORDER)
+            .execution_options(yield_per=HISTORY_BATCH_ROWS)
+        )
+        try:
+            for row, quantity, value in accumulate_ledger(rows):
+                yield {**row._mapping, "cumulative_scrapped": quantity, "cumulative_value": value}
+        finally:
+            rows.close()
+    
+    def get_scrap_history_page(self, db: Session, asset_id: str, page: int = 1, size: int = 100) -> dict:
+        """
+        One page of an asset's scrap ledger. Running totals need every earlier
+        entry, so the ledger is read up to the end of the page in one pass.
+        """
+        total = db.execute(
+            select(func.count(Scrap.scrap_id)).where(Scrap.asset_id == asset_id)
+        ).scalar() or 0
+        items = list(islice(self.iter_scrap_history(db, asset_id), (page - 1) * size, page * size))
+        return {
+            "items": items,
             "total": total,
             "page": page,
             "pages": math.ceil(total / size) if total > 0 else 0
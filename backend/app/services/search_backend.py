@@ -0,0 +1,161 @@
+"""
+Full-text search backends for the asset `search` filter.
+
+Each backend knows how to apply a search term to an asset query, returning
+a relevance expression for `sort_by=relevance`. The indexes are created by
+migration 3 (see app.core.schema_snapshots):
+
+- MySQL:  FULLTEXT indexes on asset(description, remarks) and vendor(vendor_name),
+          queried with MATCH ... AGAINST in boolean mode. InnoDB keeps them current.
+- SQLite: an FTS5 table keyed by asset.rowid, kept current by triggers on asset
+          and vendor so creates, updates and backup restores are all covered.
+- Other:  the original ILIKE scan.
+
+Multi-word queries require every word; each word matches as a prefix, in
+any of the indexed fields (so "dell desktop" finds a Dell desktop whatever
+field each word is in).
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, and_, bindparam, inspect, literal_column, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Query
+
+from app.models import Asset, Vendor
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(search: str) -> List[str]:
+    """Split a search string into plain word tokens (drops query syntax characters)"""
+    return _TOKEN_PATTERN.findall(search.lower())
+
+
+class LikeSearchBackend:
+    """ILIKE over description, remarks and vendor name (no index)"""
+
+    name = "like"
+
+    def rebuild(self, conn: Connection) -> None:
+        pass
+
+    def apply(self, query: Query, search: str) -> Tuple[Query, Optional[object]]:
+        """Filter the asset query; returns (query, relevance expression or None)"""
+        query = query.outerjoin(Vendor, Vendor.vendor_id == Asset.vendor_id)
+        conditions = []
+        for token in tokenize(search) or [search]:
+            term = f"%{token}%"
+            conditions.append(or_(
+                Asset.description.ilike(term),
+                Asset.remarks.ilike(term),
+                Vendor.vendor_name.ilike(term)
+            ))
+        return query.filter(and_(*conditions)), None
+
+
+class MySQLFullTextSearchBackend(LikeSearchBackend):
+    """MATCH ... AGAINST over InnoDB FULLTEXT indexes"""
+
+    name = "mysql_fulltext"
+
+    # innodb_ft_min_token_size defaults to 3; shorter words never reach the index
+    MIN_TOKEN_LENGTH = 3
+
+    def apply(self, query: Query, search: str) -> Tuple[Query, Optional[object]]:
+        tokens = tokenize(search)
+        if not tokens or any(len(token) < self.MIN_TOKEN_LENGTH for token in tokens):
+            return super().apply(query, search)
+
+        from sqlalchemy.dialects.mysql import match
+
+        # Each word may match the asset text or the vendor name, as in the other backends
+        conditions = []
+        for token in tokens:
+            vendor_ids = select(Vendor.vendor_id).where(
+                match(Vendor.vendor_name, against=f"+{token}*").in_boolean_mode()
+            )
+            conditions.append(or_(
+                match(Asset.description, Asset.remarks, against=f"+{token}*").in_boolean_mode(),
+                Asset.vendor_id.in_(vendor_ids)
+            ))
+
+        # Optional words, so assets matching only some of them on their own text still score
+        relevance = match(
+            Asset.description, Asset.remarks, against=" ".join(f"{token}*" for token in tokens)
+        ).in_boolean_mode()
+        return query.filter(and_(*conditions)), relevance.desc()
+
+
+asset_fts = Table(
+    "asset_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("description", Text),
+    Column("remarks", Text),
+    Column("vendor_name", Text),
+)
+
+
+class SQLiteFTS5SearchBackend(LikeSearchBackend):
+    """
+    FTS5 table whose rowid mirrors asset.rowid.
+
+    asset has no INTEGER PRIMARY KEY, so a VACUUM may renumber its rowids;
+    call rebuild() afterwards.
+    """
+
+    name = "sqlite_fts5"
+
+    def rebuild(self, conn: Connection) -> None:
+        conn.execute(text("DELETE FROM asset_fts"))
+        conn.execute(text(
+            "INSERT INTO asset_fts(rowid, description, remarks, vendor_name) "
+            "SELECT asset.rowid, asset.description, asset.remarks, vendor.vendor_name "
+            "FROM asset LEFT JOIN vendor ON vendor.vendor_id = asset.vendor_id"
+        ))
+
+    def apply(self, query: Query, search: str) -> Tuple[Query, Optional[object]]:
+        tokens = tokenize(search)
+        if not tokens:
+            return super().apply(query, search)
+
+        fts_query = " ".join(f'"{token}"*' for token in tokens)
+        query = query.join(asset_fts, asset_fts.c.rowid == literal_column("asset.rowid")).filter(
+            literal_column("asset_fts").op("MATCH")(bindparam("fts_query", fts_query))
+        )
+        # bm25() is lower for better matches
+        return query, literal_column("bm25(asset_fts)").asc()
+
+
+def sqlite_has_fts5(conn: Connection) -> bool:
+    options = {row[0] for row in conn.execute(text("PRAGMA compile_options"))}
+    return "ENABLE_FTS5" in options
+
+
+def get_search_backend(conn: Connection) -> LikeSearchBackend:
+    """Pick the best backend for the connection's dialect"""
+    dialect = conn.dialect.name
+    if dialect in ("mysql", "mariadb"):
+        return MySQLFullTextSearchBackend()
+    if dialect == "sqlite" and sqlite_has_fts5(conn):
+        return SQLiteFTS5SearchBackend()
+    return LikeSearchBackend()
+
+
+_installed_backends = {}
+
+
+def get_active_search_backend(conn: Connection) -> LikeSearchBackend:
+    """
+    Backend to query with: the dialect's backend once its index exists,
+    otherwise the ILIKE fallback. Cached per engine URL.
+    """
+    key = str(conn.engine.url)
+    if key not in _installed_backends:
+        backend = get_search_backend(conn)
+        if isinstance(backend, SQLiteFTS5SearchBackend):
+            if not inspect(conn).has_table("asset_fts"):
+                backend = LikeSearchBackend()
+        _installed_backends[key] = backend
+    return _installed_backends[key]
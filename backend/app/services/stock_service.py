@@ -0,0 +1,190 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, distinct, insert, update, delete
+from typing import Optional, List
+
+from app.models import Asset, AssetAssignment, Scrap, AssetStock
+
+
+class StockService:
+    """
+    Maintains the asset_stock read model.
+
+    Writers call apply() inside their own transaction; the caller commits.
+    rebuild() recomputes every row from the assignment and scrap history.
+    """
+
+    STOCK_FIELDS = ("assigned_quantity", "scrapped_quantity", "available_quantity", "active_teacher_count")
+
+    def _compute_active_assigned(self, db: Session, asset_id: str) -> int:
+        """Sum active assignments for one asset from the history table"""
+        result = db.query(func.coalesce(func.sum(AssetAssignment.assigned_quantity), 0)).filter(
+            and_(
+                AssetAssignment.asset_id == asset_id,
+                AssetAssignment.return_date.is_(None)
+            )
+        ).scalar()
+        return int(result) if result else 0
+
+    def _compute_total_scrapped(self, db: Session, asset_id: str) -> int:
+        """Sum scrapped quantity for one asset from the history table"""
+        result = db.query(func.coalesce(func.sum(Scrap.scrapped_quantity), 0)).filter(
+            Scrap.asset_id == asset_id
+        ).scalar()
+        return int(result) if result else 0
+
+    def _compute_active_teacher_count(self, db: Session, asset_id: str) -> int:
+        """Count distinct teachers holding an active assignment of one asset"""
+        result = db.query(func.count(distinct(AssetAssignment.teacher_id))).filter(
+            and_(
+                AssetAssignment.asset_id == asset_id,
+                AssetAssignment.return_date.is_(None)
+            )
+        ).scalar()
+        return int(result) if result else 0
+
+    def get_stock(self, db: Session, asset: Asset) -> AssetStock:
+        """
+        Get the stock row for an asset, creating it from history if missing.
+        Callers that validate quantities should hold the asset row lock.
+        """
+        stock = db.query(AssetStock).filter(AssetStock.asset_id == asset.asset_id).first()
+        if stock is None:
+            assigned = self._compute_active_assigned(db, asset.asset_id)
+            scrapped = self._compute_total_scrapped(db, asset.asset_id)
+            stock = AssetStock(
+                asset_id=asset.asset_id,
+                assigned_quantity=assigned,
+                scrapped_quantity=scrapped,
+                available_quantity=asset.total_quantity - assigned - scrapped,
+                active_teacher_count=self._compute_active_teacher_count(db, asset.asset_id)
+            )
+            db.add(stock)
+        return stock
+
+    def init_stock(self, db: Session, asset: Asset) -> AssetStock:
+        """Create the stock row for a newly added asset"""
+        stock = AssetStock(
+            asset_id=asset.asset_id,
+            assigned_quantity=0,
+            scrapped_quantity=0,
+            available_quantity=asset.total_quantity,
+            active_teacher_count=0
+        )
+        db.add(stock)
+        return stock
+
+    def apply(
+        self,
+        db: Session,
+        asset: Asset,
+        assigned_delta: int = 0,
+        scrapped_delta: int = 0
+    ) -> AssetStock:
+        """
+        Apply an assignment/scrap delta to an asset's stock row.
+        Also refreshes available quantity after total_quantity edits.
+        """
+        stock = self.get_stock(db, asset)
+        stock.assigned_quantity = (stock.assigned_quantity or 0) + assigned_delta
+        stock.scrapped_quantity = (stock.scrapped_quantity or 0) + scrapped_delta
+        stock.available_quantity = asset.total_quantity - stock.assigned_quantity - stock.scrapped_quantity
+
+        if assigned_delta:
+            # Distinct teachers can't be maintained by deltas; recount this asset only
+            db.flush()
+            stock.active_teacher_count = self._compute_active_teacher_count(db, asset.asset_id)
+
+        return stock
+
+    def rebuild(self, db: Session, dry_run: bool = False) -> dict:
+        """
+        Recompute every stock row from history in bulk and report drift.
+        With dry_run the drift is reported but nothing is written.
+        """
+        assigned_rows = db.query(
+            AssetAssignment.asset_id,
+            func.sum(AssetAssignment.assigned_quantity),
+            func.count(distinct(AssetAssignment.teacher_id))
+        ).filter(
+            AssetAssignment.return_date.is_(None)
+        ).group_by(AssetAssignment.asset_id).all()
+        assigned = {asset_id: (int(qty or 0), int(teachers or 0)) for asset_id, qty, teachers in assigned_rows}
+
+        scrapped = {
+            asset_id: int(qty or 0)
+            for asset_id, qty in db.query(
+                Scrap.asset_id, func.sum(Scrap.scrapped_quantity)
+            ).group_by(Scrap.asset_id).all()
+        }
+
+        existing = {
+            row.asset_id: row
+            for row in db.query(
+                AssetStock.asset_id,
+                AssetStock.assigned_quantity,
+                AssetStock.scrapped_quantity,
+                AssetStock.available_quantity,
+                AssetStock.active_teacher_count
+            ).all()
+        }
+
+        to_insert: List[dict] = []
+        to_update: List[dict] = []
+        drift: List[dict] = []
+        asset_ids = set()
+
+        for asset_id, total_quantity in db.query(Asset.asset_id, Asset.total_quantity).all():
+            asset_ids.add(asset_id)
+            active_assigned, teacher_count = assigned.get(asset_id, (0, 0))
+            total_scrapped = scrapped.get(asset_id, 0)
+            expected = {
+                "asset_id": asset_id,
+                "assigned_quantity": active_assigned,
+                "scrapped_quantity": total_scrapped,
+                "available_quantity": total_quantity - active_assigned - total_scrapped,
+                "active_teacher_count": teacher_count
+            }
+
+            current = existing.get(asset_id)
+            if current is None:
+                to_insert.append(expected)
+                drift.append({"asset_id": asset_id, "issue": "missing"})
+                continue
+
+            changed = {
+                field: {"stored": getattr(current, field), "actual": expected[field]}
+                for field in self.STOCK_FIELDS
+                if getattr(current, field) != expected[field]
+            }
+            if changed:
+                to_update.append(expected)
+                drift.append({"asset_id": asset_id, "issue": "mismatch", "fields": changed})
+
+        orphaned = [asset_id for asset_id in existing if asset_id not in asset_ids]
+        for asset_id in orphaned:
+            drift.append({"asset_id": asset_id, "issue": "orphaned"})
+
+        if not dry_run:
+            if to_insert:
+                db.execute(insert(AssetStock), to_insert)
+            if to_update:
+                db.execute(update(AssetStock), to_update)
+            if orphaned:
+                db.execute(delete(AssetStock).where(AssetStock.asset_id.in_(orphaned)))
+            db.commit()
+
+        return {
+            "assets": len(asset_ids),
+            "inserted": len(to_insert),
+            "updated": len(to_update),
+            "removed": len(orphaned),
+            "drift": drift
+        }
+
+    def ensure_populated(self, db: Session) -> Optional[dict]:
+        """Rebuild the read model when its row count doesn't match the asset table"""
+        asset_count = db.query(func.count(Asset.asset_id)).scalar() or 0
+        stock_count = db.query(func.count(AssetStock.asset_id)).scalar() or 0
+        if asset_count != stock_count:
+            return self.rebuild(db)
+        return None
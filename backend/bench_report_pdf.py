@@ -0,0 +1,75 @@
+"""
+Time the PDF register renderer at 5k and 20k rows and record peak memory,
+against the old single-table layout. Rows are generated in memory, so no
+database is needed. Worker memory is the largest section process RSS.
+Run: python bench_report_pdf.py [--rows 5000 20000] [--baseline]
+"""
+import argparse
+import resource
+import time
+import tracemalloc
+
+from app.schemas.asset import AssetFilters
+from app.services import report_pdf
+from app.services.report_service import ReportService
+from bench_report_xlsx import asset_rows, assignment_rows
+
+
+def measure(fn):
+    """(wall seconds, peak traced MiB in this process, output bytes); timed untraced"""
+    start = time.perf_counter()
+    output = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), len(output)
+
+
+def single_table(fn):
+    """Run fn with every row in one table in one document, as reports were built before"""
+    def run():
+        chunk_rows, section_rows = report_pdf.PDF_TABLE_CHUNK_ROWS, report_pdf.PDF_SECTION_ROWS
+        report_pdf.PDF_TABLE_CHUNK_ROWS = report_pdf.PDF_SECTION_ROWS = 10 ** 9
+        try:
+            return fn()
+        finally:
+            report_pdf.PDF_TABLE_CHUNK_ROWS, report_pdf.PDF_SECTION_ROWS = chunk_rows, section_rows
+    return run
+
+
+def main():
+    """Print wall time and peak memory per report, layout and row count"""
+    parser = argparse.ArgumentParser(description="Benchmark the PDF register renderer")
+    parser.add_argument("--rows", type=int, nargs="+", default=[5000, 20000], help="Row counts to run")
+    parser.add_argument("--baseline", action="store_true", help="Also time the single-table layout")
+    args = parser.parse_args()
+
+    service = ReportService()
+    cases = [
+        ("assets", lambda n: service._generate_asset_pdf(asset_rows(n), AssetFilters())),
+        ("assignments", lambda n: service._generate_assignment_pdf(assignment_rows(n), {})),
+    ]
+    layouts = [("register", lambda fn: fn)]
+    if args.baseline:
+        layouts.append(("single", single_table))
+
+    print(f"{'report':<14}{'layout':<10}{'rows':>8}{'wall s':>9}{'ms/1k':>8}{'peak MiB':>10}{'file KiB':>10}")
+    for name, build in cases:
+        for layout, wrap in layouts:
+            for count in args.rows:
+                elapsed, peak, size = measure(wrap(lambda: build(count)))
+                print(
+                    f"{name:<14}{layout:<10}{count:>8}{elapsed:>9.2f}{elapsed * 1e6 / count:>8.0f}"
+                    f"{peak:>10.1f}{size / 1024:>10.0f}"
+                )
+
+    worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"largest worker RSS: {worker_rss:.0f} MiB")
+    report_pdf.shutdown_pdf_pool()
+
+
+if __name__ == "__main__":
+    main()
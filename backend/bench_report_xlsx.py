@@ -0,0 +1,95 @@
+"""
+Time the write-only XLSX report writer at 10k, 50k and 100k rows and record
+peak memory. Rows are generated in memory, so no database is needed.
+Run: python bench_report_xlsx.py [--rows 10000 50000 100000]
+"""
+import argparse
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+
+from app.services.report_service import ReportService
+
+
+def asset_rows(count):
+    """Asset report rows as iter_asset_report_rows yields them"""
+    for i in range(count):
+        yield {
+            'description': f"Dell OptiPlex Desktop #{i}",
+            'category': 'Desktop Computer',
+            'total_quantity': 10,
+            'assigned_quantity': 4,
+            'scrapped_quantity': 1,
+            'available_quantity': 5,
+            'purchase_date': (date(2024, 6, 1) + timedelta(days=i % 300)).strftime('%d-%b-%Y'),
+            'financial_year': '2024-2025',
+            'vendor': 'Dell India',
+            'original_cost': 450000.0,
+            'current_cost': 405000.0,
+            'scrap_cost': 45000.0,
+            'lab': 'Lab 1 (602)',
+            'physical_location': 'Room 301',
+            'assigned_to': 'Prof. John Doe, Prof. Prachi Gharpure',
+            'remarks': '' if i % 3 else 'For B.Tech students'
+        }
+
+
+def assignment_rows(count):
+    """Assignment report rows as iter_assignment_report_rows yields them"""
+    for i in range(count):
+        returned = i % 4 == 0
+        yield {
+            'assignment_id': str(uuid.UUID(int=i)),
+            'asset_description': f"Dell OptiPlex Desktop #{i}",
+            'category': 'Desktop Computer',
+            'teacher_name': 'Prof. John Doe',
+            'assigned_quantity': 2,
+            'assignment_date': (date(2024, 7, 1) + timedelta(days=i % 300)).strftime('%d-%b-%Y'),
+            'return_date': '01-Jun-2025' if returned else 'Active',
+            'status': 'Returned' if returned else 'Active',
+            'lab': 'Lab 1',
+            'vendor': 'Dell India',
+            'financial_year': '2024-2025',
+            'purchase_date': '15-Mar-2024',
+            'original_cost': 450000.0,
+            'assigned_cost': 90000.0,
+            'current_location': 'Staff Room',
+            'remarks': ''
+        }
+
+
+def measure(fn):
+    """(wall seconds, peak traced MiB, output bytes); timed untraced, since tracemalloc slows allocation"""
+    start = time.perf_counter()
+    output = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), len(output)
+
+
+def main():
+    """Print wall time and peak memory per report and row count"""
+    parser = argparse.ArgumentParser(description="Benchmark the XLSX report writer")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 100000], help="Row counts to run")
+    args = parser.parse_args()
+
+    service = ReportService()
+    cases = [
+        ("assets", lambda n: service._generate_asset_excel(asset_rows(n))),
+        ("assignments", lambda n: service._generate_assignment_excel(assignment_rows(n))),
+    ]
+
+    print(f"{'report':<14}{'rows':>10}{'wall s':>10}{'peak MiB':>11}{'file KiB':>11}")
+    for name, build in cases:
+        for count in args.rows:
+            elapsed, peak, size = measure(lambda: build(count))
+            print(f"{name:<14}{count:>10}{elapsed:>10.2f}{peak:>11.1f}{size / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
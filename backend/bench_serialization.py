@@ -0,0 +1,141 @@
+"""
+Time list-endpoint serialization per 1,000 rows: the old per-row Pydantic path
+versus the FastJSONResponse path. Uses in-memory rows, no database needed.
+Run: python bench_serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import FastJSONResponse
+from app.schemas.asset import AssetResponse
+from app.schemas.assignment import AssignmentResponse
+from app.schemas.scrap import ScrapResponse
+
+
+def asset_rows(count):
+    """AssetResponse-shaped dicts, as AssetService projects them"""
+    now = datetime(2025, 1, 1, 10, 30)
+    return [
+        {
+            "description": f"Dell OptiPlex Desktop #{i}",
+            "category_id": str(uuid.uuid4()),
+            "is_special_hardware": False,
+            "total_quantity": 10,
+            "purchase_date": date(2024, 6, 1) + timedelta(days=i % 300),
+            "vendor_id": str(uuid.uuid4()),
+            "original_total_cost": Decimal("450000.00"),
+            "lab_id": str(uuid.uuid4()),
+            "physical_location": "Room 301",
+            "remarks": None,
+            "asset_id": str(uuid.uuid4()),
+            "financial_year": "2024-2025",
+            "current_total_cost": Decimal("405000.00"),
+            "created_at": now,
+            "updated_at": now,
+            "active_assigned_quantity": 4,
+            "total_scrapped_quantity": 1,
+            "available_quantity": 5,
+            "is_issued": True,
+            "is_fully_issued": False,
+            "is_partially_issued": True,
+            "is_scrapped": True,
+        }
+        for i in range(count)
+    ]
+
+
+def assignment_rows(count):
+    """AssignmentResponse-shaped dicts, as AssignmentService.get_assignment_rows builds them"""
+    now = datetime(2025, 1, 1, 10, 30)
+    return [
+        {
+            "teacher_id": str(uuid.uuid4()),
+            "assigned_quantity": 2,
+            "assignment_date": date(2024, 7, 1) + timedelta(days=i % 300),
+            "current_location": "Staff Room",
+            "remarks": None,
+            "assignment_id": str(uuid.uuid4()),
+            "asset_id": str(uuid.uuid4()),
+            "return_date": None,
+            "created_at": now,
+            "assigned_cost": Decimal("90000.0"),
+            "teacher_name": "Dr. Sharma",
+            "asset_description": f"Dell OptiPlex Desktop #{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def scrap_rows(count):
+    """ScrapResponse-shaped dicts, as ScrapService.get_scrap_records builds them"""
+    now = datetime(2025, 1, 1, 10, 30)
+    return [
+        {
+            "scrapped_quantity": 1,
+            "scrap_date": date(2024, 8, 1) + timedelta(days=i % 300),
+            "phase_id": str(uuid.uuid4()),
+            "remarks": "Beyond repair",
+            "scrap_id": str(uuid.uuid4()),
+            "asset_id": str(uuid.uuid4()),
+            "scrap_value": Decimal("45000.00"),
+            "created_at": now,
+            "asset_description": f"Dell OptiPlex Desktop #{i}",
+            "phase_name": "Phase 1",
+            "cumulative_scrapped": 1,
+            "cumulative_value": Decimal("45000.0"),
+        }
+        for i in range(count)
+    ]
+
+
+def before(model, rows):
+    """Per-row models, response validation, jsonable_encoder, then JSONResponse"""
+    items = [model(**row) for row in rows]
+    validated = [model.model_validate(item.model_dump()) for item in items]
+    return JSONResponse(content=jsonable_encoder(validated)).body
+
+
+def after(rows):
+    """Dicts straight to JSON bytes"""
+    return FastJSONResponse(content=rows).body
+
+
+def best_of(fn, repeat):
+    """Fastest wall time of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Print per-1,000-row timings for each list endpoint shape"""
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path (best is kept)")
+    args = parser.parse_args()
+
+    per_k = 1000 / args.rows
+    cases = [
+        ("assets", AssetResponse, asset_rows(args.rows)),
+        ("assignments", AssignmentResponse, assignment_rows(args.rows)),
+        ("scrap records", ScrapResponse, scrap_rows(args.rows)),
+    ]
+
+    print(f"{'endpoint':<16}{'before ms/1k':>14}{'after ms/1k':>14}{'speedup':>10}")
+    for name, model, rows in cases:
+        old = best_of(lambda: before(model, rows), args.repeat) * per_k * 1000
+        new = best_of(lambda: after(rows), args.repeat) * per_k * 1000
+        print(f"{name:<16}{old:>14.2f}{new:>14.2f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark the hot endpoints against the configured database and write the
+results as JSON, so runs on different commits can be compared. Each case is
+timed untraced, then run again under tracemalloc for peak memory; SQL
+statements are counted on the engine. The report, count and dashboard caches are
+cleared before every run so each one does the full work.
+Seed a dataset first, e.g. python seed_data.py --scale 100000
+Run: python bench_suite.py [--output bench_results.json] [--cases asset_list report_assets_pdf]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func
+
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.models import Asset, AssetAssignment, Scrap
+from app.services.count_cache import asset_count_cache
+from app.services.dashboard_service import dashboard_service
+from app.services.report_cache import report_cache
+from app.services import report_pdf
+
+REPORT_FORMATS = ("csv", "xlsx", "pdf", "parquet", "arrow")
+
+CASES = [
+    ("asset_list", "/api/v1/assets?page=1&size=100&count=exact"),
+    ("asset_list_filtered", "/api/v1/assets?page=1&size=100&financial_year=2024-2025&count=exact"),
+    ("dashboard", "/api/v1/reports/dashboard"),
+    ("scrap_list", "/api/v1/scrap?page=1&size=100"),
+    ("pivot", "/api/v1/reports/pivot?rows=financial_year&column=category&values=original_cost"),
+] + [
+    (f"report_assets_{format}", f"/api/v1/reports/assets?format={format}") for format in REPORT_FORMATS
+] + [
+    (f"report_assignments_{format}", f"/api/v1/reports/assignments?format={format}") for format in REPORT_FORMATS
+]
+
+
+class StatementCounter:
+    """Counts statements sent to the database while enabled"""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def reset_caches():
+    report_cache.clear()
+    asset_count_cache.clear()
+    dashboard_service.clear()
+
+
+def run_case(client, counter, path):
+    """Wall seconds (untraced), peak traced MiB, statement count, status and body size"""
+    reset_caches()
+    counter.count = 0
+    start = time.perf_counter()
+    response = client.get(path)
+    elapsed = time.perf_counter() - start
+    statements = counter.count
+
+    reset_caches()
+    tracemalloc.start()
+    client.get(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "path": path,
+        "status": response.status_code,
+        "wall_s": round(elapsed, 4),
+        "peak_mib": round(peak / (1024 * 1024), 2),
+        "statements": statements,
+        "bytes": len(response.content),
+    }
+
+
+def dataset_size():
+    db = SessionLocal()
+    try:
+        return {
+            "assets": db.query(func.count(Asset.asset_id)).scalar(),
+            "assignments": db.query(func.count(AssetAssignment.assignment_id)).scalar(),
+            "scraps": db.query(func.count(Scrap.scrap_id)).scalar(),
+        }
+    finally:
+        db.close()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Run every (or the selected) case, print a table and write the JSON results"""
+    parser = argparse.ArgumentParser(description="Benchmark endpoints and reports against the configured database")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--cases", nargs="+", help="Case names to run (default: all)")
+    args = parser.parse_args()
+
+    cases = [(name, path) for name, path in CASES if not args.cases or name in args.cases]
+    unknown = set(args.cases or []) - {name for name, _ in CASES}
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    counter = StatementCounter()
+    results = {}
+    print(f"{'case':<28}{'status':>7}{'wall s':>9}{'peak MiB':>10}{'stmts':>7}{'KiB':>10}")
+    with TestClient(app) as client:
+        for name, path in cases:
+            result = run_case(client, counter, path)
+            results[name] = result
+            print(
+                f"{name:<28}{result['status']:>7}{result['wall_s']:>9.3f}{result['peak_mib']:>10.1f}"
+                f"{result['statements']:>7}{result['bytes'] / 1024:>10.0f}"
+            )
+    report_pdf.shutdown_pdf_pool()
+
+    output = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "dialect": engine.dialect.name,
+        "dataset": dataset_size(),
+        "cases": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
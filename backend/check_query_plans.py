@@ -0,0 +1,93 @@
+"""
+Print the EXPLAIN plan of each hot query so index usage can be checked
+Run: python check_query_plans.py
+"""
+from datetime import date
+
+from sqlalchemy import func, and_, text
+
+from app.core.database import SessionLocal, engine, init_db
+from app.models import Asset, AssetAssignment, AssetStock, Scrap
+from app.schemas.asset import AssetFilters
+from app.services.asset_service import AssetService
+from app.services.scrap_service import SCRAP_LEDGER_ORDER
+
+SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def hot_queries(db):
+    """(name, statement) pairs mirroring the service query shapes"""
+    asset_service = AssetService()
+
+    def listing(filters):
+        query, _ = asset_service._build_filtered_query(db, filters)
+        return query.order_by(
+            Asset.purchase_date.desc(), Asset.asset_id.desc()
+        ).limit(50).statement
+
+    return [
+        ("asset listing (default order)", listing(AssetFilters())),
+        ("asset listing by financial year", listing(AssetFilters(financial_year="2024-2025"))),
+        ("asset listing by lab", listing(AssetFilters(lab_id=SAMPLE_ID))),
+        ("asset listing by category", listing(AssetFilters(category_id=SAMPLE_ID))),
+        ("asset listing by vendor", listing(AssetFilters(vendor_id=SAMPLE_ID))),
+        ("asset listing by purchase date range", listing(AssetFilters(
+            purchase_date_from=date(2024, 1, 1), purchase_date_to=date(2024, 12, 31)
+        ))),
+        ("asset listing by teacher", listing(AssetFilters(teacher_id=SAMPLE_ID))),
+        ("asset listing by search", listing(AssetFilters(search="dell desktop"))),
+        ("active assigned quantity for an asset", db.query(
+            func.coalesce(func.sum(AssetAssignment.assigned_quantity), 0)
+        ).filter(and_(
+            AssetAssignment.asset_id == SAMPLE_ID,
+            AssetAssignment.return_date.is_(None)
+        )).statement),
+        ("scrapped quantity for an asset", db.query(
+            func.coalesce(func.sum(Scrap.scrapped_quantity), 0)
+        ).filter(Scrap.asset_id == SAMPLE_ID).statement),
+        ("scrap listing", db.query(Scrap.scrap_id, Scrap.asset_id).join(Asset).order_by(
+            *(column.desc() for column in SCRAP_LEDGER_ORDER)
+        ).limit(50).statement),
+        ("scrap ledger for an asset", db.query(Scrap.scrap_id).filter(
+            Scrap.asset_id == SAMPLE_ID
+        ).order_by(*SCRAP_LEDGER_ORDER).statement),
+        ("teacher assignments", db.query(AssetAssignment).filter(
+            AssetAssignment.teacher_id == SAMPLE_ID
+        ).order_by(AssetAssignment.assignment_date.desc()).statement),
+        ("dashboard: assets with multiple teachers", db.query(
+            func.count(AssetStock.asset_id)
+        ).filter(AssetStock.active_teacher_count > 1).statement),
+    ]
+
+
+def explain(conn, statement):
+    """Run the dialect's EXPLAIN for a statement and return plan lines"""
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if engine.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return [row[-1] for row in rows]
+
+    result = conn.execute(text(f"EXPLAIN {sql}"))
+    columns = list(result.keys())
+    return [", ".join(f"{col}={value}" for col, value in zip(columns, row) if value is not None) for row in result]
+
+
+def main():
+    """Print plans for every hot query"""
+    init_db()
+
+    db = SessionLocal()
+    try:
+        with engine.connect() as conn:
+            for name, statement in hot_queries(db):
+                print(f"\n▶ {name}")
+                for line in explain(conn, statement):
+                    # SQLite reports unindexed table access as a bare "SCAN <table>"
+                    flag = "⚠" if line.startswith("SCAN") and "INDEX" not in line else " "
+                    print(f"  {flag} {line}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Rebuild the asset_stock summary from assignment and scrap history, then check
+the global inventory counters and asset rollups against the tables, and report drift
+Run: python reconcile_stock.py [--dry-run]
+"""
+import argparse
+
+from app.core.asset_rollups import verify as verify_rollups
+from app.core.database import SessionLocal, init_db
+from app.core.inventory_counters import verify
+from app.services.stock_service import StockService
+
+
+def main():
+    """Reconcile the stock summary"""
+    parser = argparse.ArgumentParser(description="Rebuild the asset_stock read model")
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+    args = parser.parse_args()
+    
+    init_db()
+    
+    db = SessionLocal()
+    try:
+        report = StockService().rebuild(db, dry_run=args.dry_run)
+        
+        for entry in report["drift"]:
+            if entry["issue"] == "mismatch":
+                fields = ", ".join(
+                    f"{name}: {values['stored']} → {values['actual']}"
+                    for name, values in entry["fields"].items()
+                )
+                print(f"⚠ {entry['asset_id']}: {fields}")
+            else:
+                print(f"⚠ {entry['asset_id']}: {entry['issue']}")
+        
+        action = "would be" if args.dry_run else "were"
+        print(
+            f"\n✓ Checked {report['assets']} assets: {len(report['drift'])} drifted "
+            f"({report['inserted']} missing, {report['updated']} mismatched, {report['removed']} orphaned rows {action} fixed)"
+        )
+        
+        counters = verify(db, repair=not args.dry_run)
+        for name, values in counters["drift"].items():
+            print(f"⚠ inventory counter {name}: {values['stored']} → {values['actual']}")
+        print(f"✓ Inventory counters: {len(counters['drift'])} drifted ({action} fixed)")
+        
+        rollups = verify_rollups(db, repair=not args.dry_run)
+        for key in rollups["drifted_groups"]:
+            print(f"⚠ asset rollup group {key}")
+        print(f"✓ Asset rollups: {len(rollups['drifted_groups'])} of {rollups['groups']} groups drifted ({action} fixed)")
+    except Exception as e:
+        print(f"\n❌ Error during reconciliation: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
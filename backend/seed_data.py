@@ -1,13 +1,24 @@
 """
 Seed script to initialize database with default categories and sample data
-Run: python seed_data.py
+Run: python seed_data.py [--scale 100000] [--seed 42]
+
+--scale N bulk-inserts a deterministic synthetic register of N assets (with
+assignments, returns and scraps) instead of the two sample assets.
 """
+import argparse
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+
 from app.core.database import SessionLocal, init_db
-from app.models import Category, Lab, Vendor, Teacher, Asset, ScrapPhase, User
+from app.models import (
+    Category, Lab, Vendor, Teacher, Asset, ScrapPhase, User, AssetAssignment, Scrap, AssetStock
+)
 from app.schemas.asset import AssetCreate
 from app.utils.financial_year import calculate_financial_year
-from datetime import date
-from decimal import Decimal
 
 
 def seed_categories(db):
@@ -157,8 +168,188 @@ def seed_sample_assets(db):
     print("✓ Sample assets seeded")
 
 
+# Rows per executemany batch when generating a scaled dataset
+SCALE_BATCH_ROWS = 10000
+
+# Typical unit price per category (₹)
+CATEGORY_UNIT_PRICES = {
+    "Desktop Computer": 55000, "Laptop": 70000, "Printer": 25000, "Projector": 45000,
+    "Server": 350000, "Switch": 30000, "Smart TV": 60000, "Access Point": 12000,
+    "SOFTWARE": 15000, "Special Hardware Device": 150000,
+}
+
+
+def _skewed_weights(count, exponent=1.1):
+    """Zipf-like weights: the first few labs/teachers/vendors get most of the rows"""
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def _synthetic_masters(db, rng, model, count, make):
+    """Insert count extra master rows built by make(index, id) and return every id of the model"""
+    existing = [row[0] for row in db.query(model.__table__.primary_key.columns.values()[0]).all()]
+    rows = [make(len(existing) + i + 1, str(uuid.UUID(int=rng.getrandbits(128), version=4)))
+            for i in range(max(0, count - len(existing)))]
+    if rows:
+        db.execute(insert(model), rows)
+    return existing + [row[model.__table__.primary_key.columns.values()[0].name] for row in rows]
+
+
+def _insert_batches(db, model, rows):
+    """Bulk insert an iterable of row dicts in SCALE_BATCH_ROWS batches"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == SCALE_BATCH_ROWS:
+            db.execute(insert(model), batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+
+
+def seed_scaled_dataset(db, assets, seed=42):
+    """
+    Bulk-insert a deterministic synthetic register of `assets` assets.
+    
+    Masters scale with the register (about one lab per 2,000 assets, one
+    teacher per 500, one vendor per 1,000) and rows are spread over them with
+    Zipf-like skew; recent financial years get more purchases. About 60% of
+    assets are assigned (a quarter of those assignments returned) and older
+    assets are more likely to have scraps. Scrap value and current cost follow
+    ScrapService (current cost per remaining unit), and asset_stock is
+    written from the same numbers, so no reconciliation is needed.
+    """
+    if db.query(Asset.asset_id).first() is not None:
+        print("⚠ Skipping scaled dataset - the asset table is not empty")
+        return
+    
+    rng = random.Random(seed)
+    new_id = lambda: str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    
+    lab_ids = _synthetic_masters(db, rng, Lab, min(200, max(3, assets // 2000)), lambda i, id: {
+        "lab_id": id, "lab_name": f"Lab {i}", "room_number": str(500 + i), "status": "ACTIVE"
+    })
+    teacher_ids = _synthetic_masters(db, rng, Teacher, min(2000, max(3, assets // 500)), lambda i, id: {
+        "teacher_id": id, "name": f"Prof. Teacher {i}", "department": "Computer Engineering",
+        "designation": "Assistant Professor", "is_active": True
+    })
+    vendor_ids = _synthetic_masters(db, rng, Vendor, min(500, max(3, assets // 1000)), lambda i, id: {
+        "vendor_id": id, "vendor_name": f"Vendor {i}", "bill_number": f"BILL/{i:05d}"
+    })
+    categories = db.query(Category.category_id, Category.name, Category.is_special).all()
+    phase_ids = [row[0] for row in db.query(ScrapPhase.phase_id).all()]
+    db.commit()
+    
+    lab_weights = _skewed_weights(len(lab_ids))
+    teacher_weights = _skewed_weights(len(teacher_ids))
+    vendor_weights = _skewed_weights(len(vendor_ids))
+    category_weights = _skewed_weights(len(categories), 0.8)
+    years = list(range(2014, 2026))
+    year_weights = [1 + index for index in range(len(years))]
+    today = date(2026, 3, 31)
+    
+    assignments, scraps, stock = [], [], []
+    
+    def asset_rows():
+        for index in range(assets):
+            asset_id = new_id()
+            category_id, category_name, is_special = rng.choices(categories, weights=category_weights)[0]
+            start_year = rng.choices(years, weights=year_weights)[0]
+            purchase_date = date(start_year, 4, 1) + timedelta(days=rng.randrange(365))
+            quantity = rng.choices([1, rng.randint(2, 5), rng.randint(10, 60)], weights=[45, 35, 20])[0]
+            unit_price = CATEGORY_UNIT_PRICES.get(category_name, 20000) * rng.uniform(0.7, 1.4)
+            original_cost = Decimal(str(round(unit_price * quantity, 2)))
+            current_cost = original_cost
+            
+            active_assigned = scrapped = 0
+            active_teachers = set()
+            if rng.random() < 0.6:
+                for _ in range(rng.choices([1, 2, 3, 4], weights=[55, 25, 12, 8])[0]):
+                    free = quantity - active_assigned
+                    if free <= 0:
+                        break
+                    assigned_quantity = rng.randint(1, max(1, free // 2))
+                    teacher_id = rng.choices(teacher_ids, weights=teacher_weights)[0]
+                    assignment_date = purchase_date + timedelta(days=rng.randrange(1, 120))
+                    return_date = None
+                    if rng.random() < 0.25:
+                        return_date = min(today, assignment_date + timedelta(days=rng.randrange(30, 900)))
+                    else:
+                        active_assigned += assigned_quantity
+                        active_teachers.add(teacher_id)
+                    assignments.append({
+                        "assignment_id": new_id(), "asset_id": asset_id, "teacher_id": teacher_id,
+                        "assigned_quantity": assigned_quantity, "assignment_date": assignment_date,
+                        "return_date": return_date, "current_location": "Staff Room", "remarks": None
+                    })
+            
+            age = today.year - start_year
+            if phase_ids and rng.random() < min(0.6, 0.03 * age):
+                for _ in range(rng.choices([1, 2], weights=[80, 20])[0]):
+                    free = quantity - active_assigned - scrapped
+                    if free <= 0:
+                        break
+                    scrapped_quantity = rng.randint(1, free)
+                    # As ScrapService: value at current cost per remaining unit
+                    scrap_value = Decimal(str(round(
+                        float(current_cost) / (quantity - scrapped) * scrapped_quantity, 2
+                    )))
+                    current_cost -= scrap_value
+                    scrapped += scrapped_quantity
+                    scraps.append({
+                        "scrap_id": new_id(), "asset_id": asset_id, "scrapped_quantity": scrapped_quantity,
+                        "scrap_date": min(today, purchase_date + timedelta(days=365 * max(1, age - 1))),
+                        "phase_id": rng.choice(phase_ids), "scrap_value": scrap_value, "remarks": None
+                    })
+            
+            stock.append({
+                "asset_id": asset_id, "assigned_quantity": active_assigned, "scrapped_quantity": scrapped,
+                "available_quantity": quantity - active_assigned - scrapped,
+                "active_teacher_count": len(active_teachers)
+            })
+            yield {
+                "asset_id": asset_id,
+                "description": f"{category_name} #{index + 1}",
+                "category_id": category_id,
+                "is_special_hardware": is_special,
+                "total_quantity": quantity,
+                "purchase_date": purchase_date,
+                "financial_year": calculate_financial_year(purchase_date),
+                "vendor_id": rng.choices(vendor_ids, weights=vendor_weights)[0],
+                "original_total_cost": original_cost,
+                "current_total_cost": current_cost,
+                "lab_id": rng.choices(lab_ids, weights=lab_weights)[0],
+                "physical_location": "Lab",
+                "remarks": None
+            }
+            
+            # Flush dependent rows alongside each asset batch to bound memory
+            if len(stock) == SCALE_BATCH_ROWS:
+                flush_dependents()
+    
+    def flush_dependents():
+        if stock:
+            db.execute(insert(AssetStock), stock)
+        if assignments:
+            db.execute(insert(AssetAssignment), assignments)
+        if scraps:
+            db.execute(insert(Scrap), scraps)
+        stock.clear()
+        assignments.clear()
+        scraps.clear()
+    
+    _insert_batches(db, Asset, asset_rows())
+    flush_dependents()
+    db.commit()
+    print(f"✓ Scaled dataset seeded: {assets} assets, {len(lab_ids)} labs, {len(teacher_ids)} teachers, {len(vendor_ids)} vendors")
+
+
 def main():
     """Main seed function"""
+    parser = argparse.ArgumentParser(description="Seed masters and sample or synthetic assets")
+    parser.add_argument("--scale", type=int, help="Generate this many synthetic assets (e.g. 1000, 100000, 1000000)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for --scale datasets")
+    args = parser.parse_args()
+    
     print("Starting database seeding...")
     
     # Initialize database
@@ -171,7 +362,10 @@ def main():
         seed_vendors(db)
         seed_teachers(db)
         seed_scrap_phases(db)
-        seed_sample_assets(db)
+        if args.scale:
+            seed_scaled_dataset(db, args.scale, args.seed)
+        else:
+            seed_sample_assets(db)
         # Seed initial admin user
         admin_email = "heet.shah123@spit.ac.in"
         existing_admin = db.query(User).filter(User.email == admin_email).first()
@@ -0,0 +1,36 @@
+import os
+
+# Tests build their own engines; keep the app's default engine off the MySQL server
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import SessionLocal, engine as app_engine, init_db
+
+
+@pytest.fixture
+def migrated_engine(monkeypatch):
+    """
+    A fresh in-memory SQLite database with every migration applied, bound to
+    SessionLocal (and so to get_db and the session hooks) for the test.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    monkeypatch.setattr("app.core.database.engine", engine)
+    SessionLocal.configure(bind=engine)
+    try:
+        init_db()
+        yield engine
+    finally:
+        SessionLocal.configure(bind=app_engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def session(migrated_engine):
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
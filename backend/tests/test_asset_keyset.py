@@ -0,0 +1,78 @@
+"""
+Cursor paging must visit every asset exactly once for every sortable column
+and order, including runs of equal sort values and NULLs.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from app.models import Asset, Category, Lab, Vendor
+from app.schemas.asset import AssetCreate, AssetFilters
+from app.services.asset_service import AssetService
+
+PAGE_SIZE = 4
+ASSET_COUNT = 23
+
+
+@pytest.fixture
+def assets(session):
+    session.add_all([
+        Lab(lab_id="lab-1", lab_name="Lab 1", status="ACTIVE"),
+        Vendor(vendor_id="vendor-1", vendor_name="Dell"),
+        Category(category_id="category-1", name="Computers"),
+    ])
+    session.commit()
+
+    service = AssetService()
+    for index in range(ASSET_COUNT):
+        # Few distinct values per column, so most sort values repeat; every third nullable value is NULL
+        optional = None if index % 3 == 0 else index % 2
+        asset = service.create_asset(session, AssetCreate(
+            description=f"Asset {index % 4}",
+            category_id="category-1" if optional is not None else None,
+            is_special_hardware=index % 2 == 0,
+            total_quantity=index % 5 + 1,
+            purchase_date=date(2024, 4 + index % 3, 1),
+            vendor_id="vendor-1" if optional is not None else None,
+            original_total_cost=Decimal(index % 4 * 100) + Decimal("0.25"),
+            lab_id="lab-1" if optional is not None else None,
+            physical_location=f"Room {optional}" if optional is not None else None,
+            remarks=f"Remark {optional}" if optional is not None else None,
+        ))
+        # Microsecond timestamps must round-trip through the cursor too
+        session.execute(
+            update(Asset).where(Asset.asset_id == asset.asset_id)
+            .values(updated_at=datetime(2024, 5, 1, 10, 0, index % 3, 123456 * (index % 2)))
+        )
+    session.commit()
+    return session
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", [column.name for column in Asset.__table__.columns])
+def test_cursor_pages_cover_offset_pages(assets, sort_by, sort_order):
+    service = AssetService()
+    filters = AssetFilters()
+
+    offset_ids = []
+    page = 1
+    while True:
+        result = service.get_filtered_assets(assets, filters, page, PAGE_SIZE, sort_by, sort_order)
+        offset_ids += [item.asset_id for item in result.items]
+        if page >= result.pages:
+            break
+        page += 1
+
+    cursor_ids = []
+    after = None
+    while True:
+        result = service.get_assets_by_cursor(assets, filters, after, PAGE_SIZE, sort_by, sort_order)
+        cursor_ids += [item.asset_id for item in result.items]
+        after = result.next_cursor
+        if after is None:
+            break
+
+    assert len(cursor_ids) == len(set(cursor_ids)) == ASSET_COUNT
+    assert set(cursor_ids) == set(offset_ids)
@@ -0,0 +1,126 @@
+"""
+The inventory counters and asset rollups are kept current by flush deltas;
+after every kind of write, verify() must find nothing to repair.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core import asset_rollups, inventory_counters
+from app.main import app
+from app.models import AssetRollup, Category, InventoryCounter, Lab, ScrapPhase, Teacher, Vendor
+from app.schemas.asset import AssetCreate, AssetUpdate
+from app.schemas.assignment import AssignmentCreate, AssignmentReturn
+from app.schemas.scrap import ScrapCreate
+from app.services.asset_service import AssetService
+from app.services.assignment_service import AssignmentService
+from app.services.scrap_service import ScrapService
+
+
+@pytest.fixture
+def masters(session):
+    rows = {
+        "lab": Lab(lab_id="lab-1", lab_name="Lab 1", status="ACTIVE"),
+        "other_lab": Lab(lab_id="lab-2", lab_name="Lab 2", status="ACTIVE"),
+        "vendor": Vendor(vendor_id="vendor-1", vendor_name="Dell"),
+        "category": Category(category_id="category-1", name="Computers"),
+        "teacher": Teacher(teacher_id="teacher-1", name="A. Teacher"),
+        "other_teacher": Teacher(teacher_id="teacher-2", name="B. Teacher"),
+        "phase": ScrapPhase(phase_id="phase-1", name="Phase 1"),
+    }
+    session.add_all(rows.values())
+    session.commit()
+    return rows
+
+
+def assert_no_drift(db):
+    db.rollback()
+    assert inventory_counters.verify(db)["drift"] == {}
+    assert asset_rollups.verify(db)["drifted_groups"] == []
+
+
+def create_asset(db, masters, quantity=10, cost="1000.00", lab_id="lab-1"):
+    return AssetService().create_asset(db, AssetCreate(
+        description="Desktop computer", category_id=masters["category"].category_id,
+        total_quantity=quantity, purchase_date=date(2024, 6, 1), vendor_id=masters["vendor"].vendor_id,
+        original_total_cost=Decimal(cost), lab_id=lab_id
+    ))
+
+
+def test_create(session, masters):
+    create_asset(session, masters)
+    create_asset(session, masters, quantity=3, cost="250.50", lab_id=None)
+    assert_no_drift(session)
+    assert inventory_counters.read_counters(session)["asset_count"] == 2
+
+
+def test_update_quantity_cost_and_group(session, masters):
+    asset = create_asset(session, masters)
+    service = AssetService()
+    service.update_asset(session, asset.asset_id, AssetUpdate(total_quantity=12, original_total_cost=Decimal("1200")))
+    assert_no_drift(session)
+    service.update_asset(session, asset.asset_id, AssetUpdate(lab_id="lab-2", purchase_date=date(2025, 5, 1)))
+    assert_no_drift(session)
+
+
+def test_assign_and_return(session, masters):
+    asset = create_asset(session, masters)
+    service = AssignmentService()
+    first = service.create_assignment(session, asset.asset_id, AssignmentCreate(teacher_id="teacher-1", assigned_quantity=2))
+    service.create_assignment(session, asset.asset_id, AssignmentCreate(teacher_id="teacher-2", assigned_quantity=3))
+    assert_no_drift(session)
+    assert inventory_counters.read_counters(session)["multiple_teacher_assets"] == 1
+
+    service.return_assignment(session, first.assignment_id, AssignmentReturn(return_date=date.today()))
+    assert_no_drift(session)
+    assert inventory_counters.read_counters(session)["assigned_quantity"] == 3
+
+
+def test_scrap(session, masters):
+    asset = create_asset(session, masters)
+    service = ScrapService()
+    service.create_scrap(session, asset.asset_id, ScrapCreate(scrapped_quantity=2, phase_id="phase-1"))
+    service.create_scrap(session, asset.asset_id, ScrapCreate(scrapped_quantity=1, phase_id="phase-1"))
+    assert_no_drift(session)
+    assert inventory_counters.read_counters(session)["scrapped_quantity"] == 3
+
+
+def test_delete(session, masters):
+    create_asset(session, masters)
+    remove = create_asset(session, masters, quantity=4, cost="400")
+    assert AssetService().delete_asset(session, remove.asset_id)
+    assert_no_drift(session)
+    assert inventory_counters.read_counters(session)["asset_count"] == 1
+
+
+def test_bulk_restore(migrated_engine, session, masters):
+    asset = create_asset(session, masters)
+    AssignmentService().create_assignment(session, asset.asset_id, AssignmentCreate(teacher_id="teacher-1", assigned_quantity=2))
+    ScrapService().create_scrap(session, asset.asset_id, ScrapCreate(scrapped_quantity=1, phase_id="phase-1"))
+    create_asset(session, masters, quantity=5, cost="500", lab_id="lab-2")
+
+    client = TestClient(app)
+    backup = client.get("/api/v1/backup/export").content
+    # Drift the stored totals, so only a rebuild from the tables passes
+    session.execute(update(InventoryCounter).values(asset_count=99))
+    session.commit()
+
+    response = client.post("/api/v1/backup/restore", files={"file": ("backup.json", backup, "application/json")})
+    assert response.status_code == 200, response.text
+    assert_no_drift(session)
+    assert inventory_counters.read_counters(session)["asset_count"] == 2
+
+
+def test_verify_repairs_drift(session, masters):
+    create_asset(session, masters)
+    create_asset(session, masters, quantity=2, cost="80", lab_id="lab-2")
+    session.execute(update(InventoryCounter).values(asset_count=0))
+    session.execute(update(AssetRollup).values(total_quantity=AssetRollup.total_quantity + 1))
+    session.commit()
+
+    assert inventory_counters.verify(session, repair=True)["repaired"]
+    assert len(asset_rollups.verify(session, repair=True)["drifted_groups"]) == 2
+    assert_no_drift(session)
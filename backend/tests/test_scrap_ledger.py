@@ -0,0 +1,96 @@
+"""
+Scrap records carry running totals over each asset's whole ledger; the
+SUM() OVER path and the accumulate_ledger fallback must agree on every page.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models import Category, Lab, ScrapPhase, Vendor
+from app.schemas.asset import AssetCreate
+from app.schemas.scrap import ScrapCreate
+from app.services.asset_service import AssetService
+from app.services.scrap_service import ScrapService
+
+PAGE_SIZE = 3
+
+# (asset index, quantity, scrap date); several scraps share a day, within and across assets
+SCRAPS = [
+    (0, 2, date(2024, 7, 1)),
+    (1, 1, date(2024, 7, 1)),
+    (0, 1, date(2024, 7, 1)),
+    (2, 3, date(2024, 8, 15)),
+    (0, 3, date(2024, 8, 15)),
+    (1, 2, date(2024, 9, 1)),
+    (0, 1, date(2024, 9, 1)),
+    (1, 1, date(2024, 9, 1)),
+    (2, 1, date(2024, 10, 2)),
+    (0, 2, date(2024, 10, 3)),
+]
+
+
+@pytest.fixture
+def scraps(session):
+    session.add_all([
+        Lab(lab_id="lab-1", lab_name="Lab 1", status="ACTIVE"),
+        Vendor(vendor_id="vendor-1", vendor_name="Dell"),
+        Category(category_id="category-1", name="Computers"),
+        ScrapPhase(phase_id="phase-1", name="Phase 1"),
+        ScrapPhase(phase_id="phase-2", name="Phase 2"),
+    ])
+    session.commit()
+
+    assets = [
+        AssetService().create_asset(session, AssetCreate(
+            description=f"Asset {index}", category_id="category-1", total_quantity=20,
+            purchase_date=date(2024, 6, 1), vendor_id="vendor-1",
+            original_total_cost=Decimal("1999.99"), lab_id="lab-1"
+        ))
+        for index in range(3)
+    ]
+    service = ScrapService()
+    for index, (asset, quantity, scrap_date) in enumerate(SCRAPS):
+        service.create_scrap(session, assets[asset].asset_id, ScrapCreate(
+            scrapped_quantity=quantity, scrap_date=scrap_date, phase_id=f"phase-{index % 2 + 1}"
+        ))
+    return session
+
+
+def running_totals(db, **filters):
+    """(scrap_id, cumulative_scrapped, cumulative_value) for every page, in page order"""
+    service = ScrapService()
+    totals = []
+    page = 1
+    while True:
+        result = service.get_scrap_records(db, page=page, size=PAGE_SIZE, **filters)
+        totals += [
+            (item["scrap_id"], item["cumulative_scrapped"], item["cumulative_value"])
+            for item in result["items"]
+        ]
+        if page >= result["pages"]:
+            return totals
+        page += 1
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"phase_id": "phase-2"},
+    # Earlier scraps are filtered out but still count towards the running totals
+    {"date_from": date(2024, 8, 15)},
+])
+def test_window_and_fallback_running_totals_match(scraps, monkeypatch, filters):
+    window = running_totals(scraps, **filters)
+    monkeypatch.setattr("app.services.scrap_service.supports_window_functions", lambda bind: False)
+    fallback = running_totals(scraps, **filters)
+
+    assert window == fallback
+    assert len({scrap_id for scrap_id, _, _ in window}) == len(window) > PAGE_SIZE
+
+
+def test_running_totals_cover_whole_ledger(scraps, monkeypatch):
+    monkeypatch.setattr("app.services.scrap_service.supports_window_functions", lambda bind: False)
+    # The newest scrap of asset 0 closes its ledger: 2 + 1 + 3 + 1 + 2 units
+    _, quantity, value = running_totals(scraps)[0]
+    assert quantity == 9
+    assert value == value.quantize(Decimal("0.01"))
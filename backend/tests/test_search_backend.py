@@ -0,0 +1,60 @@
+"""
+Every search backend must accept a multi-word query whose words are spread
+across the asset text and the vendor name.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.models import Asset, Vendor
+from app.services.search_backend import (
+    LikeSearchBackend, MySQLFullTextSearchBackend, SQLiteFTS5SearchBackend, sqlite_has_fts5
+)
+
+
+@pytest.fixture
+def db(session):
+    dell = Vendor(vendor_id="v-dell", vendor_name="Dell")
+    hp = Vendor(vendor_id="v-hp", vendor_name="HP")
+    session.add_all([dell, hp])
+    session.add_all([
+        _asset("a-dell-desktop", "Desktop computer", dell),
+        _asset("a-dell-laptop", "Laptop computer", dell),
+        _asset("a-hp-desktop", "Desktop computer", hp),
+    ])
+    session.commit()
+    return session
+
+
+def _asset(asset_id, description, vendor):
+    return Asset(
+        asset_id=asset_id, description=description, vendor_id=vendor.vendor_id, total_quantity=1,
+        purchase_date=date(2024, 6, 1), financial_year="2024-2025",
+        original_total_cost=Decimal("100"), current_total_cost=Decimal("100")
+    )
+
+
+def _search(db, backend, term):
+    query, _ = backend.apply(db.query(Asset.asset_id), term)
+    return sorted(row.asset_id for row in query)
+
+
+def test_like_matches_words_across_fields(db):
+    assert _search(db, LikeSearchBackend(), "dell desktop") == ["a-dell-desktop"]
+
+
+def test_fts5_matches_words_across_fields(db):
+    if not sqlite_has_fts5(db.connection()):
+        pytest.skip("SQLite built without FTS5")
+    # Migration 3 created the FTS table and its triggers indexed the rows
+    assert _search(db, SQLiteFTS5SearchBackend(), "dell desktop") == ["a-dell-desktop"]
+
+
+def test_mysql_requires_each_word_in_asset_text_or_vendor_name(db):
+    query, _ = MySQLFullTextSearchBackend().apply(db.query(Asset.asset_id), "dell desktop")
+    sql = str(query.statement.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+    for token in ("dell", "desktop"):
+        assert sql.count(f"AGAINST ('+{token}*' IN BOOLEAN MODE)") == 2
+    assert "'+dell* +desktop*'" not in sql